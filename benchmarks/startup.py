@@ -0,0 +1,62 @@
+"""
+Startup benchmark: latency from a fresh interpreter to the first result.
+
+Each scenario runs in its own subprocess, so that nothing is cached by a
+previous import. Run from the repository root:
+
+    python benchmarks/startup.py [--repeat 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    # Air-only cycles never touch the steam tables
+    "air": """
+from src.utils import State, Process
+s1 = State("1", p="1 bar", T=300)
+s2 = State("2", h=301350)
+Process("AIR", A=s1, B=s2).compute()
+""",
+    # The first steam state loads the tables
+    "steam": """
+from src.utils import State, Process
+s1 = State("1", p="80 bar", T="480 C")
+s2 = State("2", p="8.10 bar", T="440 C")
+Process("STEAM", A=s1, B=s2).compute()
+""",
+}
+
+TEMPLATE = """
+import time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(code: str, repeat: int) -> list[float]:
+    """Run the code in `repeat` fresh interpreters, return the latencies [s]"""
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", TEMPLATE.format(code=code)], cwd=ROOT, capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return times
+
+
+def run(repeat: int = 10) -> dict[str, float]:
+    """Return the median latency of each scenario [s]"""
+    return {name: statistics.median(measure(code, repeat)) for name, code in SCENARIOS.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    for name, seconds in run(args.repeat).items():
+        print(f"{name:<8} {seconds * 1e3:8.1f} ms")
@@ -0,0 +1,254 @@
+"""
+Benchmark suite: property lookups, process compute, cycle solve and startup.
+
+Each benchmark is timed in this process (but startup, see startup.py), as the median
+over `--repeat` runs of the time per call. The results are written as JSON, and
+compared with a stored baseline: a benchmark slower than the baseline by more than
+`--threshold` is a regression, and the exit code is 1. Run from the repository root:
+
+    python benchmarks/suite.py [--filter cycle] [--output results.json]
+    python benchmarks/suite.py --save-baseline
+
+Every run also times REFERENCE, a fixed pure-Python workload, and stores each median
+relative to it. The comparison uses these relative times, so that a baseline
+(benchmarks/baseline.json) recorded on another machine stays meaningful; the
+interpreter and the platform are recorded next to the numbers for the remaining
+differences (e.g. another Python or NumPy version).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from typing import Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import startup
+from src.cycle import Cycle
+from src.processes import Isentropic, Isobaric, Isochoric, Isothermal
+from src.tables.water import TABLE_SATURATED, TABLE_OVERHEATED
+from src.utils import State, Process
+from src.utils.state_cache import STATE_CACHE
+
+# Number of points of the batch lookups
+BATCH = 10_000
+
+# The benchmark every other one is relative to, see _reference
+REFERENCE = "reference"
+
+
+def _reference() -> Callable[[], object]:
+    """Pure-Python work on small objects, as the scalar lookups and the processes"""
+    keys = [f"A.{name}" for name in "pTvuhs"] * 50
+    return lambda: sorted({key: i * 1.5 for i, key in enumerate(keys)}.items())
+
+
+def _saturated_get() -> Callable[[], object]:
+    return lambda: TABLE_SATURATED.get(p=8.1e5)
+
+
+def _saturated_get_many() -> Callable[[], object]:
+    p = np.random.default_rng(0).uniform(0.05e5, 100e5, BATCH)
+    return lambda: TABLE_SATURATED.get_many(p=p)
+
+
+def _overheated_get() -> Callable[[], object]:
+    return lambda: TABLE_OVERHEATED.get(T=713.15, p=8.1e5)
+
+
+def _overheated_get_many() -> Callable[[], object]:
+    rng = np.random.default_rng(0)
+    T, p = rng.uniform(573.15, 873.15, BATCH), rng.uniform(5e5, 140e5, BATCH)
+    return lambda: TABLE_OVERHEATED.get_many(T=T, p=p)
+
+
+def _process_air() -> Callable[[], object]:
+    return lambda: Process("AIR", A=State("1", p=1e5, T=300), B=State("2", h=301350)).compute()
+
+
+def _process_steam(cached: bool) -> Callable[[], Callable[[], object]]:
+    def setup():
+        def compute():
+            if not cached:
+                STATE_CACHE.clear()
+            Process("STEAM", A=State("1", p=80e5, T=753.15), B=State("2", p=8.1e5, T=713.15)).compute()
+        return compute
+    return setup
+
+
+def _process(cls: type, A: dict, B: dict) -> Callable[[], Callable[[], object]]:
+    return lambda: lambda: cls(A=State("A", **A), B=State("B", **B)).compute()
+
+
+def _otto() -> Callable[[], object]:
+    """Otto cycle - Tutorial 3 (main.py)"""
+    def solve():
+        p1 = State("P1", T=300, p=1e5)
+        p2 = State("P2", v=0.0703)
+        p3 = State("P3", T=1600)
+        p4 = State("P4")
+        cycle = Cycle("air")
+        cycle.add_step(Isentropic(A=p1, B=p2))
+        cycle.add_step(Isochoric(A=p2, B=p3))
+        cycle.add_step(Isentropic(A=p3, B=p4))
+        cycle.add_step(Isochoric(A=p4, B=p1))
+        cycle.solve()
+    return solve
+
+
+def _diesel() -> Callable[[], object]:
+    """Diesel cycle - Exercise 3 (main.py)"""
+    def solve():
+        p1 = State("P1", T=298, p=1e5)
+        p2 = State("P2", p=50e5)
+        p3 = State("P3", T=1600)
+        p4 = State("P4")
+        cycle = Cycle("air")
+        cycle.add_step(Isentropic(A=p1, B=p2))
+        cycle.add_step(Isobaric(A=p2, B=p3))
+        cycle.add_step(Isentropic(A=p3, B=p4))
+        cycle.add_step(Isochoric(A=p4, B=p1))
+        cycle.solve()
+    return solve
+
+
+# Name -> setup, returning the function to time
+BENCHMARKS: dict[str, Callable[[], Callable[[], object]]] = {
+    "tables.saturated.get": _saturated_get,
+    f"tables.saturated.get_many[{BATCH}]": _saturated_get_many,
+    "tables.overheated.get": _overheated_get,
+    f"tables.overheated.get_many[{BATCH}]": _overheated_get_many,
+    "process.air": _process_air,
+    "process.steam": _process_steam(cached=False),
+    "process.steam.cached": _process_steam(cached=True),
+    "processes.isentropic": _process(Isentropic, {"p": 1e5, "T": 300}, {"p": 50e5}),
+    "processes.isobaric": _process(Isobaric, {"p": 50e5, "T": 911.25}, {"T": 1600}),
+    "processes.isochoric": _process(Isochoric, {"p": 1e5, "T": 300}, {"T": 600}),
+    "processes.isothermal": _process(Isothermal, {"p": 1e5, "T": 300}, {"p": 10e5}),
+    "cycle.otto": _otto,
+    "cycle.diesel": _diesel,
+}
+
+
+def measure(setup: Callable[[], Callable[[], object]], repeat: int) -> dict:
+    """Time the function returned by setup, return the median and min time per call [s]"""
+    fn = setup()
+    fn() # Warm up, e.g. load the tables
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"median": statistics.median(times), "min": min(times), "number": number, "repeat": repeat}
+
+
+def measure_startup(code: str, repeat: int) -> dict:
+    """Time a startup scenario of startup.py, each run in a fresh interpreter"""
+    times = startup.measure(code, repeat)
+    return {"median": statistics.median(times), "min": min(times), "number": 1, "repeat": repeat}
+
+
+def run(pattern: str = "", repeat: int = 7) -> dict:
+    """
+    Run the benchmarks whose name contains pattern, and always REFERENCE. Return the
+    results with their context, each median also relative to the one of REFERENCE
+    """
+    results = {REFERENCE: measure(_reference, repeat)}
+    results.update({name: measure(setup, repeat) for name, setup in BENCHMARKS.items() if pattern in name})
+    for name, code in startup.SCENARIOS.items():
+        if pattern in f"startup.{name}":
+            results[f"startup.{name}"] = measure_startup(code, repeat)
+    for result in results.values():
+        result["relative"] = result["median"] / results[REFERENCE]["median"]
+    return {"meta": _meta(), "results": results}
+
+
+def _meta() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "numpy": np.__version__,
+        "system": f"{platform.system()} {platform.release()}",
+        "machine": platform.machine(),
+        "processor": _processor(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _processor() -> str:
+    """The model of the CPU, platform.processor() is empty on most Linux"""
+    try:
+        with open("/proc/cpuinfo") as f:
+            return next(line.split(":", 1)[1].strip() for line in f if line.startswith("model name"))
+    except (OSError, StopIteration):
+        return platform.processor()
+
+
+def _write(path: str, results: dict):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[dict]:
+    """
+    Compare the times relative to REFERENCE with the ones of the baseline, return one
+    entry per benchmark in both: its ratio (> 1 is slower) and whether it is a regression
+    """
+    rows = []
+    for name, result in results["results"].items():
+        if name in baseline["results"] and name != REFERENCE:
+            ratio = result["relative"] / baseline["results"][name]["relative"]
+            rows.append({"name": name, "ratio": ratio, "regression": ratio > 1 + threshold})
+    return rows
+
+
+def _format(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filter", default="", help="Only the benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline to compare with (default: benchmarks/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Slowdown counted as a regression (default: 0.25, i.e. 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the baseline")
+    args = parser.parse_args()
+
+    results = run(args.filter, args.repeat)
+    if args.output:
+        _write(args.output, results)
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    ratios = {row["name"]: row for row in compare(results, baseline, args.threshold)} if baseline else {}
+
+    for name, result in results["results"].items():
+        line = f"{name:<36} {_format(result['median'])}"
+        if name in ratios:
+            line += f"  x{ratios[name]['ratio']:.2f}" + ("  REGRESSION" if ratios[name]["regression"] else "")
+        print(line)
+
+    if args.save_baseline:
+        _write(args.baseline, results)
+        print(f"Baseline saved to {os.path.relpath(args.baseline, ROOT)}")
+    elif any(row["regression"] for row in ratios.values()):
+        sys.exit(1)
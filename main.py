@@ -7,23 +7,23 @@
 
 from src.processes import Isochoric, Isobaric, Isentropic
 from src.cycle import Cycle
-from src.point import Point
+from src.utils import State
 
 ######################################
 # Diesel cycle - Exercise 3
 ######################################
 # # Define the points
-# p1 = Point("P1", T=298, p=1)
-# p2 = Point("P2", p=50)
-# p3 = Point("P3", T=1600)
-# p4 = Point("P4")
+# p1 = State("P1", T=298, p="1 bar")
+# p2 = State("P2", p="50 bar")
+# p3 = State("P3", T=1600)
+# p4 = State("P4")
 # 
 # # Define the cycles
-# cycle = Cycle(R=287, gamma=1.4)
-# cycle.add_step(Isentropic(p1, p2))
-# cycle.add_step(Isobaric(p2, p3))
-# cycle.add_step(Isentropic(p3, p4))
-# cycle.add_step(Isochoric(p4, p1))
+# cycle = Cycle("air")
+# cycle.add_step(Isentropic(A=p1, B=p2))
+# cycle.add_step(Isobaric(A=p2, B=p3))
+# cycle.add_step(Isentropic(A=p3, B=p4))
+# cycle.add_step(Isochoric(A=p4, B=p1))
 # 
 # # Solve the cycle
 # cycle.solve()
@@ -38,18 +38,18 @@ from src.point import Point
 # Otto cycle - Tutorial 3
 ######################################
 # Define the points
-p1 = Point("P1", T=300, p=1)
-p2 = Point("P2", v=0.0703 * 100000)
-p3 = Point("P3", T=1600)
-p4 = Point("P4")
+p1 = State("P1", T=300, p="1 bar")
+p2 = State("P2", v=0.0703)
+p3 = State("P3", T=1600)
+p4 = State("P4")
 
-step1 = Isentropic(p1, p2)
-step2 = Isochoric(p2, p3)
-step3 = Isentropic(p3, p4)
-step4 = Isochoric(p4, p1)
+step1 = Isentropic(A=p1, B=p2)
+step2 = Isochoric(A=p2, B=p3)
+step3 = Isentropic(A=p3, B=p4)
+step4 = Isochoric(A=p4, B=p1)
 
 # Define the cycles
-cycle = Cycle(R=287, gamma=1.4)
+cycle = Cycle("air")
 cycle.add_step(step1)
 cycle.add_step(step2)
 cycle.add_step(step3)
@@ -57,7 +57,6 @@ cycle.add_step(step4)
 
 # Solve the cycle
 cycle.solve()
-cycle.solve()
 
 print(p1)
 print(p2)
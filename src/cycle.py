@@ -1,5 +1,8 @@
-from .step import Step
-from .point import Point
+from collections import deque
+import numpy as np
+from src.utils import State, Process, UnderdeterminedError, OverdeterminedError
+from src.utils.gas import GASES
+from src.utils import variable_gas # Registers its gases in GASES, e.g. Cycle("air-variable")
 from src.tables.specific_heats import SPECIFIC_HEATS
 import matplotlib.pyplot as plt
 
@@ -17,60 +20,143 @@ class Cycle:
         gamma
         c_p or c_v
     """
+    # Properties every state must have once the cycle is solved
+    REQUIRED = ("p", "T", "v")
+
     def __init__(self, gas="air"):
         # The cycle can either be air or steam
-        """
-        Steam /  
-        """
-
-        """
-        Air: Mixture of gases (primarily nitrogen and oxygen) that behaves as a single-phase gas under most practical conditions
-        does not have a saturation line like water
-        """
-        R, k = SPECIFIC_HEATS[gas]
-    
-        # TODO: R and gamma can be computed using the properties of the gas
+        # Air: Mixture of gases (primarily nitrogen and oxygen) that behaves as a single-phase gas under most practical conditions,
+        # does not have a saturation line like water
+        # The gases without a constant in SPECIFIC_HEATS use their model (e.g. "air-variable" or a mixture, k at 298 K)
+        if not isinstance(gas, str):
+            R, k = gas.R, gas.k
+        elif gas in SPECIFIC_HEATS:
+            R, k = SPECIFIC_HEATS[gas]
+        elif gas.upper() in GASES:
+            R, k = GASES[gas.upper()].R, GASES[gas.upper()].k
+        else:
+            raise ValueError(f"Unknown gas '{gas}', expected one of {', '.join(sorted(set(SPECIFIC_HEATS) | set(GASES)))}")
+
+        self.gas = gas.upper() if isinstance(gas, str) else gas.name # As Process.gas
+        self._gas = gas # Given to the steps built without a gas, see add_step
         self.R = R
         self.k = k
-        self.steps: list[Step] = []
-
-    def add_step(self, step: Step):
+        self.steps: list[Process] = []
+
+    def add_step(self, step: Process):
+        """Add a step, the ones built without a gas take the gas of the cycle"""
+        if step.default_gas:
+            if step.gas != self.gas:
+                step.use_gas(self._gas)
+        elif step.gas != self.gas:
+            raise ValueError(f"The step {step.A.name} -> {step.B.name} uses {step.gas}, the cycle {self.gas}")
         self.steps.append(step)
 
+    def states(self) -> list[State]:
+        """The distinct states of the cycle, in the order of the steps"""
+        states = {}
+        for step in self.steps:
+            states.setdefault(id(step.A), step.A)
+            states.setdefault(id(step.B), step.B)
+        return list(states.values())
+
     def solve(self):
         """
-        TODO: Try to solve the process, raise and error if it's impossible
-        """
-        # First we loop over all he points and compute the missing properties if possible
-        # -> air: gas -> GAS LAWS CAN BE USED
-        # -> steam: liquid -> TABLES MUST BE USED
+        Compute all the states of the cycle.
+
+        The steps are computed from a worklist, in the order they were added. When a
+        step finds new properties of one of its states, the other steps sharing that
+        state (before or after it in the cycle) are queued again, so the information
+        propagates in both directions until no state changes.
 
+        Raise an UnderdeterminedError if some states cannot be computed, and an
+        OverdeterminedError if the given properties contradict one of the steps.
+        """
+        # The steps using each state
+        users: dict[int, list[Process]] = {}
+        for step in self.steps:
+            for state in (step.A, step.B):
+                users.setdefault(id(state), []).append(step)
+
+        queue = deque(self.steps)
+        queued = {id(step) for step in self.steps}
+        while queue:
+            step = queue.popleft()
+            queued.discard(id(step))
+
+            known = (step.A.known(), step.B.known())
+            step.compute()
+
+            for state, before in zip((step.A, step.B), known):
+                if state.known() == before:
+                    continue
+                for other in users[id(state)]:
+                    if other is not step and id(other) not in queued:
+                        queue.append(other)
+                        queued.add(id(other))
+
+        missing = {state.name: [name for name in self.REQUIRED if getattr(state, name) is None] for state in self.states()}
+        missing = {name: props for name, props in missing.items() if props}
+        if missing:
+            raise UnderdeterminedError("Cannot compute " + ", ".join(f"{name} ({', '.join(props)})" for name, props in missing.items()))
+
+        # The states appearing in a contradicted relation, and their steps
+        states, steps = {}, {}
         for step in self.steps:
-            step.compute(self.R, self.gamma)
-        
-    def plot(self):
+            for relation in step.conflicts():
+                steps[id(step)] = f"{step.A.name} -> {step.B.name}"
+                for name in (relation.target, *relation.inputs):
+                    if name[:2] in ("A.", "B."):
+                        state = step.A if name[0] == "A" else step.B
+                        states[id(state)] = state.name
+        if states:
+            raise OverdeterminedError(f"Inconsistent data for {', '.join(states.values())} in {', '.join(steps.values())}")
+
+    def work(self) -> float:
+        """Net work done by the system over the cycle [J/kg]"""
+        return sum(step.work() for step in self.steps)
+
+    def heat_in(self) -> float:
+        """Heat added to the system over the cycle, the heat rejected is not counted [J/kg]"""
+        return sum(np.maximum(step.heat(), 0) for step in self.steps)
+
+    def efficiency(self) -> float:
+        """Thermal efficiency, net work over heat input"""
+        return self.work() / self.heat_in()
+
+    def plot(self, path: str | None = None):
         """
-        TODO: Plot the process in a T-s and p-v diagram
+        Plot the cycle in a T-s and p-v diagram, each step along its path (see Process.path).
+        Given a path, the figure is written to that file instead, headless (see src.export)
         """
+        if path is not None:
+            from src.export import save
+            save(self, path)
+            return
+
+        fig, (ax_pv, ax_ts) = plt.subplots(1, 2, figsize=(12, 5))
+        ax_pv.set(title="p-v Diagram", xlabel="Specific volume [m^3/kg]", ylabel="Pressure [Pa]")
+        ax_ts.set(title="T-s Diagram", xlabel="Entropy [J/(kg K)]", ylabel="Temperature [K]")
+
+        # The saturation dome under a steam cycle, the volumes span decades
+        if any(step.gas == "STEAM" for step in self.steps):
+            from src.tables.dome import dome
+            dome().plot(ax_pv, ax_ts)
+            ax_pv.set_xscale("log")
 
-        # Get all the points
-        points: list[Point] = []
         for step in self.steps:
-            points.append(step.start)
-            points.append(step.end)
-
-        # Plot the T-s diagram
-        plt.figure()
-        plt.title("T-s Diagram")
-        plt.xlabel("Entropy")
-        plt.ylabel("Temperature")
-
-        for point in points:
-            print(point.entropy, point.temperature)
-            plt.plot(point.entropy, point.temperature, "o")
-        plt.show()
+            step.plot(ax_pv, ax_ts)
 
-        # TODO: Add the lines between the points, this changes depending on the process
+            # The states at the start of each step, from the path as the entropy of a gas may not be known
+            path = step.path()
+            ax_pv.plot(path.v[0], path.p[0], "ok")
+            ax_ts.plot(path.s[0], path.T[0], "ok")
+            if path.p.ndim == 1:
+                ax_pv.annotate(step.A.name, (path.v[0], path.p[0]), textcoords="offset points", xytext=(5, 5))
+                ax_ts.annotate(step.A.name, (path.s[0], path.T[0]), textcoords="offset points", xytext=(5, 5))
+
+        ax_pv.legend()
+        plt.show()
 
     def table(self):
         """
@@ -79,20 +165,89 @@ class Cycle:
 
 
 if __name__ == "__main__":
-    p1 = Point("Point 1", temperature=833, pressure=80, enthalpy=3545.30, entropy=6.9072)
-    p2 = Point("Point 2", temperature=593, pressure=7, enthalpy=2854.99, entropy=6.9072)
-    p3 = Point("Point 3", temperature=418, pressure=0.1, enthalpy=191.81, entropy=0.6492, volume=0.00101)
-    p4 = Point("Point 4", temperature=323, pressure=80, enthalpy=201.58, entropy=0.6504, volume=0.00100)
+    from src.processes import Isentropic, Isochoric
 
-    s1 = Step(p1, p2)
-    s2 = Step(p2, p3)
-    s3 = Step(p3, p4)
-    s4 = Step(p4, p1)
+    # Otto cycle - Tutorial 3
+    p1 = State("P1", T=300, p="1 bar")
+    p2 = State("P2", v=0.0703)
+    p3 = State("P3", T=1600)
+    p4 = State("P4")
 
     cycle = Cycle()
-    cycle.add_step(s1)
-    cycle.add_step(s2)
-    cycle.add_step(s3)
-    cycle.add_step(s4)
-
+    cycle.add_step(Isentropic(A=p1, B=p2))
+    cycle.add_step(Isochoric(A=p2, B=p3))
+    cycle.add_step(Isentropic(A=p3, B=p4))
+    cycle.add_step(Isochoric(A=p4, B=p1))
+
+    # A single solve, P4 is found backward from P1
+    cycle.solve()
+    assert p4.v == p1.v
+    assert round(p2.T, 1) == 817.2
+    assert round(p4.T, 1) == 587.4
+
+    # Otto efficiency: 1 - 1 / e^(gamma - 1)
+    e = p1.v / p2.v
+    assert round(cycle.efficiency(), 6) == round(1 - 1 / e ** 0.4, 6)
+
+    # Same cycle with a specific heat varying with T: cooler end of compression, lower efficiency
+    from src.utils.variable_gas import AIR_VARIABLE
+    p1, p2, p3, p4 = State("P1", T=300, p="1 bar"), State("P2", v=0.0703), State("P3", T=1600), State("P4")
+    cycle = Cycle("air-variable")
+    cycle.add_step(Isentropic(A=p1, B=p2)) # The steps without a gas take the one of the cycle
+    cycle.add_step(Isochoric(A=p2, B=p3))
+    cycle.add_step(Isentropic(AIR_VARIABLE, A=p3, B=p4))
+    cycle.add_step(Isochoric(A=p4, B=p1))
+    cycle.solve()
+    assert p4.v == p1.v and round(p1.s, 6) == round(p2.s, 6) and cycle.steps[0].n is None
+    assert round(p2.T) == 781 # Table A-17, with the relative volumes: ~780 K
+    assert round(cycle.efficiency(), 3) == 0.590 # 0.633 with a constant c_p
+
+    # A step given another gas than the cycle is rejected
+    try:
+        cycle.add_step(Isochoric("AIR", A=p4, B=p1))
+        assert False, "Step of another gas accepted"
+    except ValueError as e:
+        assert "AIR-VARIABLE" in str(e)
+
+    # Rankine cycle on the bundled tables, the pump outlet is a compressed liquid (w_p = v dp ≈ 10.1 kJ/kg)
+    from src.processes import Isobaric
+    s1, s2, s3, s4 = State("1", p="0.1 bar", x=0), State("2", p="100 bar"), State("3", T="500 C"), State("4", p="0.1 bar")
+    cycle = Cycle("steam")
+    cycle.add_step(Isentropic("STEAM", A=s1, B=s2))
+    cycle.add_step(Isobaric("STEAM", A=s2, B=s3))
+    cycle.add_step(Isentropic("STEAM", A=s3, B=s4))
+    cycle.add_step(Isobaric("STEAM", A=s4, B=s1))
+    cycle.solve()
+    w_pump, w_turbine, q_in = s2.h - s1.h, s3.h - s4.h, s3.h - s2.h
+    assert round(w_pump / 1e3, 1) == 10.1 and round((w_turbine - w_pump) / q_in, 3) == 0.402 # Steady flow, 0.402 with IF97
+
+    # An unknown gas is named in the error
+    try:
+        Cycle("helium")
+        assert False, "Unknown gas accepted"
+    except ValueError as e:
+        assert "helium" in str(e) and "AIR-VARIABLE" in str(e)
+
+    # Nothing fixes the scale of the cycle
+    cycle = Cycle()
+    cycle.add_step(Isentropic(A=State("P1"), B=State("P2", T=800)))
+    cycle.add_step(Isochoric(A=cycle.steps[0].B, B=cycle.steps[0].A))
+    try:
+        cycle.solve()
+        assert False, "Underdetermined cycle solved"
+    except UnderdeterminedError as e:
+        assert "P1" in str(e) and "P2" in str(e)
+
+    # The paths of the steps, sampled once and kept across the redraws
+    p1, p2, p3, p4 = State("P1", T=300, p="1 bar"), State("P2", v=0.0703), State("P3", T=1600), State("P4")
+    cycle = Cycle()
+    cycle.add_step(Isentropic(A=p1, B=p2))
+    cycle.add_step(Isochoric(A=p2, B=p3))
+    cycle.add_step(Isentropic(A=p3, B=p4))
+    cycle.add_step(Isochoric(A=p4, B=p1))
+    cycle.solve()
+    compression, heating = cycle.steps[0].path(), cycle.steps[1].path()
+    assert np.ptp(compression.s) < 1e-9 and np.allclose(compression.p * compression.v ** 1.4, p1.p * p1.v ** 1.4)
+    assert np.allclose(heating.v, p2.v) and np.isclose(heating.T[-1], 1600) and len(heating) > 9
+    assert cycle.steps[1].path() is heating
     cycle.plot()
@@ -1,2 +1,9 @@
-# TODO: MAP EACH ELEMENT TO ITS RESPECTIVE PROCESS
-# 
\ No newline at end of file
+from .fluid import SteamFluid, IdealGasFluid, STEAM, fluid
+from .component import Component
+from .compressor import Compressor
+from .condenser import Condenser
+from .heater import Heater
+from .pump import Pump
+from .turbine import Turbine
+from .valve import Valve
+from .network import Network
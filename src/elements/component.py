@@ -0,0 +1,57 @@
+import numpy as np
+from src.utils import State
+from .fluid import fluid
+
+
+class Component:
+    """
+    A steady-flow component between its inlet A and its outlet B.
+
+    The work and the heat are per unit mass flow (J/kg), from the first law for an
+    open system with no change of kinetic and potential energy: q - w = h_B - h_A.
+    The work is positive when done by the fluid (turbine), the heat when added to
+    the fluid (heater). The power of a mass flow ṁ [kg/s] is ṁ times the work [W].
+
+    The properties of the states may be arrays of the same shape (or scalars), as
+    may the efficiency: a component then solves the whole sweep in one call.
+    """
+
+    def __init__(self, gas: str = "STEAM", *, A: State, B: State):
+        self.fluid = fluid(gas)
+        self.gas = self.fluid.name
+        self.A = A
+        self.B = B
+
+    def solve(self):
+        """Compute the outlet B from the inlet A (completed from its defining pair)"""
+        raise NotImplementedError
+
+    def work(self) -> float | np.ndarray:
+        """Work done by the fluid [J/kg]"""
+        return 0.0
+
+    def heat(self) -> float | np.ndarray:
+        """Heat added to the fluid [J/kg]"""
+        return 0.0
+
+    def power(self, m_dot: float | np.ndarray = 1.0) -> float | np.ndarray:
+        """Power delivered for a mass flow m_dot [kg/s], P = ṁ w [W]"""
+        return m_dot * self.work()
+
+    def _inlet(self, *names: str) -> State:
+        """The inlet, completed if one of the properties needed by the component is unknown"""
+        if any(getattr(self.A, name) is None for name in names):
+            self.fluid.complete(self.A)
+        return self.A
+
+    def _outlet(self, **values) -> State:
+        """Set the unknown properties of the outlet and complete it"""
+        for name, value in values.items():
+            if getattr(self.B, name) is None:
+                setattr(self.B, name, value)
+        return self.fluid.complete(self.B)
+
+    def __repr__(self):
+        return (f"{type(self).__name__}('{self.gas}', A ---> B)\n"
+                f"A: {self.A}\n"
+                f"B: {self.B}")
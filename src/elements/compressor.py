@@ -1,8 +1,9 @@
+import numpy as np
 from src.utils import State
-from src.processes import Isentropic
+from .component import Component
 
 
-class Compressor:
+class Compressor(Component):
     """
     - Compressors are designed to work with gases or vapors (x = 1)
     - Gases are compressible, so compressors increase the gas's pressure by reducing its volume
@@ -13,19 +14,38 @@ class Compressor:
     Real compressor (s1 < s2)
     - The actual compression process is irreversible -> has an efficiency (μ)
 
+    μ = (h_2s - h_1) / (h_2 - h_1) = (T_2s - T_1) / (T_2 - T_1)
     """
 
-    def __init__(self, μ: float = 1, *, A: State, B: State):
-        assert 0 < μ <= 1, "The efficiency must be between 0 and 1"
+    def __init__(self, μ: float | np.ndarray = 1, *, A: State, B: State, gas: str = "AIR"):
+        assert np.all((0 < np.asarray(μ)) & (np.asarray(μ) <= 1)), "The efficiency must be between 0 and 1"
+        super().__init__(gas, A=A, B=B)
         self.μ = μ
-        self.A = A
-        self.B = B
-        self.S = State()
-
-        self.ideal = Isentropic(A=self.A, B=self.S)
-        
-        # -> Solve the ideal process
-        """
-        μ = (h_2s - h_1) / (h_2 - h_1) = (T_2s - T_1) / (T_2 - T_1)
-        """
-        # Using Mu, solve the real process
+
+    def solve(self):
+        """The outlet pressure must be given, h_2 = h_1 + (h_2s - h_1) / μ"""
+        A, B = self._inlet("h", "s"), self.B
+        assert B.p is not None, f"The outlet pressure of the compressor ({B.name}) is not given"
+        h_2s = self.fluid.properties(("p", "s"), B.p, A.s)["h"]
+        self._outlet(h=A.h + (h_2s - A.h) / self.μ)
+
+    def work(self) -> float | np.ndarray:
+        """w = h_1 - h_2, negative: the work is done on the gas"""
+        return self.A.h - self.B.h
+
+
+if __name__ == "__main__":
+    # Air from 1 to 10 bar, T_2s / T_1 = 10^(0.4 / 1.4)
+    p1 = State("1", p="1 bar", T=300)
+    p2 = State("2", p="10 bar")
+    compressor = Compressor(A=p1, B=p2)
+    compressor.solve()
+    assert round(p2.T, 1) == round(300 * 10 ** (0.4 / 1.4), 1)
+    assert round(compressor.work()) == round(-1004.5 * (p2.T - 300))
+
+    # The real compressor needs more work, for the same pressure ratio
+    p2_real = State("2", p="10 bar")
+    real = Compressor(0.8, A=p1, B=p2_real)
+    real.solve()
+    assert round(real.work() * 0.8, 6) == round(compressor.work(), 6)
+    assert p2_real.T > p2.T and p2_real.s > p1.s
@@ -1,8 +1,41 @@
-class Condenser:
+import numpy as np
+from src.utils import State
+from .component import Component
+
+
+class Condenser(Component):
     """
     - Out 100% liquid (saturated liquid, x=0) edge of T-s diagram
     - p = const
     - T = const
+    - No work: q = h_2 - h_1 < 0
     """
 
-    
+    def __init__(self, *, A: State, B: State, gas: str = "STEAM"):
+        super().__init__(gas, A=A, B=B)
+        assert self.gas == "STEAM", "Only steam condenses"
+
+    def solve(self):
+        A = self._inlet("p", "h")
+        self._outlet(p=A.p, x=0)
+
+    def heat(self) -> float | np.ndarray:
+        """q = h_2 - h_1, negative: the heat is rejected"""
+        return self.B.h - self.A.h
+
+
+if __name__ == "__main__":
+    # Tutorial 2 - b), the wet steam out of the turbine at 0.1 bar
+    p1 = State("1", p="0.1 bar", x=0.8011)
+    p2 = State("2")
+    condenser = Condenser(A=p1, B=p2)
+    condenser.solve()
+    assert p2.p == p1.p and p2.x == 0 and p2.T == p1.T
+    assert round(condenser.heat() / 1e3) == -1917
+
+    # Over a sweep of condenser pressures
+    p1 = State("1", p=np.array([0.05e5, 0.1e5, 0.2e5]), x=1)
+    p2 = State("2")
+    condenser = Condenser(A=p1, B=p2)
+    condenser.solve()
+    assert np.all(np.diff(p2.T) > 0) and np.all(condenser.heat() < 0)
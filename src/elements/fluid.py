@@ -0,0 +1,141 @@
+"""
+The working fluids of the steady-flow components.
+
+A fluid finds all the properties of a state from a pair of them, e.g. (p, T) at
+the inlet of a turbine or (p, s) at the end of an ideal expansion. The values may
+be floats or NumPy arrays of the same shape (one entry per point of a sweep): the
+tables are looked up in batch, the points out of the tables are NaN. A single
+point out of the tables raises an AssertionError, as the scalar lookups do.
+"""
+import numpy as np
+from src.utils import State
+from src.utils.gas import GASES, Gas
+from src.utils.process import STEAM_PAIRS
+from src.utils.variable_gas import P_REF, T_REF, VariableGas
+from src.tables.water import STEAM_BACKENDS, steam_backend
+
+# Properties filled by the fluids, x only for the wet steam
+PROPERTIES = ("p", "T", "v", "u", "h", "s", "x")
+
+
+def _output(values: dict[str, np.ndarray], valid: np.ndarray, scalar: bool, query: str) -> dict:
+    """The arrays as floats for a single point (NaN as None)"""
+    if not scalar:
+        return values
+    assert bool(np.all(valid)), f"The state at {query} is not tabulated"
+    return {name: None if np.isnan(value) else float(value) for name, value in values.items()}
+
+
+class SteamFluid:
+    """Water and steam, from the selected backend (see STEAM_BACKENDS)"""
+    name = "STEAM"
+
+    # Pairs defining a state, by order of preference
+    PAIRS = STEAM_PAIRS
+
+    def properties(self, pair: tuple[str, str], first, second) -> dict:
+        """The properties of the states given by the pair, e.g. properties(("p", "s"), 1e4, 6658.6)"""
+        assert pair in self.PAIRS, f"Invalid pair {pair}, expected one of {self.PAIRS}"
+        rows = STEAM_BACKENDS[steam_backend()].get_many(**{pair[0]: first, pair[1]: second})
+        values = {name: getattr(rows, name) for name in PROPERTIES}
+        return _output(values, rows.valid, rows.valid.ndim == 0, f"{pair[0]}={first}, {pair[1]}={second}")
+
+    def pair(self, state: State) -> tuple[str, str] | None:
+        """The pair of known properties defining the state, None if it is not defined"""
+        return next((pair for pair in self.PAIRS if all(getattr(state, name) is not None for name in pair)), None)
+
+    def complete(self, state: State) -> State:
+        """Fill the unknown properties of the state from its defining pair, return the state"""
+        if all(getattr(state, name) is not None for name in PROPERTIES[:-1]):
+            return state
+
+        pair = self.pair(state)
+        assert pair is not None, f"State {state.name} is not defined, expected one of {self.PAIRS}"
+        values = self.properties(pair, getattr(state, pair[0]), getattr(state, pair[1]))
+        for name, value in values.items():
+            if getattr(state, name) is None:
+                setattr(state, name, value)
+        return state
+
+
+class IdealGasFluid(SteamFluid):
+    """
+    An ideal gas (see GASES), with a constant or a temperature-dependent c_p.
+
+    For a constant c_p, the entropy is taken as 0 at T_REF and P_REF:
+    s(T, p) = c_p ln(T / T_REF) - R ln(p / P_REF)
+    """
+    PAIRS = (("p", "T"), ("p", "h"), ("p", "s"))
+
+    def __init__(self, model: Gas | VariableGas):
+        self.model = model
+        self.name = model.name
+
+    def properties(self, pair: tuple[str, str], first, second) -> dict:
+        model = self.model
+        p, value = np.asarray(first, dtype=np.float64), np.asarray(second, dtype=np.float64)
+        match pair[1], model:
+            case "T", _:
+                T = value
+            case "h", VariableGas():
+                T = model.T_from_h(value)
+            case "s", VariableGas():
+                T = model.T_from_sp(value, p)
+            case "h", _:
+                T = value / model.c_p
+            case "s", _:
+                T = T_REF * np.exp((value + model.R * np.log(p / P_REF)) / model.c_p)
+            case _:
+                raise ValueError(f"Invalid pair {pair}, expected one of {self.PAIRS}")
+
+        p, T = np.broadcast_arrays(p, np.asarray(T, dtype=np.float64))
+        if isinstance(model, VariableGas):
+            s = model.s(T, p)
+        else:
+            s = model.c_p * np.log(T / T_REF) - model.R * np.log(p / P_REF)
+
+        values = {"p": p, "T": T, "v": model.R * T / p, "u": model.u(T), "h": model.h(T), "s": s}
+        return _output(values, ~np.isnan(T), p.ndim == value.ndim == 0, f"{pair[0]}={first}, {pair[1]}={second}")
+
+
+STEAM = SteamFluid()
+
+
+def fluid(gas: "str | Gas | VariableGas") -> SteamFluid | IdealGasFluid:
+    """The fluid by name ("STEAM" or one of GASES), or the fluid of a gas model"""
+    if not isinstance(gas, str):
+        return IdealGasFluid(gas)
+    if gas.upper() == STEAM.name:
+        return STEAM
+    assert gas.upper() in GASES, f"Unknown fluid '{gas}', expected STEAM or one of {', '.join(GASES)}"
+    return IdealGasFluid(GASES[gas.upper()])
+
+
+if __name__ == "__main__":
+    # Tutorial 2 - b), the inlet of the turbine and the end of the isentropic expansion
+    s3 = STEAM.complete(State("3", p="80 bar", T="480 C"))
+    assert round(s3.h, 0) == 3348400 and round(s3.s, 1) == 6658.6 and s3.x is None
+    s4 = STEAM.complete(State("4", p="0.1 bar", s=s3.s))
+    assert round(s4.x, 4) == 0.8011
+
+    # Saturated liquid, and a batch of points along the isobar
+    s1 = STEAM.complete(State("1", p="0.1 bar", x=0))
+    assert round(s1.T - 273.15, 1) == 45.8
+    rows = STEAM.properties(("p", "h"), 1e4, np.array([s1.h, s4.h, 1e3]))
+    assert np.allclose(rows["x"][:2], [0, s4.x]) and np.isnan(rows["T"][2])
+
+    try:
+        STEAM.complete(State("2", p="0.1 bar", h=1e3))
+        assert False, "Compressed liquid found in the tables"
+    except AssertionError as e:
+        assert "not tabulated" in str(e)
+
+    # Ideal gases, with a constant and a variable c_p
+    air = fluid("air")
+    state = air.complete(State("1", p=P_REF, h=air.model.h(T_REF)))
+    assert round(state.T, 6) == T_REF and round(state.s, 9) == 0
+    T = air.properties(("p", "s"), 10e5, state.s)["T"]
+    assert round(T, 1) == round(T_REF * (10e5 / P_REF) ** (0.4 / 1.4), 1)
+    gas = fluid("air-variable")
+    T = gas.properties(("p", "s"), np.array([1e5, 10e5]), gas.model.s(300.0, 1e5))["T"]
+    assert T.shape == (2,) and round(T[0], 6) == 300 and 570 < T[1] < 580
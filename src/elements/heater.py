@@ -1,7 +1,43 @@
+import numpy as np
+from src.utils import State
+from .component import Component
 
-class Heater:
+
+class Heater(Component):
     """
     Propeties:
 
     - P = const (isobaric)
-    """
\ No newline at end of file
+    - No work: q = h_2 - h_1
+
+    The outlet is given by its temperature (or its enthalpy, or its quality).
+    With a negative heat, it is a cooler (e.g. the heat rejection of a Brayton cycle)
+    """
+
+    def __init__(self, *, A: State, B: State, gas: str = "STEAM"):
+        super().__init__(gas, A=A, B=B)
+
+    def solve(self):
+        A = self._inlet("p", "h")
+        self._outlet(p=A.p)
+
+    def heat(self) -> float | np.ndarray:
+        """q = h_2 - h_1"""
+        return self.B.h - self.A.h
+
+
+if __name__ == "__main__":
+    # Tutorial 2 - b), the boiler at 80 bar, from the saturated liquid at 0.1 bar pumped
+    p1 = State("1", p="80 bar", h=199.9e3)
+    p2 = State("2", T="480 C")
+    heater = Heater(A=p1, B=p2)
+    heater.solve()
+    assert p2.p == p1.p
+    assert round(heater.heat() / 1e3, 1) == 3148.5
+
+    # Air heated at 10 bar, to a sweep of temperatures
+    p1 = State("1", p="10 bar", T=579.2)
+    p2 = State("2", T=np.array([1200, 1400]))
+    heater = Heater(A=p1, B=p2, gas="AIR")
+    heater.solve()
+    assert np.allclose(heater.heat(), 1004.5 * (p2.T - 579.2))
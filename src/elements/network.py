@@ -0,0 +1,141 @@
+import numpy as np
+from src.utils import State
+from .component import Component
+
+
+class Network:
+    """
+    A closed loop of steady-flow components, e.g. a Rankine cycle:
+
+        network = Network()
+        network.add(Pump(A=p1, B=p2))
+        network.add(Heater(A=p2, B=p3))
+        network.add(Turbine(0.85, A=p3, B=p4))
+        network.add(Condenser(A=p4, B=p1))
+        network.solve()
+        network.efficiency()
+
+    The outlet of each component is the inlet of the next one. The states given by
+    a pair of properties (e.g. p and T at the inlet of the turbine) are completed
+    first, then the components are solved in one pass around the loop, from the
+    first one whose inlet is known. The values are per unit mass flow, and may be
+    arrays: the whole sweep goes around the loop at once.
+    """
+
+    def __init__(self):
+        self.components: list[Component] = []
+
+    def add(self, component: Component):
+        self.components.append(component)
+
+    def states(self) -> list[State]:
+        """The distinct states of the network, in the order of the components"""
+        states = {}
+        for component in self.components:
+            states.setdefault(id(component.A), (component.A, component.fluid))
+            states.setdefault(id(component.B), (component.B, component.fluid))
+        return [state for state, _ in states.values()]
+
+    def solve(self):
+        """Compute all the states, raise a ValueError if no inlet is defined"""
+        defined = set()
+        for component in self.components:
+            for state in (component.A, component.B):
+                if id(state) not in defined and component.fluid.pair(state) is not None:
+                    component.fluid.complete(state)
+                    defined.add(id(state))
+
+        start = next((i for i, component in enumerate(self.components) if id(component.A) in defined), None)
+        if start is None:
+            raise ValueError("No inlet of the network is defined by a pair of properties, e.g. p and T")
+        for component in self.components[start:] + self.components[:start]:
+            component.solve()
+
+    def work(self) -> float | np.ndarray:
+        """Net work done by the fluid [J/kg]"""
+        return sum(component.work() for component in self.components)
+
+    def heat_in(self) -> float | np.ndarray:
+        """Heat added to the fluid [J/kg], the rejected heat is not counted"""
+        return sum(np.maximum(component.heat(), 0) for component in self.components)
+
+    def efficiency(self) -> float | np.ndarray:
+        return self.work() / self.heat_in()
+
+    def power(self, m_dot: float | np.ndarray = 1.0) -> float | np.ndarray:
+        """Net power delivered for a mass flow m_dot [kg/s] [W]"""
+        return m_dot * self.work()
+
+
+if __name__ == "__main__":
+    from src.elements import Compressor, Condenser, Heater, Pump, Turbine
+
+    # Tutorial 2 - b), Rankine cycle between 0.1 bar and 80 bar, 480°C
+    def rankine(μ=1, p_condenser="0.1 bar"):
+        p1 = State("1", p=p_condenser, x=0)
+        p2 = State("2", p="80 bar")
+        p3 = State("3", p="80 bar", T="480 C")
+        p4 = State("4", p=p_condenser)
+
+        network = Network()
+        network.add(Pump(A=p1, B=p2))
+        network.add(Heater(A=p2, B=p3))
+        network.add(Turbine(μ, A=p3, B=p4))
+        network.add(Condenser(A=p4, B=p1))
+        return network
+
+    network = rankine()
+    network.solve()
+    assert round(network.work() / 1e3, 1) == 1231.5
+    assert round(network.efficiency(), 3) == 0.391
+    assert network.power(m_dot=100) == 100 * network.work()
+
+    # The same cycle from processes: the pump and the turbine keep the entropy, the compressed
+    # liquid after the pump needs the IF97 equations
+    from src.cycle import Cycle
+    from src.processes import Isentropic, Isobaric
+    from src.tables.water import use_steam_backend
+    use_steam_backend("if97")
+    p1, p2, p3, p4 = State("1", p="0.1 bar", x=0), State("2", p="80 bar"), State("3", p="80 bar", T="480 C"), State("4", p="0.1 bar")
+    cycle = Cycle("steam")
+    cycle.add_step(Isentropic("STEAM", A=p1, B=p2))
+    cycle.add_step(Isobaric("STEAM", A=p2, B=p3))
+    cycle.add_step(Isentropic("STEAM", A=p3, B=p4))
+    cycle.add_step(Isobaric("STEAM", A=p4, B=p1))
+    cycle.solve()
+    assert p2.s == p1.s and p4.s == p3.s and round(p4.x, 2) == 0.80
+    assert round(p1.T - 273.15, 1) == 45.8 and p2.T > p1.T
+
+    # Net work and heat from the enthalpies: q = Δh on the isobars, w = -Δu on the isentropes
+    assert np.isclose(cycle.work(), (p3.h - p4.h) - (p2.h - p1.h)) and np.isclose(cycle.heat_in(), p3.h - p2.h)
+    assert round(cycle.efficiency(), 3) == round(network.efficiency(), 3)
+    use_steam_backend("tables")
+
+    # A sweep of the turbine efficiency, and of the condenser pressure, in one pass each
+    μ = np.linspace(0.7, 1, 31)
+    sweep = rankine(μ)
+    sweep.solve()
+    for i in (0, 15, 30):
+        scalar = rankine(float(μ[i]))
+        scalar.solve()
+        assert np.isclose(sweep.efficiency()[i], scalar.efficiency())
+
+    p = np.array([0.05e5, 0.1e5, 0.2e5, 0.5e5])
+    sweep = rankine(p_condenser=p)
+    sweep.solve()
+    assert np.isclose(sweep.efficiency()[1], network.efficiency())
+    assert np.all(np.diff(sweep.efficiency()) < 0)
+
+    # Brayton cycle with air, 1 -> 10 bar, 1400 K at the inlet of the turbine
+    p1 = State("1", p="1 bar", T=300)
+    p2 = State("2", p="10 bar")
+    p3 = State("3", p="10 bar", T=1400)
+    p4 = State("4", p="1 bar")
+
+    brayton = Network()
+    brayton.add(Compressor(A=p1, B=p2))
+    brayton.add(Heater(A=p2, B=p3, gas="AIR"))
+    brayton.add(Turbine(A=p3, B=p4, gas="AIR"))
+    brayton.add(Heater(A=p4, B=p1, gas="AIR"))
+    brayton.solve()
+    assert round(brayton.efficiency(), 4) == round(1 - 10 ** (-0.4 / 1.4), 4)
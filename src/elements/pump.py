@@ -1,8 +1,51 @@
-class Pump:
+import numpy as np
+from src.utils import State
+from .component import Component
+
+
+class Pump(Component):
     """
     Propeties:
     work with liquids only (x = 0)
 
     - V = const (incompressible)
     - Isentropic compression: s1 = s2 = s
-    """
\ No newline at end of file
+
+    The compressed liquid is not tabulated, so the outlet is found from the
+    incompressible liquid: w_s = v (p_2 - p_1), h_2 = h_1 + w_s / μ
+    """
+
+    def __init__(self, μ: float | np.ndarray = 1, *, A: State, B: State, gas: str = "STEAM"):
+        assert np.all((0 < np.asarray(μ)) & (np.asarray(μ) <= 1)), "The efficiency must be between 0 and 1"
+        super().__init__(gas, A=A, B=B)
+        self.μ = μ
+
+    def solve(self):
+        """The outlet pressure must be given"""
+        A, B = self._inlet("p", "T", "v", "h", "s"), self.B
+        assert B.p is not None, f"The outlet pressure of the pump ({B.name}) is not given"
+        w_s = A.v * (B.p - A.p)
+        h = A.h + w_s / self.μ
+
+        # Incompressible liquid: v and T are unchanged, the losses raise the entropy (ds = dq / T)
+        for name, value in (("v", A.v), ("T", A.T), ("h", h), ("u", h - B.p * A.v), ("s", A.s + (h - A.h - w_s) / A.T)):
+            if getattr(B, name) is None:
+                setattr(B, name, value)
+
+    def work(self) -> float | np.ndarray:
+        """w = h_1 - h_2, negative: the work is done on the liquid"""
+        return self.A.h - self.B.h
+
+
+if __name__ == "__main__":
+    # Tutorial 2 - b), saturated liquid from 0.1 bar to 80 bar
+    p1 = State("1", p="0.1 bar", x=0)
+    p2 = State("2", p="80 bar")
+    pump = Pump(A=p1, B=p2)
+    pump.solve()
+    assert round(pump.work() / 1e3, 2) == -8.07
+    assert p2.s == p1.s
+
+    p2 = State("2", p="80 bar")
+    Pump(np.array([0.5, 1]), A=p1, B=p2).solve()
+    assert np.allclose(p2.h - p1.h, [2 * 8.07e3, 8.07e3], rtol=1e-3)
@@ -1,5 +1,9 @@
+import numpy as np
+from src.utils import State
+from .component import Component
 
-class Turbine:
+
+class Turbine(Component):
     """
     Properties:
     - Converts enthalpy (or energy) from the fluid into mechanical work
@@ -12,18 +16,46 @@ class Turbine:
     - Steady-state operation
     - No heat transfer to turbine and pump
 
-    => P_12 = \dot{m} * (h_1 - h_2)
+    => P_12 = \\dot{m} * (h_1 - h_2)
 
     Have an efficiency -> two points T_2 and T_2s
 
     where:
-    μ = (h_2s - h_1) / (h_2 - h_1) = (T_2s - T_1) / (T_2 - T_1)
+    μ = (h_1 - h_2) / (h_1 - h_2s)
     if not given -> 1
     """
 
-    def __init__(self):
-        pass
-
-
-
-    
\ No newline at end of file
+    def __init__(self, μ: float | np.ndarray = 1, *, A: State, B: State, gas: str = "STEAM"):
+        assert np.all((0 < np.asarray(μ)) & (np.asarray(μ) <= 1)), "The efficiency must be between 0 and 1"
+        super().__init__(gas, A=A, B=B)
+        self.μ = μ
+
+    def solve(self):
+        """The outlet pressure must be given, h_2 = h_1 - μ (h_1 - h_2s)"""
+        A, B = self._inlet("h", "s"), self.B
+        assert B.p is not None, f"The outlet pressure of the turbine ({B.name}) is not given"
+        h_2s = self.fluid.properties(("p", "s"), B.p, A.s)["h"]
+        self._outlet(h=A.h - self.μ * (A.h - h_2s))
+
+    def work(self) -> float | np.ndarray:
+        """w = h_1 - h_2"""
+        return self.A.h - self.B.h
+
+
+if __name__ == "__main__":
+    # Tutorial 2 - b), expansion from 80 bar and 480°C to 0.1 bar
+    p1 = State("1", p="80 bar", T="480 C")
+    p2 = State("2", p="0.1 bar")
+    turbine = Turbine(A=p1, B=p2)
+    turbine.solve()
+    assert round(p2.x, 4) == 0.8011
+    assert round(turbine.work() / 1e3, 1) == 1239.5
+    assert turbine.power(m_dot=10) == 10 * turbine.work()
+
+    # A sweep of the efficiency, in one call
+    μ = np.linspace(0.7, 1, 7)
+    p2 = State("2", p="0.1 bar")
+    turbine = Turbine(μ, A=p1, B=p2)
+    turbine.solve()
+    assert np.allclose(turbine.work() / 1239.5e3, μ, rtol=1e-4)
+    assert np.all(np.diff(p2.x) < 0)
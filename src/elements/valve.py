@@ -1,5 +1,29 @@
-class Valve:
+from src.utils import State
+from .component import Component
+
+
+class Valve(Component):
     """Or Throttle Valve
     h = h2 = h1
-    
-    """
\ No newline at end of file
+
+    No work and no heat, the pressure drop is irreversible (s2 > s1)
+    """
+
+    def __init__(self, *, A: State, B: State, gas: str = "STEAM"):
+        super().__init__(gas, A=A, B=B)
+
+    def solve(self):
+        """The outlet pressure must be given"""
+        A, B = self._inlet("h"), self.B
+        assert B.p is not None, f"The outlet pressure of the valve ({B.name}) is not given"
+        self._outlet(h=A.h)
+
+
+if __name__ == "__main__":
+    # Throttling of superheated steam, from 80 bar and 480°C down to 10 bar
+    p1 = State("1", p="80 bar", T="480 C")
+    p2 = State("2", p="10 bar")
+    valve = Valve(A=p1, B=p2)
+    valve.solve()
+    assert p2.h == p1.h and p2.s > p1.s and p2.T < p1.T
+    assert valve.work() == 0 and valve.heat() == 0
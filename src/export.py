@@ -0,0 +1,252 @@
+"""
+Headless export of the T-s and p-v diagrams of many solved cycles.
+
+The figures are rendered with the Agg canvas, never through pyplot, so nothing
+waits for (or needs) a display. A Renderer owns one figure and its artists: for
+each cycle, the data of its lines, markers and labels are updated in place and
+the figure is saved, instead of building a new figure per cycle.
+
+The cycles are first reduced to Drawings: their sampled paths (see Process.path),
+plain arrays that can be sent to other processes. Each worker of the pool keeps
+its own Renderer across all the drawings it is given.
+
+    jobs = ((drawing, f"report/{i}.png") for i, drawing in enumerate(drawings(cycle)))
+    for path in export(jobs, workers=8):
+        ...
+
+The format follows the extension of each file: .png, .svg, .pdf...
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator
+import numpy as np
+from src.cycle import Cycle
+from src.utils.path import Path
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Offset of the names of the states from their marker [points]
+LABEL_OFFSET = (5, 5)
+
+
+@dataclass
+class Drawing:
+    """What the diagrams of a solved cycle show, picklable"""
+    steps: list[tuple[str, Path]] # (label, path) of each step
+    states: list[tuple[str, float, float, float, float]] # (name, v, p, s, T) of the state at the start of each step
+    steam: bool = False # Drawn over the saturation dome, with a log volume axis
+    title: str = ""
+
+
+def drawings(cycle: Cycle, title: str = "") -> list[Drawing]:
+    """
+    The drawings of a solved cycle: one, or one per entry when its states are
+    arrays (e.g. a sweep solved in one pass), the paths are sampled only once
+    """
+    paths = [step.path() for step in cycle.steps]
+    count = max(int(np.prod(path.p.shape[1:])) for path in paths)
+    steam = any(step.gas == "STEAM" for step in cycle.steps)
+
+    result = []
+    for i in range(count):
+        def column(values: np.ndarray) -> np.ndarray:
+            return values.reshape(len(values), -1)[:, i] if values.ndim > 1 else values
+
+        steps = [(type(step).__name__, Path(*(column(getattr(path, name)) for name in ("p", "T", "v", "s")))) for step, path in zip(cycle.steps, paths)]
+        states = [(step.A.name, float(path.v[0]), float(path.p[0]), float(path.s[0]), float(path.T[0])) for step, (_, path) in zip(cycle.steps, steps)]
+        result.append(Drawing(steps, states, steam, title if count == 1 else f"{title} [{i}]".strip()))
+    return result
+
+
+class Renderer:
+    """
+    A figure with a p-v and a T-s diagram, whose artists are updated in place
+    to draw each cycle. Headless (Agg) unless given a figure, e.g. plt.figure()
+    """
+
+    def __init__(self, figure: "Figure | None" = None, *, size: tuple[float, float] = (12, 5), dpi: int = 100):
+        if figure is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            figure = Figure(figsize=size, dpi=dpi)
+            FigureCanvasAgg(figure)
+        self.figure = figure
+        self.ax_pv, self.ax_ts = figure.subplots(1, 2)
+        self.ax_pv.set(title="p-v Diagram", xlabel="Specific volume [m^3/kg]", ylabel="Pressure [Pa]")
+        self.ax_ts.set(title="T-s Diagram", xlabel="Entropy [J/(kg K)]", ylabel="Temperature [K]")
+
+        # Created as needed, then reused: a (p-v, T-s) pair of artists per step
+        self._lines = []
+        self._labels = []
+        self._markers = (self.ax_pv.plot([], [], "ok", zorder=3)[0], self.ax_ts.plot([], [], "ok", zorder=3)[0])
+        self._dome = None
+
+    def _pair(self, artists: list, i: int, create) -> tuple:
+        while len(artists) <= i:
+            artists.append((create(self.ax_pv), create(self.ax_ts)))
+        return artists[i]
+
+    def draw(self, drawing: Drawing):
+        """Update the artists to show the drawing"""
+        steam = drawing.steam
+        if steam and self._dome is None:
+            from src.tables.dome import dome
+            self._dome = (dome(), self.ax_pv.add_collection(dome().collection("pv")), self.ax_ts.add_collection(dome().collection("Ts")))
+        if self._dome is not None:
+            self._dome[1].set_visible(steam)
+            self._dome[2].set_visible(steam)
+        self.ax_pv.set_xscale("log" if steam else "linear")
+
+        for i, (label, path) in enumerate(drawing.steps):
+            pv, ts = self._pair(self._lines, i, lambda ax: ax.plot([], [], color=f"C{len(self._lines) % 10}")[0])
+            pv.set_data(path.v, path.p)
+            ts.set_data(path.s, path.T)
+            for line in (pv, ts):
+                line.set_label(label)
+                line.set_visible(True)
+        for pv, ts in self._lines[len(drawing.steps):]:
+            pv.set_visible(False)
+            ts.set_visible(False)
+
+        names, v, p, s, T = zip(*drawing.states) if drawing.states else ((), (), (), (), ())
+        self._markers[0].set_data(v, p)
+        self._markers[1].set_data(s, T)
+        for i, name in enumerate(names):
+            create = lambda ax: ax.annotate("", (0, 0), textcoords="offset points", xytext=LABEL_OFFSET)
+            for text, xy in zip(self._pair(self._labels, i, create), ((v[i], p[i]), (s[i], T[i]))):
+                text.set_text(name)
+                text.xy = xy
+                text.set_visible(True)
+        for pair in self._labels[len(names):]:
+            for text in pair:
+                text.set_visible(False)
+
+        # The limits of the visible lines, and of the dome
+        for ax, diagram in ((self.ax_pv, "pv"), (self.ax_ts, "Ts")):
+            ax.relim(visible_only=True)
+            if steam:
+                ax.update_datalim(self._dome[0].segments(diagram).reshape(-1, 2))
+            ax.autoscale_view()
+
+        legend = self.ax_pv.get_legend()
+        if legend is not None:
+            legend.remove()
+        self.ax_pv.legend(handles=[pv for pv, _ in self._lines[:len(drawing.steps)]])
+        self.figure.suptitle(drawing.title)
+
+    def save(self, drawing: Drawing, path: str | os.PathLike, **kwargs):
+        """Draw the drawing and write the figure, the keyword arguments are passed to savefig"""
+        self.draw(drawing)
+        self.figure.savefig(path, **kwargs)
+
+
+# The renderer of this process, see _renderer()
+_RENDERER: Renderer | None = None
+
+
+def _renderer() -> Renderer:
+    """The headless renderer of this process, created on first use and kept"""
+    global _RENDERER
+    if _RENDERER is None:
+        _RENDERER = Renderer()
+    return _RENDERER
+
+
+def save(cycle: Cycle, path: str | os.PathLike, title: str = "", **kwargs):
+    """Write the diagrams of a solved cycle to a file, headless"""
+    result = drawings(cycle, title)
+    assert len(result) == 1, f"The cycle holds {len(result)} cycles, export each of drawings(cycle)"
+    _renderer().save(result[0], path, **kwargs)
+
+
+def _save_chunk(jobs: list[tuple[Drawing, str]]) -> list[str]:
+    renderer = _renderer()
+    for drawing, path in jobs:
+        renderer.save(drawing, path)
+    return [path for _, path in jobs]
+
+
+def export(jobs: Iterable[tuple[Drawing, str]], workers: int | None = None, *, chunksize: int = 16, prefetch: int = 2) -> Iterator[str]:
+    """
+    Write each drawing to its file, yield the files in the order of the jobs.
+
+    With more than one worker, the jobs are sent to a pool by chunks of `chunksize`,
+    at most `prefetch` chunks per worker in flight (as for src.parallel.Runner).
+    One worker renders them in this process
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = iter(jobs)
+    chunks = iter(lambda: list(islice(jobs, chunksize)), [])
+    if workers == 1:
+        for chunk in chunks:
+            yield from _save_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_renderer) as executor:
+        pending = deque(executor.submit(_save_chunk, chunk) for chunk in islice(chunks, workers * prefetch))
+        while pending:
+            paths = pending.popleft().result()
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(_save_chunk, chunk))
+            yield from paths
+
+
+if __name__ == "__main__":
+    import pickle
+    import tempfile
+    from src.utils import State
+    from src.processes import Isentropic, Isobaric, Isochoric, Isothermal
+
+    # Otto cycles over the peak temperature, solved in one pass
+    def otto(T_3) -> Cycle:
+        p1, p2, p3, p4 = State("P1", T=300, p="1 bar"), State("P2", v=0.0703), State("P3", T=T_3), State("P4")
+        cycle = Cycle()
+        cycle.add_step(Isentropic(A=p1, B=p2))
+        cycle.add_step(Isochoric(A=p2, B=p3))
+        cycle.add_step(Isentropic(A=p3, B=p4))
+        cycle.add_step(Isochoric(A=p4, B=p1))
+        cycle.solve()
+        return cycle
+
+    sweep = drawings(otto(np.linspace(1200, 2000, 6)), "Otto")
+    assert len(sweep) == 6 and sweep[5].title == "Otto [5]"
+    assert np.isclose(sweep[5].steps[1][1].T[-1], 2000) and sweep[0].states[0][0] == "P1"
+    assert pickle.loads(pickle.dumps(sweep[0])).steps[0][0] == "Isentropic"
+
+    with tempfile.TemporaryDirectory() as folder:
+        # The same figure for every drawing, its artists updated
+        renderer = _renderer()
+        lines = list(renderer._lines)
+        jobs = [(drawing, os.path.join(folder, f"otto-{i}.png")) for i, drawing in enumerate(sweep)]
+        assert list(export(jobs, workers=1)) == [path for _, path in jobs]
+        assert renderer is _renderer() and renderer._lines[:len(lines)] == lines and len(renderer._lines) == 4
+        assert all(os.path.getsize(path) > 0 for _, path in jobs)
+        assert renderer.ax_ts.get_ylim()[1] >= 2000
+
+        # In a pool, to vector and PDF files too
+        jobs = [(drawing, os.path.join(folder, f"otto-{i}.{ext}")) for i, (drawing, ext) in enumerate(zip(sweep, ("svg", "pdf", "png") * 2))]
+        assert list(export(jobs, workers=2, chunksize=2)) == [path for _, path in jobs]
+        with open(jobs[0][1]) as f:
+            assert "<svg" in f.read(1000)
+        with open(jobs[1][1], "rb") as f:
+            assert f.read(4) == b"%PDF"
+
+        # A single cycle, from Cycle.plot
+        cycle = otto(1600)
+        cycle.plot(os.path.join(folder, "otto.png"))
+        assert os.path.getsize(os.path.join(folder, "otto.png")) > 0
+
+        # A step less hides the artists of the last one
+        p1, p2, p3 = State("P1", T=300, p="1 bar"), State("P2", p="10 bar"), State("P3", T=300)
+        cycle = Cycle()
+        cycle.add_step(Isentropic(A=p1, B=p2))
+        cycle.add_step(Isobaric(A=p2, B=p3))
+        cycle.add_step(Isothermal(A=p3, B=p1))
+        cycle.solve()
+        save(cycle, os.path.join(folder, "triangle.svg"), title="Triangle")
+        assert [pv.get_visible() for pv, _ in renderer._lines] == [True, True, True, False]
+        assert not renderer._labels[3][0].get_visible() and renderer.figure._suptitle.get_text() == "Triangle"
@@ -0,0 +1,183 @@
+"""
+Parallel runner for the sweeps that cannot be vectorized (e.g. steam-table states).
+
+The cycles are described by compact picklable specs, not live objects: the
+states by their known properties, the steps by the name of their process. The
+specs are sent to a pool of worker processes by chunks, each worker rebuilds and
+solves its cycles, and the results stream back in the order of the specs.
+
+    specs = (CycleSpec(states={...}, steps=[("Isentropic", "P1", "P2"), ...]) for ...)
+    with Runner() as runner:
+        for result in runner.map(specs):
+            ...
+
+The workers are started once per Runner and load the steam tables before their
+first cycle, so later runs on the same Runner do not pay for it again.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator
+from src.cycle import Cycle
+from src.utils import State
+import src.utils.variable_gas # Registers the gases with a variable specific heat
+import src.processes as processes
+
+# Properties reported for each state of a solved cycle
+PROPERTIES = ("p", "T", "v", "u", "h", "s", "x")
+
+
+@dataclass
+class CycleSpec:
+    """
+    Picklable description of a cycle.
+
+        CycleSpec(
+            states={"P1": {"T": 300, "p": "1 bar"}, "P2": {"v": 0.0703}, ...},
+            steps=[("Isentropic", "P1", "P2"), ("Isochoric", "P2", "P3"), ...],
+        )
+    """
+    states: dict[str, dict[str, float | str]] # Known properties of each state, by name
+    steps: list[tuple[str, str, str]] # (process, A, B), the processes are the classes of src.processes
+    gas: str = "air" # Working fluid of every step
+
+    def build(self) -> Cycle:
+        """Return the cycle described by the spec, not solved"""
+        states = {name: State(name, **props) for name, props in self.states.items()}
+        cycle = Cycle(self.gas)
+        for process, A, B in self.steps:
+            cycle.add_step(getattr(processes, process)(self.gas.upper(), A=states[A], B=states[B]))
+        return cycle
+
+
+@dataclass
+class CycleResult:
+    states: dict[str, dict[str, float | None]] = field(default_factory=dict) # Properties of each state, by name
+    work: float | None = None # Net work done by the system [J/kg]
+    heat: float | None = None # Heat input [J/kg]
+    efficiency: float | None = None # Thermal efficiency
+    error: str | None = None # Why the cycle could not be solved
+
+
+# How a single cycle fails: invalid or inconsistent data (ValueError, e.g. UnderdeterminedError),
+# a state out of the tables (AssertionError), a singular formula (ArithmeticError, e.g. ZeroDivisionError)
+FAILURES = (ValueError, AssertionError, ArithmeticError)
+
+
+def solve(spec: CycleSpec) -> CycleResult:
+    """
+    Build and solve the cycle of a spec.
+    A cycle that cannot be solved gives a result with its error, instead of raising
+    """
+    try:
+        cycle = spec.build()
+        cycle.solve()
+        result = CycleResult(states={state.name: {name: getattr(state, name) for name in PROPERTIES} for state in cycle.states()})
+        result.work, result.heat, result.efficiency = cycle.work(), cycle.heat_in(), cycle.efficiency()
+    except FAILURES as e:
+        return CycleResult(error=f"{type(e).__name__}: {e}")
+    return result
+
+
+def _solve_chunk(specs: list[CycleSpec]) -> list[CycleResult]:
+    return [solve(spec) for spec in specs]
+
+
+def _warm_up():
+    """Load the tables once per worker, before its first cycle"""
+    from src.tables.water import TABLE_SATURATED, TABLE_OVERHEATED, STEAM_BACKENDS, steam_backend
+    for table in (TABLE_SATURATED, TABLE_OVERHEATED, STEAM_BACKENDS[steam_backend()]):
+        table.load()
+
+
+class Runner:
+    """
+    Pool of warm workers solving cycle specs.
+
+    The specs are sent by chunks of `chunksize`, to amortize the cost of the
+    inter-process calls over many cycles, and at most `prefetch` chunks per worker
+    are in flight, so a long (or endless) generator of specs is consumed as the
+    results are read instead of all at once.
+    """
+
+    def __init__(self, workers: int | None = None, *, chunksize: int = 64, prefetch: int = 2):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.prefetch = prefetch
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_warm_up)
+
+    def map(self, specs: Iterable[CycleSpec]) -> Iterator[CycleResult]:
+        """Solve the specs, yield their results in the same order"""
+        specs = iter(specs)
+        chunks = iter(lambda: list(islice(specs, self.chunksize)), [])
+
+        pending = deque()
+        for chunk in islice(chunks, self.workers * self.prefetch):
+            pending.append(self._executor.submit(_solve_chunk, chunk))
+
+        while pending:
+            results = pending.popleft().result()
+            for chunk in islice(chunks, 1):
+                pending.append(self._executor.submit(_solve_chunk, chunk))
+            yield from results
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self) -> "Runner":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run(specs: Iterable[CycleSpec], workers: int | None = None, *, chunksize: int = 64) -> Iterator[CycleResult]:
+    """Solve the specs on a new pool of workers, yield their results in the same order"""
+    with Runner(workers, chunksize=chunksize) as runner:
+        yield from runner.map(specs)
+
+
+if __name__ == "__main__":
+    import numpy as np
+
+    # Otto cycles - Tutorial 3, over the compression ratio
+    def otto(e: float) -> CycleSpec:
+        return CycleSpec(
+            states={"P1": {"T": 300, "p": "1 bar"}, "P2": {"v": 287 * 300 / 1e5 / e}, "P3": {"T": 1600}, "P4": {}},
+            steps=[("Isentropic", "P1", "P2"), ("Isochoric", "P2", "P3"), ("Isentropic", "P3", "P4"), ("Isochoric", "P4", "P1")],
+        )
+
+    ratios = np.linspace(6, 12, 500)
+    results = list(run((otto(e) for e in ratios), workers=2, chunksize=32))
+    assert len(results) == len(ratios)
+    assert np.allclose([r.efficiency for r in results], 1 - 1 / ratios ** 0.4)
+
+    # Same results as a cycle solved in this process
+    cycle = otto(ratios[0]).build()
+    cycle.solve()
+    assert results[0].states["P4"]["T"] == cycle.states()[3].T
+
+    # Steam states, from the tables loaded by each worker
+    steam = CycleSpec(
+        states={"P1": {"p": "80 bar", "T": "480 C"}, "P2": {"p": "80 bar", "T": "500 C"}},
+        steps=[("Isobaric", "P1", "P2"), ("Isobaric", "P2", "P1")],
+        gas="steam",
+    )
+    result, = run([steam], workers=1)
+    assert round(result.states["P1"]["h"], 2) == 3348400 # Tutorial 2 - (b - 1)
+    assert result.work == 0 and round(result.heat) == round(result.states["P2"]["h"] - result.states["P1"]["h"]) # Heated and cooled back
+
+    # A cycle that cannot be solved does not stop the others
+    broken = CycleSpec(states={"P1": {}, "P2": {"T": 800}}, steps=[("Isentropic", "P1", "P2"), ("Isochoric", "P2", "P1")])
+    with Runner(2, chunksize=1) as runner:
+        results = list(runner.map([otto(8), broken, otto(10)]))
+    assert results[1].error.startswith("UnderdeterminedError")
+    assert results[0].error is None and results[2].error is None
+
+    # Nor a singular formula, in the same chunk as the others (a zero pressure)
+    singular = CycleSpec(states={"P1": {"T": 300, "p": 0}, "P2": {"T": 600}}, steps=[("Isochoric", "P1", "P2"), ("Isochoric", "P2", "P1")])
+    with Runner(2, chunksize=3) as runner:
+        results = list(runner.map([otto(8), singular, otto(10)]))
+    assert results[1].error.startswith("ZeroDivisionError") and results[2].efficiency > results[0].efficiency
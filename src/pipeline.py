@@ -0,0 +1,195 @@
+"""
+Streaming exploration of large design spaces.
+
+The grid of parameters is never materialized: it is walked by chunks, each chunk
+is solved as one vectorized cycle (see `src.sweep`) and summarized into columns,
+then passed through the stages of the pipeline and dropped. The memory stays the
+size of one chunk, whatever the size of the sweep.
+
+    chunks = summaries(otto, chunksize=100_000, e=np.linspace(6, 12, 1000), T_3=np.linspace(1200, 2000, 1000))
+    chunks = where(chunks, lambda chunk: chunk["efficiency"] > 0.55)
+    write_csv(chunks, "otto.csv")
+
+A chunk is a dict of columns of the same length:
+- the parameters, e.g. "e" and "T_3"
+- the properties of each state, e.g. "P2.T"
+- the work and heat of each step, e.g. "P1->P2.work"
+- the totals of the cycle: "work", "heat" and "efficiency"
+"""
+import os
+from typing import Any, Callable, Iterable, Iterator
+import numpy as np
+from src.cycle import Cycle
+
+# A chunk of solved cycles, by column
+Chunk = dict[str, np.ndarray]
+
+# Properties of the states in the summaries
+PROPERTIES = ("p", "T", "v", "u", "h", "s")
+
+
+def summarize(cycle: Cycle, parameters: dict[str, np.ndarray]) -> Chunk:
+    """Columns of a solved cycle, whose parameters are arrays of the same shape (flattened)"""
+    shape = np.shape(next(iter(parameters.values())))
+    column = lambda value: np.broadcast_to(np.asarray(value, dtype=np.float64), shape).ravel()
+
+    chunk = {name: column(value) for name, value in parameters.items()}
+    for state in cycle.states():
+        for name in PROPERTIES:
+            if getattr(state, name) is not None:
+                chunk[f"{state.name}.{name}"] = column(getattr(state, name))
+    for step in cycle.steps:
+        chunk[f"{step.A.name}->{step.B.name}.work"] = column(step.work())
+        chunk[f"{step.A.name}->{step.B.name}.heat"] = column(step.heat())
+
+    chunk["work"] = column(cycle.work())
+    chunk["heat"] = column(cycle.heat_in())
+    chunk["efficiency"] = column(cycle.efficiency())
+    return chunk
+
+
+def summaries(build: Callable[..., Cycle], *, chunksize: int = 100_000, **parameters: np.ndarray) -> Iterator[Chunk]:
+    """
+    Yield the summaries of the cycles over the grid of all the combinations of the
+    parameters, `chunksize` cycles at a time.
+
+    As for `src.sweep.sweep`, `build` receives each parameter as an array (here, one
+    entry per cycle of the chunk) and returns the cycle defined by those arrays
+    """
+    assert parameters, "At least one parameter is required"
+    names = list(parameters)
+    axes = [np.asarray(parameters[name], dtype=np.float64) for name in names]
+    shape = tuple(len(axis) for axis in axes)
+
+    # Walk the flat indices of the grid, only one chunk of it exists at a time
+    for start in range(0, int(np.prod(shape)), chunksize):
+        stop = min(start + chunksize, int(np.prod(shape)))
+        index = np.unravel_index(np.arange(start, stop), shape)
+        values = {name: axis[i] for name, axis, i in zip(names, axes, index)}
+
+        cycle = build(**values)
+        cycle.solve()
+        yield summarize(cycle, values)
+
+
+def where(chunks: Iterable[Chunk], predicate: Callable[[Chunk], np.ndarray]) -> Iterator[Chunk]:
+    """
+    Keep the cycles for which predicate(chunk) is True, e.g.
+    where(chunks, lambda chunk: chunk["efficiency"] > 0.55). The empty chunks are dropped
+    """
+    for chunk in chunks:
+        keep = np.asarray(predicate(chunk), dtype=bool)
+        if keep.any():
+            yield {name: column[keep] for name, column in chunk.items()}
+
+
+def fold(chunks: Iterable[Chunk], fn: Callable[[Any, Chunk], Any], initial: Any) -> Any:
+    """Reduce the chunks to a single value: fn(... fn(fn(initial, chunk_1), chunk_2) ...)"""
+    result = initial
+    for chunk in chunks:
+        result = fn(result, chunk)
+    return result
+
+
+def top(chunks: Iterable[Chunk], column: str, n: int = 10) -> Chunk:
+    """The n cycles with the largest value of the column, in decreasing order (NaN never wins)"""
+    def best(kept: Chunk | None, chunk: Chunk) -> Chunk:
+        if kept is not None:
+            chunk = {name: np.concatenate((kept[name], values)) for name, values in chunk.items()}
+        order = np.argsort(-np.nan_to_num(chunk[column], nan=-np.inf), kind="stable")[:n]
+        return {name: values[order] for name, values in chunk.items()}
+
+    return fold(chunks, best, None) or {}
+
+
+def write_csv(chunks: Iterable[Chunk], path: str | os.PathLike) -> int:
+    """
+    Write the chunks to a CSV file as they come, return the number of rows written.
+    The columns are the ones of the first chunk: a column missing from a later chunk
+    (e.g. a property that could not be computed) is written as empty fields
+    """
+    rows, columns = 0, None
+    with open(path, "w") as f:
+        for chunk in chunks:
+            if columns is None:
+                columns = list(chunk)
+                f.write(",".join(columns) + "\n")
+            present = [name for name in columns if name in chunk]
+            if not present:
+                continue
+            fmt = ",".join("%.10g" if name in chunk else "" for name in columns)
+            np.savetxt(f, np.column_stack([chunk[name] for name in present]), fmt=fmt)
+            rows += len(chunk[present[0]])
+    return rows
+
+
+def write_parquet(chunks: Iterable[Chunk], path: str | os.PathLike) -> int:
+    """
+    Write the chunks to a Parquet file as they come (one row group per chunk),
+    return the number of rows written. Needs pyarrow
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Writing Parquet files needs pyarrow: pip install pyarrow") from None
+
+    rows, writer = 0, None
+    try:
+        for chunk in chunks:
+            table = pa.table(chunk)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+if __name__ == "__main__":
+    import tempfile
+    from src.sweep import sweep
+    from src.utils import State
+    from src.processes import Isentropic, Isochoric
+
+    # Otto cycle, over the compression ratio and the peak temperature
+    def otto(e, T_3):
+        p1 = State("P1", T=300, p="1 bar")
+        p2 = State("P2", v=287 * 300 / 1e5 / e)
+        p3 = State("P3", T=T_3)
+        p4 = State("P4")
+
+        cycle = Cycle()
+        cycle.add_step(Isentropic(A=p1, B=p2))
+        cycle.add_step(Isochoric(A=p2, B=p3))
+        cycle.add_step(Isentropic(A=p3, B=p4))
+        cycle.add_step(Isochoric(A=p4, B=p1))
+        return cycle
+
+    e, T_3 = np.linspace(6, 12, 300), np.linspace(1200, 2000, 200)
+    chunks = list(summaries(otto, chunksize=7000, e=e, T_3=T_3))
+    assert sum(len(chunk["e"]) for chunk in chunks) == 300 * 200
+    assert np.allclose(chunks[0]["efficiency"], 1 - 1 / chunks[0]["e"] ** 0.4)
+    assert np.allclose(chunks[0]["P1->P2.work"] + chunks[0]["P3->P4.work"], chunks[0]["work"])
+
+    # Only the efficient cycles, and the best of them
+    chunks = where(summaries(otto, chunksize=7000, e=e, T_3=T_3), lambda chunk: chunk["efficiency"] > 0.6)
+    best = top(chunks, "work", n=5)
+    assert np.isclose(best["work"][0], sweep(otto, e=e, T_3=T_3).work.max())
+    assert list(best["T_3"]) == [2000] * 5 and np.all(np.diff(best["work"]) <= 0)
+
+    # Written as it goes
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "otto.csv")
+        rows = write_csv(where(summaries(otto, chunksize=7000, e=e, T_3=T_3), lambda chunk: chunk["e"] > 11), path)
+        with open(path) as f:
+            header = f.readline().strip().split(",")
+            assert header[:3] == ["e", "T_3", "P1.p"] and sum(1 for _ in f) == rows
+
+        # A column missing from a later chunk leaves its fields empty, the others stay under their heading
+        chunks = [{"a": np.array([1.0]), "b": np.array([2.0]), "c": np.array([3.0])}, {"a": np.array([4.0]), "c": np.array([6.0])}]
+        assert write_csv(iter(chunks), path) == 2
+        with open(path) as f:
+            assert f.read().splitlines() == ["a,b,c", "1,2,3", "4,,6"]
@@ -2,5 +2,4 @@ from .isothermal import Isothermal
 from .isentropic import Isentropic
 from .isobaric import Isobaric
 from .isochoric import Isochoric
-
-# TODO: What processes are missing?
\ No newline at end of file
+from .polytropic import Polytropic
@@ -1,9 +1,11 @@
-from ..step import Process
-from ..point import Point
-from ..utils import safe
+from ..utils import State
+from ..utils.gas import Gas
+from ..utils.path import Path, gas_path, steam_path
+from ..utils.relations import Relation
+from .polytropic import Polytropic
 
 # This process can have an efficiency - 4s or 4
-class Isentropic(Process):
+class Isentropic(Polytropic):
     """
     https://www.grc.nasa.gov/www/k-12/airplane/compexp.html
 
@@ -34,57 +36,81 @@ class Isentropic(Process):
     T2 / T1 = (v1 / v2) ^ (gamma)
 
     Definition: Entropy (s) remains constant (s1 = s2)
+    Polytropic with n = gamma, for a constant specific heat
     T-s Diagram: The process appears as a vertical line downward
     - Idealized expansion with no heat transfer or irreversibilities
     - Work output is maximized in a turbine.
     """
-    def __init__(self, start, end):
-        super().__init__(start, end)
-        A, B = self.start, self.end
+    def __init__(self, gas: str | None = None, *, A: State, B: State):
+        super().__init__(gas, A=A, B=B)
 
         # The entropy is constant -> s2 = s1
-        if A.s and B.s:
+        if A.s is not None and B.s is not None:
             assert A.s == B.s, "Entropy is not constant, something is wrong with the data"
 
-        # Assign the values
-        A.s = A.s or B.s
-        B.s = B.s or A.s
+    def use_gas(self, gas):
+        super().use_gas(gas)
 
-    def compression_ratio(self, gamma=1.4) -> float | None:
+        # A constant specific heat is the polytrope with n = gamma
+        self.n = self.model.k if isinstance(self.model, Gas) else None
+
+    def relations(self) -> list[Relation]:
         """
         The compression ratio (epsilon) is the ratio of the volume of the gas before compression to the volume after compression.
 
         e = V_A / V_B
         e = (p_B / p_A) ^ (1 / gamma)
         e = (T_B / T_A) ^ (1 / (gamma - 1))
-        """
-        A, B = self.start, self.end
-
-        e = safe(lambda: A.v / B.v)
-        e = e or safe(lambda: (B.p / A.p) ** (1 / gamma))
-        e = e or safe(lambda: (B.T / A.T) ** (1 / (gamma - 1)))
-        return e
-
-    def compute(self, R=287, gamma=1.4):
-        """"""
-        A, B = self.start, self.end
-
-        # First try to compute the compression ratio e, using the data that is available
-        e = self.compression_ratio(gamma)
-
-        # Update the points
-        A.update(R)
-        B.update(R)
 
-        # Using the compression ratio
-        A.p = A.p or safe(lambda: B.p / e ** gamma)
-        B.p = B.p or safe(lambda: A.p * e ** gamma)
-        A.T = A.T or safe(lambda: B.T / e ** (gamma - 1))
-        B.T = B.T or safe(lambda: A.T * e ** (gamma - 1))
-        A.v = A.v or safe(lambda: B.v * e)
-        B.v = B.v or safe(lambda: A.v / e)
-
-    def work(self, R=287, gamma=1.4) -> float:
+        With a variable specific heat, gamma is not constant: the gas relations give
+        the entropy of each state, and the end state is found from s_A = s_B.
+        """
+        isentropic = [
+            # The entropy is constant -> s2 = s1
+            Relation("A.s", ("B.s",), lambda s: s),
+            Relation("B.s", ("A.s",), lambda s: s),
+        ]
+        # With a variable specific heat (VariableGas) or steam, the end state is found from
+        # the entropy, and the exponent from the states
+        if not isinstance(self.model, Gas):
+            return isentropic + [Relation("e", ("A.v", "B.v"), lambda v_A, v_B: v_A / v_B)]
+
+        k = self.model.k
+        return isentropic + [
+            # First try to compute the compression ratio e, using the data that is available
+            Relation("e", ("A.v", "B.v"), lambda v_A, v_B: v_A / v_B),
+            Relation("e", ("A.p", "B.p"), lambda p_A, p_B: (p_B / p_A) ** (1 / k)),
+            Relation("e", ("A.T", "B.T"), lambda T_A, T_B: (T_B / T_A) ** (1 / (k - 1))),
+
+            # Using the compression ratio
+            Relation("A.p", ("B.p", "e"), lambda p, e: p / e ** k),
+            Relation("B.p", ("A.p", "e"), lambda p, e: p * e ** k),
+            Relation("A.T", ("B.T", "e"), lambda T, e: T / e ** (k - 1)),
+            Relation("B.T", ("A.T", "e"), lambda T, e: T * e ** (k - 1)),
+            Relation("A.v", ("B.v", "e"), lambda v, e: v * e),
+            Relation("B.v", ("A.v", "e"), lambda v, e: v / e),
+        ]
+
+    def compression_ratio(self) -> float | None:
+        """The compression ratio e = V_A / V_B, from the data that is available (see `relations`)"""
+        values = self._values()
+        self._graph.solve(values)
+        return values["e"]
+
+    def _trace(self, t) -> Path:
+        """
+        With a constant specific heat, the polytrope with n = gamma. Otherwise
+        p = p_A * (p_B / p_A)^t and T is found from s = s_A, from the tables for steam
+        """
+        A, B = self.A, self.B
+        if self.n is not None or (self.model is None and A.s is None):
+            return super()._trace(t)
+        p = A.p * (B.p / A.p) ** t
+        if self.model is None:
+            return steam_path(p=p, s=A.s + 0 * t)
+        return gas_path(self.model, p, self.model.T_from_sp(A.s, p))
+
+    def work(self) -> float:
         """
         First law for a Closed system:
         
@@ -99,55 +125,34 @@ class Isentropic(Process):
 
         Work done by the system: positive
         Work done on the system: negative
+
+        For steam, Δu is read from the states
         """
-        c_v = R / (gamma - 1)
+        return -self._change("u")
+
+    def heat(self) -> float:
+        """No heat transfer (adiabatic)"""
+        return 0
 
-        A, B = self.start, self.end
-        return -c_v * (B.T - A.T)
         
 if __name__ == "__main__":
-    # Point('P1', T=298.00, p=1.00, v=85526.00)
-    # Point('P2', T=911.25, p=50.00, v=5230.56)
-
-    # Test 1 - T and p
-    p1 = Point('P1', T=298.00, p=1.00)
-    p2 = Point('P2', p=50.00)
-    isentropic = Isentropic(p1, p2)
-    isentropic.compute()
-    print(p1)
-    print(p2)
-
-    p1 = Point('P1', p=1.00)
-    p2 = Point('P2', T=911.25, p=50.00)
-    isentropic = Isentropic(p1, p2)
-    isentropic.compute()
-    print(p1)
-    print(p2)
-
-    p1 = Point('P1', v=85526.00)
-    p2 = Point('P2', T=911.25, v=5230.56)
-    isentropic = Isentropic(p1, p2)
-    isentropic.compute()
-    print(p1)
-    print(p2)
-
-    p1 = Point('P1', T=298.00, v=85526.00)
-    p2 = Point('P2', v=5230.56)
-    isentropic = Isentropic(p1, p2)
-    isentropic.compute()
-    print(p1)
-    print(p2)
-
-    p1 = Point('P1', p=1.00, v=85526.00)
-    p2 = Point('P2', v=5230.56)
-    isentropic = Isentropic(p1, p2)
-    isentropic.compute()
-    print(p1)
-    print(p2)
-
-    p1 = Point('P1', v=85526.00)
-    p2 = Point('P2', p=50, v=5230.56)
-    isentropic = Isentropic(p1, p2)
-    isentropic.compute()
-    print(p1)
-    print(p2)
\ No newline at end of file
+    # Diesel cycle - Exercise 3, compression from 1 to 50 bar
+    p1 = State("P1", T=298.00, p="1 bar")
+    p2 = State("P2", p="50 bar")
+    isentropic = Isentropic(A=p1, B=p2)
+    assert isentropic.compute() == {"A.s", "B.s"}
+    assert round(p2.T, 2) == 911.25
+    assert round(isentropic.compression_ratio(), 2) == 16.35
+
+    # Backward, from the end state
+    p1 = State("P1", p="1 bar")
+    p2 = State("P2", T=911.25, p="50 bar")
+    Isentropic(A=p1, B=p2).compute()
+    assert round(p1.T, 2) == 298.00
+
+    # From the volumes
+    p1 = State("P1", T=298.00, v=0.85526)
+    p2 = State("P2", v=0.85526 / 16.35)
+    Isentropic(A=p1, B=p2).compute()
+    assert round(p2.T, 0) == 911
+    assert round(p2.get_pressure("bar"), 0) == 50
@@ -1,56 +1,50 @@
-from ..step import Process
-from ..point import Point
-from ..utils import safe
-import matplotlib.pyplot as plt
+from ..utils import State
+from ..utils.path import Path, gas_path, steam_path
+from ..utils.relations import Relation
+from .polytropic import Polytropic
 
 
-class Isobaric(Process):
+class Isobaric(Polytropic):
     """
-    Isobaric Process (p = constant)
+    Isobaric Process (p = constant), polytropic with n = 0
     - Pressure remains constant throughout the process (p_A = p_B).
     - Work: W = p * ΔV
     - Heat: Q = ΔU + W
     - Represented on a P-V diagram as a horizontal line.
     """
 
-    def __init__(self, A: Point, B: Point, R=287, gamma=1.4):
-        super().__init__(A, B, R, gamma)
+    def __init__(self, gas: str | None = None, *, A: State, B: State):
+        super().__init__(gas, A=A, B=B, n=0)
 
         # The pressure must remain constant (p_A = p_B)
-        if A.p and B.p:
+        if A.p is not None and B.p is not None:
             assert A.p == B.p, "Pressure is not constant, something is wrong with the data."
 
-        # Assign consistent pressure values if one is missing
-        A.p = A.p or B.p
-        B.p = B.p or A.p
-
-    def compute(self):
+    def relations(self) -> list[Relation]:
         """
-        Compute the missing thermodynamic properties based on the ideal gas law
-        and relationships for an isobaric process.
+        The pressure is constant, so by the ideal gas law: T_A / T_B = v_A / v_B
         """
-        A, B, R = self.A, self.B, self.R
-
-        # Ensure pressure is constant
-        A.p = A.p or B.p
-        B.p = B.p or A.p
-
-        # Update the points with current state
-        A.update(R)
-        B.update(R)
-
-        # Compute missing properties using the ideal gas law
-        A.T = A.T or safe(lambda: B.T * (A.v / B.v))
-        B.T = B.T or safe(lambda: A.T * (B.v / A.v))
-        A.v = A.v or safe(lambda: B.v * (A.T / B.T))
-        B.v = B.v or safe(lambda: A.v * (B.T / A.T))
+        return [
+            # Ensure pressure is constant
+            Relation("A.p", ("B.p",), lambda p: p),
+            Relation("B.p", ("A.p",), lambda p: p),
+
+            # Compute missing properties using the ideal gas law
+            Relation("A.T", ("B.T", "A.v", "B.v"), lambda T, v_A, v_B: T * (v_A / v_B)),
+            Relation("B.T", ("A.T", "B.v", "A.v"), lambda T, v_B, v_A: T * (v_B / v_A)),
+            Relation("A.v", ("B.v", "A.T", "B.T"), lambda v, T_A, T_B: v * (T_A / T_B)),
+            Relation("B.v", ("A.v", "B.T", "A.T"), lambda v, T_B, T_A: v * (T_B / T_A)),
+        ]
 
     def work(self) -> float:
         """
         Calculate the work done during the isobaric process.
-        W = p * ΔV
+        W = p * ΔV = R * ΔT
         """
-        return 0
+        A, B = self.A, self.B
+        if self.model is None:
+            return A.p * (B.v - A.v)
+        return self.model.R * (B.T - A.T)
     
     def heat(self) -> float:
         """
@@ -58,72 +52,43 @@ class Isobaric(Process):
         Q = ΔU + W
         ΔU = n * C_v * ΔT (internal energy change)
         W = p * ΔV
+        => Q = ΔH = c_p * ΔT
         """
-        return 0
+        return self._change("h")
 
-    def plot(self, ax_pv: plt.Axes, ax_ts: plt.Axes):
-        """"""
+    def _trace(self, t) -> Path:
+        """
+        T = T_A * (T_B / T_A)^t, an exponential curve on the T-s diagram: s = c_p * ln(T) + constant.
+        For steam, h = h_A + (h_B - h_A) * t, flat across the dome
+        """
         A, B = self.A, self.B
+        if self.model is None:
+            if A.h is None or B.h is None:
+                return super()._trace(t)
+            return steam_path(p=A.p + 0 * t, h=A.h + (B.h - A.h) * t)
+        return gas_path(self.model, A.p, A.T * (B.T / A.T) ** t)
 
-        # Plot the process on the P-V diagram
-        ax_pv.plot([A.v, B.v], [A.p, B.p], label="Isobaric", color="red")
-
-        # Plot the process on the T-S diagram
-        ax_ts.plot([A.s, B.s], [A.T, B.T], label="Isobaric", color="red")
-        
 
 if __name__ == "__main__":
-    # Exercise 3
-    # Point('P1', T=911.25, p=50.00, v=5230.56)
-    # Point('P2', T=1600.00, p=50.00, v=9184.00)
-    # TODO: Flipped p1 and p2
-
-    p1 = Point("P1", T=911.25, p=50)
-    p2 = Point("P2", T=1600)
-    isobaric = Isobaric(p1, p2)
+    # Diesel cycle - Exercise 3, combustion at 50 bar
+    p1 = State("P1", T=911.25, p="50 bar")
+    p2 = State("P2", T=1600)
+    isobaric = Isobaric(A=p1, B=p2)
     isobaric.compute()
-    print(p1)
-    print(p2)
+    assert p2.get_pressure("bar") == 50
+    assert round(p2.v / p1.v, 4) == round(1600 / 911.25, 4)
 
-    p1 = Point("P1", T=911.25)
-    p2 = Point("P2", T=1600, p=50)
-    isobaric = Isobaric(p1, p2)
-    isobaric.compute()
-    print(p1)
-    print(p2)
-
-    p1 = Point("P1", p=50, v=5230.57)
-    p2 = Point("P2", v=9184.00)
-    isobaric = Isobaric(p1, p2)
-    isobaric.compute()
-    print(p1)
-    print(p2)
-
-    p1 = Point("P1", v=5230.56)
-    p2 = Point("P2", p=50, v=9184.00)
-    isobaric = Isobaric(p1, p2)
-    isobaric.compute()
-    print(p1)
-    print(p2)
-
-    p1 = Point("P1", v=5230.57)
-    p2 = Point("P2", p=50, T=1600.00)
-    isobaric = Isobaric(p1, p2)
-    isobaric.compute()
-    print(p1)
-    print(p2)
-
-    p1 = Point("P1", T=911.25, p=50.00)
-    p2 = Point("P2", v=9184.00)
-    isobaric = Isobaric(p1, p2)
-    isobaric.compute()
-    print(p1)
-    print(p2)
+    # From the volumes, the pressure only given on the end state
+    p1 = State("P1", v=0.052306)
+    p2 = State("P2", p="50 bar", v=0.091840)
+    Isobaric(A=p1, B=p2).compute()
+    assert round(p1.T) == 911
+    assert round(p2.T) == 1600
 
     # Try to plot
     import matplotlib.pyplot as plt
     fig, (ax_pv, ax_ts) = plt.subplots(1, 2)
     ax_pv.set_title("P-V Diagram")
     ax_ts.set_title("T-S Diagram")
-    isobaric.plot(ax_pv, ax_ts)
-    plt.show()
\ No newline at end of file
+    isobaric.plot(ax_pv, ax_ts, color="red")
+    plt.show()
@@ -1,11 +1,13 @@
-from ..step import Process
-from ..point import Point
-from ..utils import safe
+import numpy as np
+from ..utils import State
+from ..utils.path import Path, gas_path
+from ..utils.relations import Relation
+from .polytropic import Polytropic
 
 
-class Isochoric(Process):
+class Isochoric(Polytropic):
     """
-    - Constant Volume Process (ΔV = 0) 
+    - Constant Volume Process (ΔV = 0), polytropic with n = ∞
     - No Work Done (W = 0)
     - Change in Internal Energy (ΔU = Q)
     - Pressure-Temperature Relationship (P1/T1 = P2/T2)
@@ -13,34 +15,43 @@ class Isochoric(Process):
     - Represented on the P-V diagram as a vertical line.    
     """
 
-    def __init__(self, A: Point, B: Point, R=287, gamma=1.4):
-        super().__init__(A, B, R, gamma)
+    def __init__(self, gas: str | None = None, *, A: State, B: State):
+        super().__init__(gas, A=A, B=B, n=np.inf)
 
         # The volume must be constant
-        if self.A.v and B.v:
+        if A.v is not None and B.v is not None:
             assert A.v == B.v, "Volume is not constant, something is wrong with the data"
 
-    def compute(self):
-        A, B, R = self.A, self.B, self.R
-
-        # The volume must be constant
-        A.v = A.v or B.v
-        B.v = B.v or A.v
-
-        # Update the points
-        A.update(R)
-        B.update(R)
-
-        # If we don't have the volume, we can compute it using the ideal gas law
-        A.T = A.T or safe(lambda: B.T * (A.p / B.p))
-        B.T = B.T or safe(lambda: A.T * (B.p / A.p))
-        A.p = A.p or safe(lambda: B.p * (A.T / B.T))
-        B.p = B.p or safe(lambda: A.p * (B.T / A.T))
+    def relations(self) -> list[Relation]:
+        """
+        The volume is constant, so by the ideal gas law: p_A / T_A = p_B / T_B
+        """
+        return [
+            # The volume must be constant
+            Relation("A.v", ("B.v",), lambda v: v),
+            Relation("B.v", ("A.v",), lambda v: v),
+
+            # If we don't have the volume, we can compute it using the ideal gas law
+            Relation("A.T", ("B.T", "A.p", "B.p"), lambda T, p_A, p_B: T * (p_A / p_B)),
+            Relation("B.T", ("A.T", "B.p", "A.p"), lambda T, p_B, p_A: T * (p_B / p_A)),
+            Relation("A.p", ("B.p", "A.T", "B.T"), lambda p, T_A, T_B: p * (T_A / T_B)),
+            Relation("B.p", ("A.p", "B.T", "A.T"), lambda p, T_B, T_A: p * (T_B / T_A)),
+        ]
+
+    def _trace(self, t) -> Path:
+        """T = T_A * (T_B / T_A)^t, p = p_A * T / T_A, an exponential curve on the T-s diagram"""
+        if self.model is None:
+            return super()._trace(t)
+        A, B = self.A, self.B
+        T = A.T * (B.T / A.T) ** t
+        return gas_path(self.model, A.p * T / A.T, T)
 
     def work(self) -> float:
-        """TODO"""
+        """No work is done (ΔV = 0)"""
         return 0
     
     def heat(self) -> float:
-        """TODO"""
-        return 0
\ No newline at end of file
+        """
+        Q = ΔU = c_v * ΔT
+        """
+        return self._change("u")
\ No newline at end of file
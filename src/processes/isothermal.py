@@ -1,51 +1,67 @@
-from ..step import Process
-from ..point import Point
-from ..utils import safe
+import numpy as np
+from ..utils import State
+from ..utils.path import Path, gas_path
+from ..utils.relations import Relation
+from .polytropic import Polytropic
 
 
-class Isothermal(Process):
+class Isothermal(Polytropic):
     """
-    - Constant Temperature Process (ΔT = 0)
+    - Constant Temperature Process (ΔT = 0), polytropic with n = 1
     - Work Done (W = n * R * T * ln(V2/V1))
     - Heat Added Equals Work Done (Q = W, ΔU = 0)
     - Pressure-Volume Relationship (P1 * V1 = P2 * V2)
     - Represented on the P-V diagram as a hyperbolic curve.
     """
 
-    def __init__(self, A: Point, B: Point, R=287, gamma=1.4):
-        super().__init__(A, B, R, gamma)
+    def __init__(self, gas: str | None = None, *, A: State, B: State):
+        super().__init__(gas, A=A, B=B, n=1)
 
         # The temperature must be constant
-        if self.A.T and self.B.T:
+        if A.T is not None and B.T is not None:
             assert A.T == B.T, "Temperature is not constant, something is wrong with the data"
 
-    def compute(self):
-        A, B, R = self.A, self.B, self.R
-
-        # Ensure temperature is constant
-        A.T = A.T or B.T
-        B.T = B.T or A.T
+    def relations(self) -> list[Relation]:
+        """
+        The temperature is constant, so by the ideal gas law: p_A * v_A = p_B * v_B
+        """
+        return [
+            # Ensure temperature is constant
+            Relation("A.T", ("B.T",), lambda T: T),
+            Relation("B.T", ("A.T",), lambda T: T),
 
-        # Update the points
-        A.update(R)
-        B.update(R)
+            # If we don't have a property, calculate it using the ideal gas law and isothermal relationships
+            Relation("A.p", ("B.p", "B.v", "A.v"), lambda p, v_B, v_A: p * (v_B / v_A)),
+            Relation("B.p", ("A.p", "A.v", "B.v"), lambda p, v_A, v_B: p * (v_A / v_B)),
+            Relation("A.v", ("B.p", "B.v", "A.p"), lambda p_B, v_B, p_A: p_B * v_B / p_A),
+            Relation("B.v", ("A.p", "A.v", "B.p"), lambda p_A, v_A, p_B: p_A * v_A / p_B),
+        ]
 
-        # If we don't have a property, calculate it using the ideal gas law and isothermal relationships
-        A.p = A.p or safe(lambda: B.p * (B.v / A.v))
-        B.p = B.p or safe(lambda: A.p * (A.v / B.v))
-        A.v = A.v or safe(lambda: B.p * B.v / A.p)
-        B.v = B.v or safe(lambda: A.p * A.v / B.p)
+    def _trace(self, t) -> Path:
+        """p = p_A * (p_B / p_A)^t, a hyperbola on the p-v diagram: p * v = R * T"""
+        if self.model is None:
+            return super()._trace(t)
+        A, B = self.A, self.B
+        return gas_path(self.model, A.p * (B.p / A.p) ** t, A.T)
 
     def work(self) -> float:
         """
         Calculate the work done during the isothermal process.
         W = n * R * T * ln(V2/V1)
+        For steam, u changes with p: W = Q - ΔU
         """
-        return 0
+        A, B = self.A, self.B
+        if self.model is None:
+            return self.heat() - self._change("u")
+        return self.model.R * A.T * np.log(B.v / A.v)
     
     def heat(self) -> float:
         """
         Calculate the heat transfer during the isothermal process.
         For isothermal processes, Q = W (ΔU = 0).
+        For steam, Q = T * ΔS
         """
-        return 0
+        A, B = self.A, self.B
+        if self.model is None:
+            return A.T * (B.s - A.s)
+        return self.work()
@@ -0,0 +1,193 @@
+import numpy as np
+from ..utils import State, Process
+from ..utils.path import Path, gas_path
+from ..utils.relations import Relation
+
+
+class Polytropic(Process):
+    """
+    Polytropic Process (p * v^n = constant)
+    - n = 0: isobaric, n = 1: isothermal, n = k: isentropic (constant c_p), n = ∞: isochoric
+    - With the ideal gas law: T * v^(n - 1) = constant and T * p^((1 - n) / n) = constant
+    - Work: W = (p_B * v_B - p_A * v_A) / (1 - n) = R * (T_B - T_A) / (1 - n), W = R * T * ln(v_B / v_A) for n = 1
+    - Heat: Q = ΔU + W
+
+    The exponent n is given, or found from the states (see `exponent`). It may be an
+    array, as the properties of the states, to sweep n in one compute.
+
+    The specializations (Isobaric, Isothermal, Isentropic and Isochoric) have their
+    own relations and closed forms, without n. As n = 0 fixes no volume ratio, n = 1
+    no relation between p and T and n = ∞ no pressure ratio, use Isobaric, Isothermal
+    and Isochoric for them.
+
+    For steam, the tables keep only the identities of a process, so a given n fixes
+    no state: n is then found from the states, and the specializations give the rest.
+    """
+
+    def __init__(self, gas: str | None = None, *, A: State, B: State, n: float | np.ndarray | None = None):
+        # The relations of p with v (1 / n) or with T (n / (n - 1)) are singular there, see the specializations
+        if n is not None and type(self).relations is Polytropic.relations and np.any(np.isin(n, (0, 1))):
+            raise ValueError(f"Polytropic exponent n = {n} is singular, use Isobaric (n = 0) or Isothermal (n = 1)")
+
+        self.n = n
+        super().__init__(gas, A=A, B=B)
+
+    def use_gas(self, gas):
+        super().use_gas(gas)
+
+        # The relations with n only hold for an ideal gas, the tables would silently leave the states unknown
+        if self.n is not None and type(self).relations is Polytropic.relations and self.model is None:
+            raise ValueError(f"Polytropic exponent n = {self.n} cannot be given for {self.gas}, give both states instead")
+
+    def relations(self) -> list[Relation]:
+        """
+        p_A * v_A^n = p_B * v_B^n
+        T_A * v_A^(n - 1) = T_B * v_B^(n - 1)
+        T_A * p_A^((1 - n) / n) = T_B * p_B^((1 - n) / n)
+        """
+        return [
+            # The exponent, from the data that is available
+            Relation("n", ("A.p", "B.p", "A.v", "B.v"), lambda p_A, p_B, v_A, v_B: np.log(p_B / p_A) / np.log(v_A / v_B)),
+            Relation("n", ("A.T", "B.T", "A.v", "B.v"), lambda T_A, T_B, v_A, v_B: 1 + np.log(T_B / T_A) / np.log(v_A / v_B)),
+            Relation("n", ("A.T", "B.T", "A.p", "B.p"), lambda T_A, T_B, p_A, p_B: 1 / (1 - np.log(T_B / T_A) / np.log(p_B / p_A))),
+
+            # p * v^n = constant
+            Relation("A.p", ("B.p", "B.v", "A.v", "n"), lambda p, v_B, v_A, n: p * (v_B / v_A) ** n),
+            Relation("B.p", ("A.p", "A.v", "B.v", "n"), lambda p, v_A, v_B, n: p * (v_A / v_B) ** n),
+            Relation("A.v", ("B.v", "B.p", "A.p", "n"), lambda v, p_B, p_A, n: v * (p_B / p_A) ** (1 / n)),
+            Relation("B.v", ("A.v", "A.p", "B.p", "n"), lambda v, p_A, p_B, n: v * (p_A / p_B) ** (1 / n)),
+
+            # T * v^(n - 1) = constant and T * p^((1 - n) / n) = constant
+            Relation("A.T", ("B.T", "B.v", "A.v", "n"), lambda T, v_B, v_A, n: T * (v_B / v_A) ** (n - 1)),
+            Relation("B.T", ("A.T", "A.v", "B.v", "n"), lambda T, v_A, v_B, n: T * (v_A / v_B) ** (n - 1)),
+            Relation("A.T", ("B.T", "B.p", "A.p", "n"), lambda T, p_B, p_A, n: T * (p_A / p_B) ** ((n - 1) / n)),
+            Relation("B.T", ("A.T", "A.p", "B.p", "n"), lambda T, p_A, p_B, n: T * (p_B / p_A) ** ((n - 1) / n)),
+            Relation("A.p", ("B.p", "B.T", "A.T", "n"), lambda p, T_B, T_A, n: p * (T_A / T_B) ** (n / (n - 1))),
+            Relation("B.p", ("A.p", "A.T", "B.T", "n"), lambda p, T_A, T_B, n: p * (T_B / T_A) ** (n / (n - 1))),
+        ]
+
+    def _values(self) -> dict[str, float | None]:
+        values = super()._values()
+        if "n" in self._graph.variables:
+            values["n"] = self.n
+        return values
+
+    def exponent(self) -> float | np.ndarray | None:
+        """The exponent n: given, or found from the states n = ln(p_B / p_A) / ln(v_A / v_B)"""
+        if self.n is not None:
+            return self.n
+
+        A, B = self.A, self.B
+        if any(value is None for value in (A.p, B.p, A.v, B.v)):
+            return None
+        n = np.log(B.p / A.p) / np.log(A.v / B.v)
+        return n if np.ndim(n) else float(n)
+
+    def _trace(self, t) -> Path:
+        """v = v_A * (v_B / v_A)^t, p = p_A * (v_A / v)^n"""
+        if self.model is None:
+            return super()._trace(t)
+        A, B, n = self.A, self.B, self.exponent()
+        v = A.v * (B.v / A.v) ** t
+        p = A.p * (A.v / v) ** n
+        return gas_path(self.model, p, p * v / self.model.R)
+
+    def _change(self, name: str) -> float | np.ndarray:
+        """
+        Change of the internal energy ("u") or of the enthalpy ("h") from A to B: from the
+        model of the gas, or from the properties of the states for a tabulated fluid (steam)
+        """
+        A, B = self.A, self.B
+        if self.model is None:
+            return getattr(B, name) - getattr(A, name)
+        return getattr(self.model, name)(B.T) - getattr(self.model, name)(A.T)
+
+    def work(self) -> float | np.ndarray:
+        """
+        W = ∫ p dv = (p_B * v_B - p_A * v_A) / (1 - n) = R * (T_B - T_A) / (1 - n)
+        For n = 1 (isothermal): W = p * v * ln(v_B / v_A) = R * T * ln(v_B / v_A)
+        The products p * v are taken from the states for a tabulated fluid
+        """
+        A, B, n = self.A, self.B, np.asarray(self.exponent(), dtype=np.float64)
+        if self.model is None:
+            pv_A, pv_B = A.p * A.v, B.p * B.v
+        else:
+            pv_A, pv_B = self.model.R * A.T, self.model.R * B.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            work = np.where(np.isclose(n, 1), pv_A * np.log(B.v / A.v), (pv_B - pv_A) / (1 - n))
+        return work if work.ndim else float(work)
+
+    def heat(self) -> float | np.ndarray:
+        """Q = ΔU + W"""
+        return self._change("u") + self.work()
+
+
+if __name__ == "__main__":
+    from . import Isentropic, Isobaric, Isochoric, Isothermal
+
+    # Compression with n = 1.3, from 1 to 10 bar
+    p1 = State("P1", T=300, p="1 bar")
+    p2 = State("P2", p="10 bar")
+    polytropic = Polytropic(A=p1, B=p2, n=1.3)
+    polytropic.compute()
+    assert round(p2.T, 1) == round(300 * 10 ** (0.3 / 1.3), 1)
+    assert round(p2.v / p1.v, 6) == round(0.1 ** (1 / 1.3), 6)
+    assert round(polytropic.work()) == round(287 * (p2.T - 300) / -0.3)
+    assert round(polytropic.heat()) == round(717.5 * (p2.T - 300) + polytropic.work())
+
+    # The exponent found from the states
+    p3 = State("P3", T=300, p="1 bar")
+    p4 = State("P4", T=p2.T, v=p2.v)
+    unknown = Polytropic(A=p3, B=p4)
+    unknown.compute()
+    assert round(unknown.exponent(), 6) == 1.3 and round(p4.p) == 10e5
+
+    # The closed forms agree with the ones of the specializations
+    steps = [
+        Isobaric(A=State("A", T=300, p="1 bar"), B=State("B", T=600)),
+        Isothermal(A=State("A", T=300, p="1 bar"), B=State("B", p="5 bar")),
+        Isentropic(A=State("A", T=300, p="1 bar"), B=State("B", p="10 bar")),
+        Isochoric(A=State("A", T=300, p="1 bar"), B=State("B", T=600)),
+    ]
+    for step, n in zip(steps, (0, 1, 1.4, np.inf)):
+        step.compute()
+        assert step.exponent() == n
+        assert np.isclose(Polytropic.work(step), step.work(), atol=1e-6)
+        assert np.isclose(Polytropic.heat(step), step.heat(), atol=1e-6)
+
+    # Steam, from the properties of the states: p * v^n = constant between them
+    expansion = Polytropic("STEAM", A=State("S1", p="80 bar", T="480 C"), B=State("S2", p="10 bar", T="300 C"))
+    expansion.compute()
+    A, B, n = expansion.A, expansion.B, expansion.exponent()
+    assert np.isclose(expansion.work(), (B.p * B.v - A.p * A.v) / (1 - n))
+    assert np.isclose(expansion.heat(), B.u - A.u + expansion.work())
+    evaporation = Isothermal("STEAM", A=State("S3", T="100 C", x=0), B=State("S4", x=1))
+    evaporation.compute()
+    assert abs(evaporation.heat() / (evaporation.B.h - evaporation.A.h) - 1) < 1e-3 # Q = T Δs = Δh
+
+    # A given exponent fixes no state of steam
+    try:
+        Polytropic("STEAM", A=State("S5", p="10 bar", T="300 C"), B=State("S6", p="1 bar"), n=1.3)
+        assert False, "Exponent accepted for steam"
+    except ValueError as e:
+        assert "STEAM" in str(e)
+
+    # The singular exponents are left to their specializations
+    for n in (0, 1, np.array([1.2, 1.0])):
+        try:
+            Polytropic(A=State("A", T=300, p="1 bar"), B=State("B", T=300), n=n)
+            assert False, "Singular exponent accepted"
+        except ValueError as e:
+            assert "Isothermal" in str(e)
+
+    # A sweep of the exponent and of the end pressure, in one compute
+    n = np.linspace(1.1, 1.4, 4)
+    p = np.array([5e5, 10e5, 15e5, 20e5])
+    p5, p6 = State("P5", T=300, p="1 bar"), State("P6", p=p)
+    sweep = Polytropic(A=p5, B=p6, n=n)
+    sweep.compute()
+    assert p6.T.shape == (4,) and sweep.work().shape == (4,)
+    for i in (0, 3):
+        scalar = Polytropic(A=State("P5", T=300, p="1 bar"), B=State("P6", p=float(p[i])), n=float(n[i]))
+        scalar.compute()
+        assert np.isclose(scalar.B.T, p6.T[i]) and np.isclose(scalar.work(), sweep.work()[i])
@@ -0,0 +1,276 @@
+"""
+Opt-in instrumentation of the hot paths: table lookups, process computes and solver iterations.
+
+While a Profiler is enabled, the instrumented methods (see TARGETS) are replaced
+on their classes by timed wrappers, which count the calls and time them. Disabling
+the profiler puts the original methods back, so it costs nothing when it is off.
+
+    with profile() as profiler:
+        cycle.solve()
+    profiler.to_dict()          # Calls and times, in total and per solved cycle
+    profiler.to_json("profile.json")
+    profiler.dump_stats("cycle.prof") # For pstats, snakeviz...
+
+For each method, `total` is the time spent in it, its callees included, and `own`
+is the same minus the time spent in the instrumented callees. Each (top-level)
+Cycle.solve or Network.solve gets its own breakdown, with its number of
+iterations: the steps computed by the solver. Only for a single thread.
+"""
+import functools
+import importlib
+import json
+import marshal
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+# Instrumented methods: (module, class, methods). Only the methods defined by the class itself are wrapped
+TARGETS: tuple[tuple[str, str, tuple[str, ...]], ...] = (
+    ("src.cycle", "Cycle", ("solve",)),
+    ("src.elements.network", "Network", ("solve",)),
+    ("src.elements.turbine", "Turbine", ("solve",)),
+    ("src.elements.compressor", "Compressor", ("solve",)),
+    ("src.elements.pump", "Pump", ("solve",)),
+    ("src.elements.valve", "Valve", ("solve",)),
+    ("src.elements.heater", "Heater", ("solve",)),
+    ("src.elements.condenser", "Condenser", ("solve",)),
+    ("src.elements.fluid", "SteamFluid", ("complete", "properties")),
+    ("src.elements.fluid", "IdealGasFluid", ("properties",)),
+    ("src.utils.process", "Process", ("compute",)),
+    ("src.utils.relations", "RelationGraph", ("solve",)),
+    ("src.utils.state_cache", "StateCache", ("complete",)),
+    ("src.tables.saturated", "TableSaturated", ("get", "get_many")),
+    ("src.tables.overheated", "TableOverheated", ("get", "get_ph", "get_ps", "get_many", "get_many_ph", "get_many_ps")),
+    ("src.tables.steam", "TableSteam", ("get", "get_ph", "get_ps", "get_many", "get_many_ph", "get_many_ps", "get_many_px")),
+    ("src.tables.if97", "IF97Saturated", ("get", "get_many")),
+    ("src.tables.if97", "IF97Region", ("get", "get_ph", "get_ps", "get_many", "get_many_ph", "get_many_ps")),
+    ("src.tables.if97", "DenseSteam", ("get", "get_ph", "get_ps", "get_many")),
+)
+
+# Solvers getting a breakdown of their own, and the method of their steps counted as one iteration
+SCOPES = {"Cycle.solve": "compute", "Network.solve": "solve"}
+
+
+@dataclass
+class Timing:
+    calls: int = 0 # Number of calls
+    total: float = 0.0 # Time in the method, the callees included [s]
+    own: float = 0.0 # Time in the method, minus the instrumented callees [s]
+    callers: dict[str | None, list] = field(default_factory=dict) # [calls, own, total] by caller, None at the top level
+
+    def add(self, caller: str | None, elapsed: float, own: float):
+        self.calls += 1
+        self.total += elapsed
+        self.own += own
+        by_caller = self.callers.setdefault(caller, [0, 0.0, 0.0])
+        by_caller[0] += 1
+        by_caller[1] += own
+        by_caller[2] += elapsed
+
+    def to_dict(self) -> dict:
+        return {"calls": self.calls, "total": self.total, "own": self.own}
+
+
+@dataclass
+class _Frame:
+    name: str
+    children: float = 0.0 # Time in the instrumented callees [s]
+
+
+@dataclass
+class _Scope:
+    name: str # e.g. "Cycle P1-P2-P3-P4"
+    solver: str # e.g. "Cycle.solve"
+    timings: dict[str, Timing] = field(default_factory=dict)
+    time: float = 0.0 # [s]
+
+
+class Profiler:
+    """Counters and timers of the instrumented methods, see the module docstring"""
+
+    def __init__(self, targets=TARGETS):
+        self.targets = targets
+        self.timings: dict[str, Timing] = {}
+        self.scopes: list[_Scope] = []
+        self._code: dict[str, tuple[str, int, str]] = {} # pstats key of each method
+        self._stack: list[_Frame] = []
+        self._scope: _Scope | None = None
+        self._originals: list[tuple[type, str, Callable]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def enable(self) -> "Profiler":
+        """Wrap the instrumented methods, return the profiler"""
+        assert not self.enabled, "The profiler is already enabled"
+        for module, name, methods in self.targets:
+            cls = getattr(importlib.import_module(module), name)
+            for method in methods:
+                fn = cls.__dict__.get(method)
+                if fn is None:
+                    continue
+                qualname = f"{name}.{method}"
+                code = fn.__code__
+                self._code[qualname] = (code.co_filename, code.co_firstlineno, qualname)
+                self._originals.append((cls, method, fn))
+                setattr(cls, method, self._wrap(qualname, fn))
+        return self
+
+    def disable(self):
+        """Put the original methods back, the measurements are kept"""
+        for cls, method, fn in reversed(self._originals):
+            setattr(cls, method, fn)
+        self._originals.clear()
+
+    def reset(self):
+        """Drop the measurements"""
+        self.timings.clear()
+        self.scopes.clear()
+
+    def __enter__(self) -> "Profiler":
+        return self.enable()
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    def _wrap(self, name: str, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            return self._call(name, fn, args, kwargs)
+        return timed
+
+    def _call(self, name: str, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        opened = name in SCOPES and self._scope is None
+        if opened:
+            states = "-".join(state.name for state in args[0].states())
+            self._scope = _Scope(f"{name.split('.')[0]} {states}", name)
+
+        frame = _Frame(name)
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            caller = self._stack[-1].name if self._stack else None
+            if self._stack:
+                self._stack[-1].children += elapsed
+
+            own = elapsed - frame.children
+            self.timings.setdefault(name, Timing()).add(caller, elapsed, own)
+            if self._scope is not None:
+                self._scope.timings.setdefault(name, Timing()).add(caller, elapsed, own)
+            if opened:
+                self._scope.time = elapsed
+                self.scopes.append(self._scope)
+                self._scope = None
+
+    def to_dict(self) -> dict:
+        """
+        The measurements: {"functions": {name: {calls, total, own}}, "cycles": [{name,
+        time, iterations, functions}]}, the times in seconds, the slowest first
+        """
+        def functions(timings: dict[str, Timing]) -> dict:
+            order = sorted(timings, key=lambda name: timings[name].total, reverse=True)
+            return {name: timings[name].to_dict() for name in order}
+
+        cycles = []
+        for scope in self.scopes:
+            # The steps computed directly by the solver
+            steps = [timing for name, timing in scope.timings.items() if name.endswith("." + SCOPES[scope.solver])]
+            cycles.append({
+                "name": scope.name,
+                "time": scope.time,
+                "iterations": sum(timing.callers.get(scope.solver, [0])[0] for timing in steps),
+                "functions": functions(scope.timings),
+            })
+        return {"functions": functions(self.timings), "cycles": cycles}
+
+    def to_json(self, path: str | os.PathLike | None = None) -> str:
+        """The measurements as JSON (see to_dict), also written to path if given"""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def create_stats(self):
+        """Fill `stats` in the format of cProfile, so that pstats.Stats(profiler) works"""
+        self.stats = {}
+        for name, timing in self.timings.items():
+            callers = {self._code[caller]: tuple(values[:1] * 2 + values[1:]) for caller, values in timing.callers.items() if caller is not None}
+            self.stats[self._code[name]] = (timing.calls, timing.calls, timing.own, timing.total, callers)
+
+    def dump_stats(self, path: str | os.PathLike):
+        """Write the measurements as a cProfile file, for pstats or snakeviz"""
+        self.create_stats()
+        with open(path, "wb") as f:
+            marshal.dump(self.stats, f)
+
+
+def profile(targets=TARGETS) -> Profiler:
+    """A profiler, to enable for a block: with profile() as profiler: ..."""
+    return Profiler(targets)
+
+
+if __name__ == "__main__":
+    import pstats
+    import tempfile
+    from src.cycle import Cycle
+    from src.utils import State, Process
+    from src.utils.state_cache import STATE_CACHE
+    from src.processes import Isentropic, Isochoric
+
+    def otto() -> Cycle:
+        p1, p2, p3, p4 = State("P1", T=300, p="1 bar"), State("P2", v=0.0703), State("P3", T=1600), State("P4")
+        cycle = Cycle()
+        cycle.add_step(Isentropic(A=p1, B=p2))
+        cycle.add_step(Isochoric(A=p2, B=p3))
+        cycle.add_step(Isentropic(A=p3, B=p4))
+        cycle.add_step(Isochoric(A=p4, B=p1))
+        return cycle
+
+    # Nothing is wrapped outside of the block
+    compute = Process.compute
+    with profile() as profiler:
+        assert Process.compute is not compute
+        otto().solve()
+        otto().solve()
+        STATE_CACHE.clear()
+        Process("STEAM", A=State("1", p="80 bar", T="480 C"), B=State("2", p="8.10 bar", T="440 C")).compute()
+    assert Process.compute is compute and not profiler.enabled
+
+    result = profiler.to_dict()
+    cycles = result["cycles"]
+    assert len(cycles) == 2 and cycles[0]["name"] == "Cycle P1-P2-P3-P4"
+    assert cycles[0]["iterations"] == cycles[0]["functions"]["Process.compute"]["calls"] >= 4
+    assert result["functions"]["Process.compute"]["calls"] == 2 * cycles[0]["iterations"] + 1
+    assert result["functions"]["TableSteam.get"]["calls"] == 2
+    solve = result["functions"]["Cycle.solve"]
+    totals = [timing["total"] for timing in result["functions"].values()]
+    assert 0 < solve["own"] < solve["total"] and totals == sorted(totals, reverse=True)
+    assert json.loads(profiler.to_json()) == result
+
+    # Readable by pstats, the tables are called on the misses of the state cache
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "otto.prof")
+        profiler.dump_stats(path)
+        stats = pstats.Stats(path)
+        key = next(key for key in stats.stats if key[2] == "TableSteam.get")
+        assert stats.stats[key][0] == 2 and any(caller[2] == "StateCache.complete" for caller in stats.stats[key][4])
+
+    # A network gets its breakdown too, one iteration per component
+    from src.elements import Condenser, Heater, Network, Pump, Turbine
+    p1, p2, p3, p4 = State("1", p="0.1 bar", x=0), State("2", p="80 bar"), State("3", p="80 bar", T="480 C"), State("4", p="0.1 bar")
+    network = Network()
+    network.add(Pump(A=p1, B=p2))
+    network.add(Heater(A=p2, B=p3))
+    network.add(Turbine(A=p3, B=p4))
+    network.add(Condenser(A=p4, B=p1))
+    with profile() as profiler:
+        network.solve()
+    network = profiler.to_dict()["cycles"][0]
+    assert network["name"].startswith("Network") and network["iterations"] == 4
@@ -0,0 +1,93 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable
+from src.cycle import Cycle
+
+
+@dataclass
+class SweepResult:
+    parameters: dict[str, np.ndarray] # Value of each parameter at each point of the grid
+    work: np.ndarray # Net work done by the system [J/kg]
+    heat: np.ndarray # Heat input [J/kg]
+    efficiency: np.ndarray # Thermal efficiency
+
+
+def sweep(build: Callable[..., Cycle], **parameters: np.ndarray) -> SweepResult:
+    """
+    Evaluate a cycle over the grid of all the combinations of the parameters.
+
+    `build` receives each parameter as an array, with one entry per point of the
+    grid, and returns the cycle with its states defined by those arrays. The cycle
+    is solved once: the relations of every process evaluate over the whole grid
+    at once, instead of solving one cycle per point.
+
+        def otto(e, T_3):
+            p1 = State("P1", T=300, p="1 bar")
+            p2 = State("P2", v=287 * 300 / 1e5 / e)
+            ...
+            return cycle
+
+        result = sweep(otto, e=np.linspace(6, 12, 100), T_3=np.linspace(1200, 2000, 50))
+        result.efficiency.shape  # (100, 50)
+    """
+    assert parameters, "At least one parameter is required"
+    names = list(parameters)
+    grids = np.meshgrid(*(np.asarray(parameters[name], dtype=np.float64) for name in names), indexing="ij")
+    values = dict(zip(names, grids))
+
+    cycle = build(**values)
+    cycle.solve()
+
+    # The results that do not depend on some parameters are broadcast to the grid
+    shape = grids[0].shape
+    return SweepResult(
+        parameters=values,
+        work=np.broadcast_to(cycle.work(), shape),
+        heat=np.broadcast_to(cycle.heat_in(), shape),
+        efficiency=np.broadcast_to(cycle.efficiency(), shape),
+    )
+
+
+if __name__ == "__main__":
+    from src.utils import State
+    from src.processes import Isentropic, Isobaric, Isochoric
+
+    # Otto cycle, over the compression ratio and the peak temperature
+    def otto(e, T_3):
+        p1 = State("P1", T=300, p="1 bar")
+        p2 = State("P2", v=287 * 300 / 1e5 / e)
+        p3 = State("P3", T=T_3)
+        p4 = State("P4")
+
+        cycle = Cycle()
+        cycle.add_step(Isentropic(A=p1, B=p2))
+        cycle.add_step(Isochoric(A=p2, B=p3))
+        cycle.add_step(Isentropic(A=p3, B=p4))
+        cycle.add_step(Isochoric(A=p4, B=p1))
+        return cycle
+
+    result = sweep(otto, e=np.linspace(6, 12, 200), T_3=np.linspace(1200, 2000, 100))
+    assert result.efficiency.shape == (200, 100)
+    assert np.allclose(result.efficiency, 1 - 1 / result.parameters["e"] ** 0.4)
+    assert np.allclose(result.work, result.efficiency * result.heat)
+
+    # Diesel cycle, over the pressure ratio and the peak temperature
+    def diesel(r_p, T_3):
+        p1 = State("P1", T=298, p="1 bar")
+        p2 = State("P2", p=r_p * 1e5)
+        p3 = State("P3", T=T_3)
+        p4 = State("P4")
+
+        cycle = Cycle()
+        cycle.add_step(Isentropic(A=p1, B=p2))
+        cycle.add_step(Isobaric(A=p2, B=p3))
+        cycle.add_step(Isentropic(A=p3, B=p4))
+        cycle.add_step(Isochoric(A=p4, B=p1))
+        return cycle
+
+    # Each point of the grid is the cycle solved with scalar parameters
+    result = sweep(diesel, r_p=np.linspace(20, 60, 5), T_3=np.linspace(1400, 2200, 3))
+    cycle = diesel(50.0, 1800.0)
+    cycle.solve()
+    assert np.isclose(result.efficiency[3, 1], cycle.efficiency())
+    assert np.isclose(result.work[3, 1], cycle.work())
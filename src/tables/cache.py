@@ -0,0 +1,174 @@
+"""
+Binary on-disk cache of the compiled property tables.
+
+A table is parsed from its CSV once and converted to SI, then its rows and interpolation grid
+are stored as .npy files next to a meta.json:
+
+    __cache__/water-overheated/meta.json
+    __cache__/water-overheated/table.npy
+    __cache__/water-overheated/T.keys.npy
+    ...
+
+Later loads memory-map the arrays, so the many worker processes of a sweep share
+the same physical pages and no text is parsed. The cache is invalidated when the
+CSV changes (its size and mtime, confirmed by its hash), when the units of its
+columns change, or when VERSION is bumped.
+
+The cache directory defaults to `src/tables/__cache__`, it can be moved with the
+THERMO_CACHE_DIR environment variable, and disabled by setting it to "".
+Failing to write the cache (e.g. read-only install) is not an error.
+"""
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from ..utils.units import QUANTITIES, to_si
+
+VERSION = 2
+CACHE_DIR = os.environ.get("THERMO_CACHE_DIR", os.path.join(os.path.dirname(__file__), "__cache__"))
+
+
+def _name(source: str) -> str:
+    """Cache entry of a CSV, e.g. water/overheated.csv -> water-overheated"""
+    path = os.path.relpath(os.path.abspath(source), os.path.dirname(__file__))
+    return os.path.splitext(path)[0].replace(os.sep, "-").replace(".", "_")
+
+
+def _hash(source: str) -> str:
+    with open(source, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load(source: str, kind: str) -> tuple[dict, dict[str, np.ndarray]] | None:
+    """
+    Return the metadata and the memory-mapped arrays cached for the CSV source,
+    or None if there is no valid cache entry.
+    kind identifies what was cached (e.g. the grid class)
+    """
+    if not CACHE_DIR:
+        return None
+
+    folder = os.path.join(CACHE_DIR, _name(source))
+    try:
+        with open(os.path.join(folder, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get("version") != VERSION or meta.get("kind") != kind:
+        return None
+
+    # Cheap check first, the hash only when the file was touched
+    stat = os.stat(source)
+    if (meta["size"], meta["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+        if meta["sha256"] != _hash(source):
+            return None
+
+        # Same content (e.g. a fresh checkout), the next loads can skip the hash
+        meta.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        _write_meta(folder, meta)
+
+    # Plain ndarray views of the mapped memory, slicing a np.memmap is slower
+    try:
+        arrays = {name: np.asarray(np.load(os.path.join(folder, f"{name}.npy"), mmap_mode="r")) for name in meta["arrays"]}
+    except (OSError, ValueError):
+        return None
+    return meta, arrays
+
+
+def _write_meta(folder: str, meta: dict) -> None:
+    """Replace the metadata of a cache entry, at once so that concurrent loads read the old or the new one"""
+    tmp = os.path.join(folder, f"meta.json.tmp-{os.getpid()}")
+    try:
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, os.path.join(folder, "meta.json"))
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def save(source: str, kind: str, meta: dict, arrays: dict[str, np.ndarray]) -> None:
+    """Store the arrays compiled from the CSV source, with some extra metadata"""
+    if not CACHE_DIR:
+        return
+
+    stat = os.stat(source)
+    meta = {
+        **meta,
+        "version": VERSION,
+        "kind": kind,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": _hash(source),
+        "arrays": list(arrays),
+    }
+
+    # Write in a private folder, then swap it in, so concurrent loads never see a partial entry
+    folder = os.path.join(CACHE_DIR, _name(source))
+    tmp = f"{folder}.tmp-{os.getpid()}"
+    try:
+        os.makedirs(tmp, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+        shutil.rmtree(folder, ignore_errors=True)
+        os.replace(tmp, folder)
+    except OSError:
+        pass
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def compile_table(source: str, columns: list[str], grid_cls: type, units: dict[str, str]) -> tuple[pd.DataFrame, object]:
+    """
+    Return the rows of the CSV source, converted to SI from the units of its columns
+    (e.g. {"p": "bar", ...}), and their interpolation grid (built on the given columns),
+    from the cache when possible
+    """
+    kind = grid_cls.__name__
+    cached = load(source, kind)
+    if cached is not None and cached[0]["units"] == units:
+        meta, arrays = cached
+        df = pd.DataFrame(arrays["table"], columns=meta["columns"])
+        return df, grid_cls.from_arrays(columns, arrays)
+
+    # The columns are converted once here, the lookups are in SI
+    df = pd.read_csv(source)
+    for column, unit in units.items():
+        df[column] = to_si(df[column].to_numpy(dtype=np.float64), unit, QUANTITIES[column])
+
+    grid = grid_cls(columns, df[columns].to_numpy())
+    save(source, kind, {"columns": list(df.columns), "units": units}, {"table": df.to_numpy(dtype=np.float64), **grid.to_arrays()})
+    return df, grid
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        CACHE_DIR = os.path.join(folder, "__cache__")
+        source = os.path.join(folder, "table.csv")
+        with open(source, "w") as f:
+            f.write("p,T\n1,300\n2,400\n")
+        save(source, "Grid", {}, {"table": np.array([[1.0, 300.0], [2.0, 400.0]])})
+        assert load(source, "Grid")[1]["table"][1, 1] == 400 and load(source, "Other") is None
+
+        # Touched but unchanged: hashed once, then the metadata has the new mtime
+        calls = []
+        _hash_file = _hash
+        _hash = lambda source: calls.append(source) or _hash_file(source)
+        os.utime(source, ns=(0, 10**18))
+        assert load(source, "Grid") is not None and load(source, "Grid") is not None
+        assert len(calls) == 1 and load(source, "Grid")[0]["mtime_ns"] == 10**18
+
+        # Changed: invalidated
+        with open(source, "a") as f:
+            f.write("3,500\n")
+        assert load(source, "Grid") is None
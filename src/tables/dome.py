@@ -0,0 +1,146 @@
+"""
+The saturation dome of a saturated table, for the T-s and p-v diagrams.
+
+The dome is built once per table: its saturated liquid and vapor lines are
+densified along T with a monotone spline (see `monotone_spline`), so they stay
+smooth and never overshoot between the rows of the table. Both lines are drawn
+as a single LineCollection per diagram, one draw call per dome however many
+cycles are drawn over it.
+
+    dome().plot(ax_pv, ax_ts)
+    ax_ts.add_collection(dome().collection("Ts", colors="gray"))
+
+The tables stop below the critical point, so the two lines are not joined at the top.
+"""
+import weakref
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+import numpy as np
+from .interpolation import monotone_spline
+from .water import STEAM_BACKENDS, steam_backend
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.collections import LineCollection
+    from .saturated import TableSaturated
+
+# Points of each line of the dome per interval between two rows of the table
+DENSITY = 8
+
+# (id of the table, density) -> its dome, see dome(). An entry is dropped with its table, before its id can be reused
+_DOMES: dict[tuple[int, int], "Dome"] = {}
+
+
+@dataclass
+class Dome:
+    T: np.ndarray # Temperature [K]
+    p: np.ndarray # Pressure [Pa]
+    s_f: np.ndarray # Specific entropy - saturated liquid [J/kgK]
+    s_g: np.ndarray # Specific entropy - saturated vapor [J/kgK]
+    v_f: np.ndarray # Specific volume - saturated liquid [m^3/kg]
+    v_g: np.ndarray # Specific volume - saturated vapor [m^3/kg]
+    _segments: dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+
+    def segments(self, diagram: str) -> np.ndarray:
+        """The liquid and the vapor lines in the diagram ("Ts" or "pv"), as an array (2, samples, 2)"""
+        if diagram not in self._segments:
+            match diagram:
+                case "Ts":
+                    lines = ((self.s_f, self.T), (self.s_g, self.T))
+                case "pv":
+                    lines = ((self.v_f, self.p), (self.v_g, self.p))
+                case _:
+                    raise ValueError(f"Invalid diagram '{diagram}', expected 'Ts' or 'pv'")
+            self._segments[diagram] = np.stack([np.column_stack(line) for line in lines])
+        return self._segments[diagram]
+
+    def collection(self, diagram: str, **kwargs) -> "LineCollection":
+        """
+        A new LineCollection of the dome in the diagram ("Ts" or "pv"), the keyword
+        arguments are passed to it. The geometry is shared, only the artist is new
+        (an artist cannot be shared between axes)
+        """
+        from matplotlib.collections import LineCollection
+        kwargs.setdefault("colors", "gray")
+        kwargs.setdefault("linewidths", 1)
+        kwargs.setdefault("zorder", 0)
+        return LineCollection(self.segments(diagram), **kwargs)
+
+    def plot(self, ax_pv: "Axes", ax_ts: "Axes", **kwargs):
+        """Draw the dome under the processes, on a p-v and a T-s diagram"""
+        for ax, diagram in ((ax_pv, "pv"), (ax_ts, "Ts")):
+            ax.add_collection(self.collection(diagram, **kwargs))
+            ax.autoscale_view()
+
+
+def build(table: "TableSaturated", density: int = DENSITY) -> Dome:
+    """
+    The dome of the table, through its rows with `density` points per interval
+    between them, evenly spaced in T. The volumes and the pressure are interpolated
+    in log, as they span decades
+    """
+    rows = table.rows()
+    t = np.arange(density) / density
+    T = np.append((rows.T[:-1, None] + np.diff(rows.T)[:, None] * t).ravel(), rows.T[-1])
+    columns = monotone_spline(rows.T, np.column_stack((rows.s_f, rows.s_g, np.log(rows.v_f), np.log(rows.v_g), np.log(rows.p))), T)
+    s_f, s_g, log_v_f, log_v_g, log_p = columns.T
+    return Dome(T, np.exp(log_p), s_f, s_g, np.exp(log_v_f), np.exp(log_v_g))
+
+
+def dome(table: "TableSaturated | None" = None, density: int = DENSITY) -> Dome:
+    """The dome of the table, the saturated table of the selected steam backend by default. Built once per table"""
+    if table is None:
+        table = STEAM_BACKENDS[steam_backend()].saturated
+    # The tables are DataFrames, unhashable, so the memo is keyed by id and follows the table through a weak reference
+    key = (id(table), density)
+    if key not in _DOMES:
+        _DOMES[key] = build(table, density)
+        weakref.finalize(table, _DOMES.pop, key, None)
+    return _DOMES[key]
+
+
+if __name__ == "__main__":
+    from .water import TABLE_SATURATED
+
+    # Through the rows of the table, and monotone between them
+    rows = TABLE_SATURATED.rows()
+    steam = dome()
+    assert steam is dome() and len(steam.T) == (len(rows.T) - 1) * DENSITY + 1
+    assert np.allclose(steam.s_g[::DENSITY], rows.s_g) and np.allclose(steam.p[::DENSITY], rows.p)
+    assert np.all(np.diff(steam.s_f) > 0) and np.all(np.diff(steam.s_g) < 0) and np.all(np.diff(steam.v_g) < 0)
+
+    # Between the rows, the volume of the vapor within 1% of IF97 (up to 6% when linear in v)
+    from .if97 import IF97Saturated
+    mid = (rows.T[:-1] + rows.T[1:]) / 2
+    v_g = np.exp(monotone_spline(rows.T, np.log(rows.v_g)[:, None], mid)[:, 0])
+    assert np.all(np.abs(v_g / IF97Saturated().get_many(T=mid).v_g - 1) < 0.01)
+
+    # One collection per diagram, with both lines
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    fig, (ax_pv, ax_ts) = plt.subplots(1, 2)
+    steam.plot(ax_pv, ax_ts)
+    assert len(ax_ts.collections) == len(ax_pv.collections) == 1
+    assert steam.segments("Ts").shape == (2, len(steam.T), 2) and steam.segments("pv") is steam.segments("pv")
+    assert ax_ts.get_ylim()[1] >= steam.T[-1]
+
+    # Built from the IF97 saturation line too, the dome of a temporary table goes with it
+    table = IF97Saturated()
+    if97 = dome(table)
+    assert if97 is not steam and dome(table) is if97 and abs(if97.T[-1] - 623.15) < 1e-6
+    key = (id(table), DENSITY)
+    del table
+    import gc
+    gc.collect()
+    assert key not in _DOMES and dome() is steam
+
+    # The default table of each backend, e.g. the dense tables of the IF97 equations
+    from .water import use_steam_backend
+    for backend in STEAM_BACKENDS:
+        use_steam_backend(backend)
+        fig, (ax_pv, ax_ts) = plt.subplots(1, 2)
+        dome().plot(ax_pv, ax_ts)
+        assert dome() is not steam or backend == "tables"
+        assert len(ax_ts.collections) == 1 and ax_ts.get_ylim()[1] >= dome().T[-1]
+    use_steam_backend("tables")
@@ -0,0 +1,453 @@
+"""
+IAPWS-IF97 industrial formulation of the properties of water and steam.
+
+Implemented regions (SI units, as the tables: Pa, K, m^3/kg, J/kg, J/kgK):
+- Region 1: compressed liquid, 273.15 K <= T <= 623.15 K, p_sat(T) <= p <= 100 MPa
+- Region 2: superheated vapor, up to 1073.15 K, p <= p_sat(T) (or the B23 line above 623.15 K)
+- Region 4: the saturation line, up to 623.15 K (16.53 MPa)
+
+Regions 3 (around the critical point) and 5 (above 1073.15 K) are not implemented,
+their states are out of range. The backward T(p, h) and T(p, s) are solved with
+Newton steps on the forward equations, so that they are exact to the round-off.
+
+The regions have the interface of the tables (`IF97Saturated` the one of
+TableSaturated, `IF97Region` the one of TableOverheated), so the same TableSteam
+combines them, see `if97_steam`. Every function works on floats and NumPy arrays,
+the states out of range are NaN (flagged in `valid` by the get_many methods).
+
+The equations cost ~100 times a table lookup. `dense_steam` generates dense
+tables from them once (cached on disk as the CSV tables, regenerated when the
+equations or the grid change), and serves the lookups
+from these tables, but for the states close to the saturation line where the
+interpolation is the least accurate: these fall back to the exact equations.
+"""
+import hashlib
+import os
+import tempfile
+from dataclasses import fields
+import numpy as np
+from .cache import CACHE_DIR
+from .saturated import RowSaturated, RowsSaturated, TableSaturated
+from .overheated import RowOverheated, RowsOverheated, TableOverheated
+from .steam import Phase, RowSteam, RowsSteam, TableSteam
+from ..utils.units import QUANTITIES, from_si
+
+R = 461.526 # Specific gas constant of water [J/kgK]
+T_MIN, T_MAX = 273.15, 1073.15 # Range of the regions 1 and 2 [K]
+T_23 = 623.15 # End of the region 1, and of the implemented saturation line [K]
+P_MAX = 100e6 # Range of the regions 1 and 2 [Pa]
+DENSE_VERSION = 1 # Version of the dense tables, bump it when their format changes outside of this module
+
+# Region 1, Gibbs free energy gamma(pi, tau) = sum n (7.1 - pi)^I (tau - 1.222)^J
+_I1 = np.array([0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 4, 4, 4, 5, 8, 8, 21, 23, 29, 30, 31, 32])
+_J1 = np.array([-2, -1, 0, 1, 2, 3, 4, 5, -9, -7, -1, 0, 1, 3, -3, 0, 1, 3, 17, -4, 0, 6, -5, -2, 10, -8, -11, -6, -29, -31, -38, -39, -40, -41])
+_N1 = np.array([
+    0.14632971213167, -0.84548187169114, -0.37563603672040e1, 0.33855169168385e1, -0.95791963387872,
+    0.15772038513228, -0.16616417199501e-1, 0.81214629983568e-3, 0.28319080123804e-3, -0.60706301565874e-3,
+    -0.18990068218419e-1, -0.32529748770505e-1, -0.21841717175414e-1, -0.52838357969930e-4, -0.47184321073267e-3,
+    -0.30001780793026e-3, 0.47661393906987e-4, -0.44141845330846e-5, -0.72694996297594e-15, -0.31679644845054e-4,
+    -0.28270797985312e-5, -0.85205128120103e-9, -0.22425281908000e-5, -0.65171222895601e-6, -0.14341729937924e-12,
+    -0.40516996860117e-6, -0.12734301741641e-8, -0.17424871230634e-9, -0.68762131295531e-18, 0.14478307828521e-19,
+    0.26335781662795e-22, -0.11947622640071e-22, 0.18228094581404e-23, -0.93537087292458e-25,
+])
+
+# Region 2, ideal-gas part gamma_0 = ln(pi) + sum n tau^J
+_J0 = np.array([0, 1, -5, -4, -3, -2, -1, 2, 3])
+_N0 = np.array([
+    -0.96927686500217e1, 0.10086655968018e2, -0.56087911283020e-2, 0.71452738081455e-1, -0.40710498223928,
+    0.14240819171444e1, -0.43839511319450e1, -0.28408632460772, 0.21268463753307e-1,
+])
+
+# Region 2, residual part gamma_r = sum n pi^I (tau - 0.5)^J
+_IR = np.array([1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4, 5, 6, 6, 6, 7, 7, 7, 8, 8, 9, 10, 10, 10, 16, 16, 18, 20, 20, 20, 21, 22, 23, 24, 24, 24])
+_JR = np.array([0, 1, 2, 3, 6, 1, 2, 4, 7, 36, 0, 1, 3, 6, 35, 1, 2, 3, 7, 3, 16, 35, 0, 11, 25, 8, 36, 13, 4, 10, 14, 29, 50, 57, 20, 35, 48, 21, 53, 39, 26, 40, 58])
+_NR = np.array([
+    -0.17731742473213e-2, -0.17834862292358e-1, -0.45996013696365e-1, -0.57581259083432e-1, -0.50325278727930e-1,
+    -0.33032641670203e-4, -0.18948987516315e-3, -0.39392777243355e-2, -0.43797295650573e-1, -0.26674547914087e-4,
+    0.20481737692309e-7, 0.43870667284435e-6, -0.32277677238570e-4, -0.15033924542148e-2, -0.40668253562649e-1,
+    -0.78847309559367e-9, 0.12790717852285e-7, 0.48225372718507e-6, 0.22922076337661e-5, -0.16714766451061e-10,
+    -0.21171472321355e-2, -0.23895741934104e2, -0.59059564324270e-17, -0.12621808899101e-5, -0.38946842435739e-1,
+    0.11256211360459e-10, -0.82311340897998e1, 0.19809712802088e-7, 0.10406965210174e-18, -0.10234747095929e-12,
+    -0.10018179379511e-8, -0.80882908646985e-10, 0.10693031879409, -0.33662250574171, 0.89185845355421e-24,
+    0.30629316876232e-12, -0.42002467698208e-5, -0.59056029685639e-25, 0.37826947613457e-5, -0.12768608934681e-14,
+    0.73087610595061e-28, 0.55414715350778e-16, -0.94369707241210e-6,
+])
+
+# Region 4, saturation line
+_N4 = np.array([
+    0.11670521452767e4, -0.72421316703206e6, -0.17073846940092e2, 0.12020824702470e5, -0.32325550322333e7,
+    0.14915108613530e2, -0.48232657361591e4, 0.40511340542057e6, -0.23855557567849, 0.65017534844798e3,
+])
+
+# Boundary between the regions 2 and 3
+_N23 = np.array([0.34805185628969e3, -0.11671859879975e1, 0.10192970039326e-2, 0.57254459862746e3, 0.13918839778870e2])
+
+
+def p_sat(T):
+    """Saturation pressure [Pa] at the temperature T [K]"""
+    n = _N4
+    theta = T + n[8] / (T - n[9])
+    A = theta ** 2 + n[0] * theta + n[1]
+    B = n[2] * theta ** 2 + n[3] * theta + n[4]
+    C = n[5] * theta ** 2 + n[6] * theta + n[7]
+    return (2 * C / (-B + np.sqrt(B ** 2 - 4 * A * C))) ** 4 * 1e6
+
+
+def T_sat(p):
+    """Saturation temperature [K] at the pressure p [Pa]"""
+    n = _N4
+    beta = (p / 1e6) ** 0.25
+    E = beta ** 2 + n[2] * beta + n[5]
+    F = n[0] * beta ** 2 + n[3] * beta + n[6]
+    G = n[1] * beta ** 2 + n[4] * beta + n[7]
+    D = 2 * G / (-F - np.sqrt(F ** 2 - 4 * E * G))
+    return (n[9] + D - np.sqrt((n[9] + D) ** 2 - 4 * (n[8] + n[9] * D))) / 2
+
+
+def p_b23(T):
+    """Pressure [Pa] of the boundary between the regions 2 and 3"""
+    n = _N23
+    return (n[0] + n[1] * T + n[2] * T ** 2) * 1e6
+
+
+def T_b23(p):
+    """Temperature [K] of the boundary between the regions 2 and 3"""
+    n = _N23
+    return n[3] + np.sqrt((p / 1e6 - n[4]) / n[2])
+
+
+P_SAT_MIN, P_SAT_MAX = float(p_sat(T_MIN)), float(p_sat(T_23)) # Range of the implemented saturation line [Pa]
+
+
+def _gibbs(N, I, J, x, y):
+    """sum n x^I y^J, with its derivatives: (g, g_x, g_y, g_yy)"""
+    g = g_x = g_y = g_yy = 0
+    for n, i, j in zip(N, I, J):
+        term = n * x ** i * y ** j
+        g = g + term
+        g_x = g_x + n * i * x ** (i - 1) * y ** j if i else g_x
+        g_y = g_y + j * term / y
+        g_yy = g_yy + j * (j - 1) * term / y ** 2
+    return g, g_x, g_y, g_yy
+
+
+def region1(p, T) -> dict:
+    """Properties of the compressed liquid, see `region2`"""
+    pi, tau = p / 16.53e6, 1386 / T
+    g, g_x, g_y, g_yy = _gibbs(_N1, _I1, _J1, 7.1 - pi, tau - 1.222)
+    g_pi = -g_x # d/dpi of (7.1 - pi)^I
+    return _properties(p, T, pi, tau, g, g_pi, g_y, g_yy)
+
+
+def region2(p, T) -> dict:
+    """
+    Properties of the superheated vapor: p, T, v, u, h, s, and c_p [J/kgK] to solve
+    the backward equations. Not checked against the range of the region
+    """
+    pi, tau = p / 1e6, 540 / T
+    g0, _, g0_y, g0_yy = _gibbs(_N0, np.zeros_like(_J0), _J0, 1, tau)
+    gr, gr_x, gr_y, gr_yy = _gibbs(_NR, _IR, _JR, pi, tau - 0.5)
+    return _properties(p, T, pi, tau, np.log(pi) + g0 + gr, 1 / pi + gr_x, g0_y + gr_y, g0_yy + gr_yy)
+
+
+def _properties(p, T, pi, tau, g, g_pi, g_tau, g_tautau) -> dict:
+    return {
+        "p": p + 0 * T,
+        "T": T + 0 * p,
+        "v": R * T * pi * g_pi / p,
+        "u": R * T * (tau * g_tau - pi * g_pi),
+        "h": R * T * tau * g_tau,
+        "s": R * (tau * g_tau - g),
+        "c_p": -R * tau ** 2 * g_tautau,
+    }
+
+
+class IF97Saturated:
+    """The saturated liquid and vapor (region 4), with the interface of TableSaturated"""
+    p_range = (P_SAT_MIN, P_SAT_MAX)
+
+    def rows(self, n: int = 64) -> RowsSaturated:
+        """n saturated states, geometrically spaced in pressure over the region"""
+        return self.get_many(p=np.geomspace(*self.p_range, n))
+
+    def get(self, **kwargs) -> RowSaturated:
+        rows = self.get_many(**kwargs)
+        assert rows.valid, "Value out of the table range"
+        return RowSaturated(*(float(getattr(rows, name)) for name in ("p", "T", "v_f", "v_g", "u_f", "u_g", "h_f", "h_g", "s_f", "s_g")))
+
+    def get_many(self, **kwargs) -> RowsSaturated:
+        """The saturated states at the given pressures (p=...) or temperatures (T=...)"""
+        assert len(kwargs) == 1, "Only one argument is allowed"
+        key, values = list(kwargs.items())[0]
+        values = np.asarray(values, dtype=np.float64)
+        match key:
+            case "p":
+                valid = (P_SAT_MIN <= values) & (values <= P_SAT_MAX)
+                p = np.where(valid, values, np.nan)
+                T = T_sat(p)
+            case "T":
+                valid = (T_MIN <= values) & (values <= T_23)
+                T = np.where(valid, values, np.nan)
+                p = p_sat(T)
+            case _:
+                raise ValueError(f"The saturation line is given by p or T, not {key}")
+
+        f, g = region1(p, T), region2(p, T)
+        return RowsSaturated(
+            p=p, T=T, v_f=f["v"], v_g=g["v"], u_f=f["u"], u_g=g["u"], h_f=f["h"], h_g=g["h"], s_f=f["s"], s_g=g["s"], valid=valid,
+        )
+
+
+class IF97Region:
+    """
+    The states of the region 1 (compressed liquid) or 2 (superheated vapor) from
+    (T, p), (p, h) or (p, s), with the interface of TableOverheated
+    """
+
+    def __init__(self, region: int):
+        assert region in (1, 2), "Only the regions 1 and 2 are implemented"
+        self.region = region
+        self._equations = region1 if region == 1 else region2
+
+    def bounds(self, p):
+        """The range of temperatures of the region at the pressure p [K], NaN if p is out of range"""
+        p = np.where((0 < p) & (p <= P_MAX), p, np.nan)
+        saturated = p <= P_SAT_MAX
+        if self.region == 1:
+            return np.where(p >= P_SAT_MIN, T_MIN, np.nan), np.where(saturated, T_sat(np.where(saturated, p, P_SAT_MIN)), T_23)
+        T_low = np.where(saturated, T_sat(np.clip(p, P_SAT_MIN, P_SAT_MAX)), T_b23(np.maximum(p, P_SAT_MAX)))
+        return np.where(p < P_SAT_MIN, T_MIN, T_low), np.where(np.isnan(p), np.nan, T_MAX)
+
+    def find(self, p: float, key: str, value: float) -> RowOverheated | None:
+        """The state at pressure p where key (T, h or s) is equal to value, None out of the region"""
+        rows = self.get_many(value, p) if key == "T" else self._solve(p, key, value)
+        return self._row(rows) if rows.valid else None
+
+    def get(self, T: float, p: float) -> RowOverheated:
+        return self._row(self.get_many(T, p))
+
+    def get_ph(self, p: float, h: float) -> RowOverheated:
+        return self._row(self.get_many_ph(p, h))
+
+    def get_ps(self, p: float, s: float) -> RowOverheated:
+        return self._row(self.get_many_ps(p, s))
+
+    def get_many(self, T: np.ndarray, p: np.ndarray) -> RowsOverheated:
+        T, p = np.broadcast_arrays(np.asarray(T, dtype=np.float64), np.asarray(p, dtype=np.float64))
+        low, high = self.bounds(p)
+        return self._rows(p, T, (low <= T) & (T <= high))
+
+    def get_many_ph(self, p: np.ndarray, h: np.ndarray) -> RowsOverheated:
+        return self._solve(p, "h", h)
+
+    def get_many_ps(self, p: np.ndarray, s: np.ndarray) -> RowsOverheated:
+        return self._solve(p, "s", s)
+
+    def _solve(self, p: np.ndarray, key: str, values: np.ndarray, iterations: int = 50) -> RowsOverheated:
+        """The temperature where the property key is equal to values, by Newton steps"""
+        p, values = np.broadcast_arrays(np.asarray(p, dtype=np.float64), np.asarray(values, dtype=np.float64))
+        low, high = self.bounds(p)
+        valid = (self._equations(p, low)[key] <= values) & (values <= self._equations(p, high)[key])
+
+        # h and s increase with T: from the saturation line, the steps never leave the region
+        T = np.where(valid, high if self.region == 1 else low, np.nan)
+        for _ in range(iterations):
+            state = self._equations(p, T)
+            slope = state["c_p"] if key == "h" else state["c_p"] / T
+            step = (state[key] - values) / slope
+            T = np.clip(T - step, low, high)
+            if not np.any(np.abs(step) > 1e-9 * T):
+                break
+        return self._rows(p, T, valid)
+
+    def _rows(self, p: np.ndarray, T: np.ndarray, valid: np.ndarray) -> RowsOverheated:
+        state = self._equations(np.where(valid, p, np.nan), np.where(valid, T, np.nan))
+        return RowsOverheated(*(np.asarray(state[name]) for name in ("p", "T", "v", "u", "h", "s")), valid=valid)
+
+    def _row(self, rows: RowsOverheated) -> RowOverheated:
+        assert rows.valid, f"State out of the IF97 region {self.region}"
+        return RowOverheated(*(float(getattr(rows, name)) for name in ("p", "T", "v", "u", "h", "s")))
+
+
+def if97_steam() -> TableSteam:
+    """Water and steam from the IF97 equations, including the compressed liquid"""
+    return TableSteam(IF97Saturated(), IF97Region(2), compressed=IF97Region(1))
+
+
+class DenseSteam:
+    """
+    Water and steam from dense tables generated from the IF97 equations, with the
+    interface of TableSteam. The superheated states closer than `margin` [K] to the
+    saturation line, and the ones out of the tables, are found with the equations
+    """
+
+    def __init__(self, tables: TableSteam, exact: TableSteam, margin: float = 5.0):
+        self.tables = tables
+        self.exact = exact
+        self.margin = margin
+        self.saturated = tables.saturated # The saturated table, as for TableSteam (e.g. for the dome)
+
+    def get(self, **kwargs) -> RowSteam:
+        """
+        Scalar version of `get_many`: the states out of the dense tables (see TableSteam.find,
+        never extrapolated) and the ones near the saturation line are found with the equations
+        """
+        row = self.tables.find(**kwargs)
+        if row is None or (row.x is None and self._near(row.p, row.T)):
+            return self.exact.get(**kwargs)
+        return row
+
+    def get_ph(self, p: float, h: float) -> RowSteam:
+        return self.get(p=p, h=h)
+
+    def get_ps(self, p: float, s: float) -> RowSteam:
+        return self.get(p=p, s=s)
+
+    def get_many(self, **kwargs) -> RowsSteam:
+        rows = self.tables.get_many(**kwargs)
+        exact = ~rows.valid | ((rows.phase == Phase.SUPERHEATED) & self._near(rows.p, rows.T))
+        if not exact.any():
+            return rows
+        if exact.ndim == 0:
+            return self.exact.get_many(**kwargs)
+
+        # Only the points near the saturation line (or out of the tables) are solved
+        values = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64) for value in kwargs.values()))
+        solved = self.exact.get_many(**{name: value[exact] for name, value in zip(kwargs, values)})
+        for field in fields(RowsSteam):
+            column = np.array(getattr(rows, field.name))
+            column[exact] = getattr(solved, field.name)
+            setattr(rows, field.name, column)
+        return rows
+
+    def classify(self, p: np.ndarray, key: str, values: np.ndarray) -> np.ndarray:
+        return self.tables.classify(p, key, values)
+
+    def saturation(self, p: float) -> RowSaturated | None:
+        return self.tables.saturation(p)
+
+    def _near(self, p, T):
+        """True for the temperatures above the saturation line (or the B23 line), by less than `margin`"""
+        below = np.clip(p, P_SAT_MIN, P_SAT_MAX)
+        T_low = np.where(p > P_SAT_MAX, T_b23(np.maximum(p, P_SAT_MAX)), T_sat(below))
+        return (T > T_low) & (T - T_low < self.margin)
+
+
+def dense_steam(pressures: int = 800, temperatures: int = 120, margin: float = 5.0) -> DenseSteam:
+    """
+    Water and steam from dense tables of the IF97 equations: `pressures` saturation
+    pressures and isobars (geometric, over the whole range), and `temperatures` points
+    per isobar, closer near the saturation line. The tables are generated on first use
+    as CSV files in the cache (see src.tables.cache), then loaded as the bundled tables
+    """
+    folder = _dense_folder(pressures, temperatures)
+    saturated_csv = os.path.join(folder, "saturated.csv")
+    overheated_csv = os.path.join(folder, "overheated.csv")
+    if not (os.path.exists(saturated_csv) and os.path.exists(overheated_csv)):
+        os.makedirs(folder, exist_ok=True)
+        _write_dense_tables(saturated_csv, overheated_csv, pressures, temperatures)
+
+    tables = TableSteam(TableSaturated(saturated_csv), TableOverheated(overheated_csv), compressed=IF97Region(1))
+    return DenseSteam(tables, if97_steam(), margin)
+
+
+def _dense_folder(pressures: int, temperatures: int) -> str:
+    """The cache folder of the dense tables, e.g. if97-v1-800x120-<hash of this module>"""
+    # The equations and the grid are in this module: any change of it is a new set of tables
+    with open(__file__, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+    return os.path.join(CACHE_DIR or tempfile.gettempdir(), f"if97-v{DENSE_VERSION}-{pressures}x{temperatures}-{digest}")
+
+
+def _write_dense_tables(saturated_csv: str, overheated_csv: str, pressures: int, temperatures: int):
+    """Write the tables in the units (and the columns) of the bundled CSV tables"""
+    def write(path: str, table: type, columns: dict[str, np.ndarray]):
+        names = [field.name for field in fields(RowSaturated if table is TableSaturated else RowOverheated)]
+        data = np.column_stack([from_si(columns[name], table.UNITS[name], QUANTITIES[name]) for name in names])
+        tmp = f"{path}.tmp-{os.getpid()}"
+        np.savetxt(tmp, data, delimiter=",", fmt="%.12g", header=",".join(names), comments="")
+        os.replace(tmp, path)
+
+    # The saturation line, p_range of the table is the one of the equations
+    rows = IF97Saturated().get_many(p=np.geomspace(P_SAT_MIN, P_SAT_MAX, pressures))
+    write(saturated_csv, TableSaturated, vars(rows))
+
+    # The isobars of the region 2, from the saturation (or B23) line, closer near it
+    p = np.geomspace(P_SAT_MIN, P_MAX, pressures)
+    low, high = IF97Region(2).bounds(p)
+    t = np.linspace(0, 1, temperatures) ** 2
+    p, T = np.repeat(p, temperatures), (low[:, None] + (high - low)[:, None] * t).ravel()
+    write(overheated_csv, TableOverheated, region2(p, T))
+
+
+if __name__ == "__main__":
+    # Verification tables of the IAPWS-IF97 release (Tables 5, 15, 35 and 36)
+    row = region1(3e6, 300.0)
+    assert round(row["v"], 11) == 0.100215168e-2 and round(row["h"] / 1e3, 6) == 0.115331273e3
+    assert round(row["u"] / 1e3, 6) == 0.112324818e3 and round(row["s"] / 1e3, 9) == 0.392294792
+    assert round(row["c_p"] / 1e3, 8) == 0.417301218e1
+    row = region1(80e6, 300.0)
+    assert round(row["v"], 12) == 0.971180894e-3 and round(row["h"] / 1e3, 6) == 0.184142828e3
+    row = region1(3e6, 500.0)
+    assert round(row["h"] / 1e3, 6) == 0.975542239e3 and round(row["s"] / 1e3, 8) == 0.258041912e1
+
+    row = region2(3.5e3, 300.0)
+    assert round(row["v"], 7) == 0.394913866e2 and round(row["h"] / 1e3, 5) == 0.254991145e4
+    assert round(row["s"] / 1e3, 8) == 0.852238967e1
+    row = region2(3.5e3, 700.0)
+    assert round(row["v"], 7) == 0.923015898e2 and round(row["h"] / 1e3, 5) == 0.333568375e4
+    row = region2(30e6, 700.0)
+    assert round(row["v"], 11) == 0.542946619e-2 and round(row["h"] / 1e3, 5) == 0.263149474e4
+    assert round(row["s"] / 1e3, 8) == 0.517540298e1 and round(row["c_p"] / 1e3, 7) == 0.103505092e2
+
+    assert np.allclose(p_sat(np.array([300.0, 500.0, 600.0])) / 1e6, [0.353658941e-2, 0.263889776e1, 0.123443146e2], rtol=1e-8, atol=0)
+    assert np.allclose(T_sat(np.array([0.1e6, 1e6, 10e6])), [0.372755919e3, 0.453035632e3, 0.584149488e3], rtol=1e-8, atol=0)
+    assert round(p_b23(623.15) / 1e6, 7) == 0.165291643e2 and round(T_b23(0.165291643e8), 5) == 623.15
+
+    # The backward equations invert the forward ones
+    superheated, liquid = IF97Region(2), IF97Region(1)
+    T = np.array([500.0, 753.15, 1000.0])
+    h = region2(1e6, T)["h"]
+    assert np.allclose(superheated.get_many_ph(1e6, h).T, T, rtol=1e-12)
+    assert np.allclose(liquid.get_many_ps(80e6, region1(80e6, T[:1])["s"]).T, T[:1], rtol=1e-12)
+    assert list(superheated.get_many(T=[400.0, 500.0], p=1e6).valid) == [False, True] # 400 K is liquid at 10 bar
+
+    # Against the tables, within their rounding and interpolation
+    from .water import TABLE_STEAM
+    steam = if97_steam()
+    for p, T in ((8e6, 753.15), (8.1e5, 713.15)):
+        assert abs(steam.get(p=p, T=T).h / TABLE_STEAM.get(p=p, T=T).h - 1) < 1e-3
+    row = steam.get(p=0.1e5, s=6658.6)
+    assert abs(row.x - TABLE_STEAM.get(p=0.1e5, s=6658.6).x) < 1e-3
+    row = steam.get(p=100e5, T=373.15) # Compressed liquid, not in the tables
+    assert row.x is None and 419e3 < row.h < 429e3
+
+    # Above the saturation line (16.53 MPa): liquid up to T_23, the region 3 is not implemented
+    row = steam.get(p=200e5, T=373.15)
+    assert row.h == region1(200e5, 373.15)["h"] and abs(steam.get_ph(p=200e5, h=row.h).T - 373.15) < 1e-6
+    rows = steam.get_many(p=200e5, T=[373.15, 640.0, 800.0])
+    assert list(rows.phase) == [Phase.COMPRESSED, Phase.SUPERHEATED, Phase.SUPERHEATED] and list(rows.valid) == [True, False, True]
+
+    # The dense tables agree with the equations, the states near the saturation line are exact
+    dense = dense_steam()
+    rng = np.random.default_rng(0)
+    p, T = rng.uniform(0.01e5, 150e5, 10_000), rng.uniform(280, 1070, 10_000)
+    exact, fast = steam.get_many(p=p, T=T), dense.get_many(p=p, T=T)
+    assert np.array_equal(exact.valid, fast.valid) and np.array_equal(exact.phase, fast.phase)
+    assert np.nanmax(np.abs(fast.h / exact.h - 1)) < 1e-4 and np.nanmax(np.abs(fast.v / exact.v - 1)) < 1e-4
+    rows = dense.get_many(p=[10e5, 10e5], T=[T_sat(10e5) + 1, 700])
+    assert rows.h[0] == region2(10e5, T_sat(10e5) + 1)["h"]
+    assert dense.get(p=10e5, T=700).h == rows.h[1]
+    assert dense.get(p=10e5, T=T_sat(10e5) + 1).h == rows.h[0] and dense.get(p=0.1e5, s=6658.6).x == dense.get_many(p=0.1e5, s=6658.6).x
+
+    # Out of the dense tables, the equations decide: never extrapolated from the tables
+    try:
+        dense.get(p=1e5, T=2000.0)
+        assert False, "State out of the IF97 range found"
+    except AssertionError as e:
+        assert "not tabulated" in str(e)
+    assert dense.get(p=100e5, T=320.0).h == dense.get_many(p=100e5, T=320.0).h
+
+    # Another grid (or version, or source) is another folder, never the stale tables
+    folder = os.path.basename(_dense_folder(800, 120))
+    assert folder.startswith(f"if97-v{DENSE_VERSION}-800x120-") and folder != os.path.basename(_dense_folder(50, 20))
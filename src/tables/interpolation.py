@@ -0,0 +1,335 @@
+import numpy as np
+
+
+def _prefixed(prefix: str, arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    return {f"{prefix}.{name}": array for name, array in arrays.items()}
+
+
+def _unprefixed(prefix: str, arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    return {name[len(prefix) + 1:]: array for name, array in arrays.items() if name.startswith(f"{prefix}.")}
+
+
+class RaggedIndex:
+    """
+    Rows grouped by one column and sorted by another inside each group.
+
+    For a steam table grouped by pressure and keyed by temperature, the groups
+    are the isobars and the keys their temperature breakpoints. The groups are
+    stored back to back, and `offsets` gives the slice of each one:
+
+        keys of values[i] = keys[offsets[i]:offsets[i + 1]]
+
+    `order` maps the sorted rows back to the rows used to build the index.
+    """
+
+    def __init__(self, groups: np.ndarray, keys: np.ndarray):
+        self.order = np.lexsort((keys, groups))
+        self.keys = np.ascontiguousarray(keys[self.order], dtype=np.float64)
+
+        # Unique group values and the offsets of each group
+        self.values, starts = np.unique(groups[self.order], return_index=True)
+        self.offsets = np.append(starts, len(self.order))
+
+        # Composite (group, key) keys, sorted, to search all the groups at once
+        ids = np.repeat(np.arange(len(self.values)), np.diff(self.offsets))
+        self._low = self.keys.min()
+        self._span = self.keys.max() - self._low + 1
+        self._composite = ids * self._span + (self.keys - self._low)
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Arrays defining the index, see `from_arrays`"""
+        return {
+            "order": self.order,
+            "keys": self.keys,
+            "values": self.values,
+            "offsets": self.offsets,
+            "composite": self._composite,
+            "bounds": np.array([self._low, self._span]),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> "RaggedIndex":
+        """Rebuild the index from `to_arrays`, without copying the arrays (they can be memory-mapped)"""
+        index = cls.__new__(cls)
+        index.order = arrays["order"]
+        index.keys = arrays["keys"]
+        index.values = arrays["values"]
+        index.offsets = arrays["offsets"]
+        index._composite = arrays["composite"]
+        index._low, index._span = (float(bound) for bound in arrays["bounds"])
+        return index
+
+    def sizes(self) -> np.ndarray:
+        """Number of rows of each group"""
+        return np.diff(self.offsets)
+
+    def bracket(self, values: np.ndarray) -> np.ndarray:
+        """Return the index of the last group at or below each value, -1 below the first one"""
+        return np.searchsorted(self.values, values, side="right") - 1
+
+    def locate(self, i: int, key: float) -> int:
+        """Return the row j such that key lies between the rows j and j + 1 of the i-th group"""
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        keys = self.keys[start:stop]
+        j = np.searchsorted(keys, key, side="right") - 1
+
+        # The last breakpoint of a group is inside the group
+        if j == len(keys) - 1 and keys[j] == key:
+            j -= 1
+
+        assert 0 <= j < len(keys) - 1, "Value out of the table range"
+        return int(start + j)
+
+    def locate_many(self, i: np.ndarray, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized version of `locate`, for any number of groups at once.
+        Return the rows, and a mask of the queries inside their group (i = -1 is never valid)
+        """
+        valid = (0 <= i) & (i < len(self.values))
+        i = np.where(valid, i, 0)
+        query = i * self._span + (keys - self._low)
+        j = np.searchsorted(self._composite, query, side="right") - 1
+
+        # The last breakpoint of a group is inside the group
+        last = j == self.offsets[i + 1] - 1
+        j = np.where(last & (self._composite[j] == query), j - 1, j)
+
+        valid &= (self.offsets[i] <= j) & (j < self.offsets[i + 1] - 1)
+        return np.where(valid, j, 0), valid
+
+
+def interpolate(data: np.ndarray, keys: np.ndarray, j: int, key: float) -> np.ndarray:
+    """Linear interpolation of all the columns between the rows j and j + 1"""
+    below, above = data[j], data[j + 1]
+    return below + (key - keys[j]) / (keys[j + 1] - keys[j]) * (above - below)
+
+
+def interpolate_many(data: np.ndarray, keys: np.ndarray, j: np.ndarray, key: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Vectorized version of `interpolate`, the invalid queries are set to NaN"""
+    below, above = data[j], data[j + 1]
+    w = (key - keys[j]) / (keys[j + 1] - keys[j])
+    rows = below + w[:, None] * (above - below)
+    rows[~valid] = np.nan
+    return rows
+
+
+def monotone_spline(x: np.ndarray, y: np.ndarray, x_new: np.ndarray) -> np.ndarray:
+    """
+    Monotone cubic (Fritsch-Carlson) interpolation of the columns of y, at x_new.
+
+    The slopes at the rows are the weighted harmonic means of the slopes of the
+    segments around them, 0 at a local extremum: the curve never overshoots the
+    data, e.g. the saturation lines stay monotone near the critical point.
+    x is strictly increasing, the queries out of [x[0], x[-1]] are extrapolated
+    """
+    x, y, x_new = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64), np.asarray(x_new, dtype=np.float64)
+    h = np.diff(x)[:, None]
+    delta = np.diff(y, axis=0) / h
+
+    # Slopes at the interior rows, 0 where the data turns
+    w1, w2 = 2 * h[1:] + h[:-1], h[1:] + 2 * h[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        interior = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+    interior = np.where(delta[:-1] * delta[1:] > 0, interior, 0.0)
+
+    # At the ends, the three-point slope, kept of the sign of the first segment and at most 3 times its slope
+    def end(h0, h1, d0, d1):
+        m = ((2 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+        m = np.where(np.sign(m) != np.sign(d0), 0.0, m)
+        return np.where((np.sign(d0) != np.sign(d1)) & (np.abs(m) > 3 * np.abs(d0)), 3 * d0, m)
+
+    if len(x) > 2:
+        slopes = np.vstack((end(h[0], h[1], delta[0], delta[1]), interior, end(h[-1], h[-2], delta[-1], delta[-2])))
+    else:
+        slopes = np.vstack((delta, delta))
+
+    # Cubic Hermite basis on the segment of each query
+    j = np.clip(np.searchsorted(x, x_new, side="right") - 1, 0, len(x) - 2)
+    step = h[j, 0][:, None]
+    t = ((x_new - x[j]) / h[j, 0])[:, None]
+    h00, h10, h01, h11 = 2 * t**3 - 3 * t**2 + 1, t**3 - 2 * t**2 + t, -2 * t**3 + 3 * t**2, t**3 - t**2
+    return h00 * y[j] + h10 * step * slopes[j] + h01 * y[j + 1] + h11 * step * slopes[j + 1]
+
+
+class SortedGrid:
+    """
+    Precompiled interpolation engine for tables that can be searched by any column.
+
+    The rows are sorted once by each column, so a lookup is a binary search on
+    the sorted keys followed by a single linear interpolation of all the columns.
+    """
+
+    def __init__(self, columns: list[str], data: np.ndarray):
+        self.columns = list(columns)
+        self.data = np.ascontiguousarray(data, dtype=np.float64)
+
+        # Rows and keys sorted by each column
+        self._sorted: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for i, column in enumerate(self.columns):
+            order = np.argsort(self.data[:, i], kind="stable")
+            self._sorted[column] = (self.data[order], self.data[order, i])
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Arrays defining the grid, see `from_arrays`"""
+        arrays = {"data": self.data}
+        for column, (data, keys) in self._sorted.items():
+            arrays.update({f"{column}.data": data, f"{column}.keys": keys})
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, columns: list[str], arrays: dict[str, np.ndarray]) -> "SortedGrid":
+        """Rebuild the grid from `to_arrays`, without copying the arrays (they can be memory-mapped)"""
+        grid = cls.__new__(cls)
+        grid.columns = list(columns)
+        grid.data = arrays["data"]
+        grid._sorted = {column: (arrays[f"{column}.data"], arrays[f"{column}.keys"]) for column in grid.columns}
+        return grid
+
+    def get(self, key: str, value: float) -> np.ndarray:
+        data, keys = self._sorted[key]
+
+        # Find the two rows surrounding the target value
+        j = np.searchsorted(keys, value, side="right") - 1
+
+        # The last breakpoint is inside the table
+        if j == len(keys) - 1 and keys[j] == value:
+            j -= 1
+
+        assert 0 <= j < len(keys) - 1, "Value out of the table range"
+        return interpolate(data, keys, j, value)
+
+    def get_many(self, key: str, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized version of `get`, return the rows and a mask of the valid queries"""
+        data, keys = self._sorted[key]
+        j = np.searchsorted(keys, values, side="right") - 1
+
+        # The last breakpoint is inside the table
+        j = np.where((j == len(keys) - 1) & (keys[-1] == values), j - 1, j)
+        valid = (0 <= j) & (j < len(keys) - 1)
+        j = np.where(valid, j, 0)
+        return interpolate_many(data, keys, j, values, valid), valid
+
+
+class IsobarGrid:
+    """
+    Precompiled interpolation engine for tables sampled along isobars.
+
+    The rows are stored once in a contiguous (n_rows, n_columns) array sorted by
+    pressure and then by temperature, indexed by isobar: the sorted unique
+    pressures, and the temperature breakpoints of each isobar in ragged arrays.
+
+    Any (p, T) inside the table envelope is resolved by a bilinear interpolation:
+    along the temperature on the two isobars surrounding p, then linearly in p.
+    Each step is a binary search followed by a single interpolation of all the
+    columns at once.
+
+    The other columns (v, u, h, s) increase with T along an isobar, so each of
+    them gets the same index keyed by its own values. This gives the inverse
+    lookups, e.g. (p, h) -> T, with the same binary search.
+    """
+
+    def __init__(self, columns: list[str], data: np.ndarray):
+        self.columns = list(columns)
+        i_p, i_T = self.columns.index("p"), self.columns.index("T")
+
+        # Rows sorted by pressure, then by temperature
+        self.isobars = RaggedIndex(data[:, i_p], data[:, i_T])
+        self.data = np.ascontiguousarray(data[self.isobars.order], dtype=np.float64)
+        self.pressures = self.isobars.values
+        self._dp = np.append(np.diff(self.pressures), np.inf)
+
+        # Index of the isobars keyed by each column
+        self._indexes = {"T": (self.isobars, self.data)}
+        for column in self.columns:
+            if column not in ("p", "T"):
+                self._indexes[column] = self._monotone_index(self.columns.index(column))
+
+    def _monotone_index(self, c: int) -> tuple[RaggedIndex, np.ndarray]:
+        """Index of the isobars keyed by the column c, keeping the rows where it increases with T"""
+        keep = np.ones(len(self.data), dtype=bool)
+        for start, stop in zip(self.isobars.offsets[:-1], self.isobars.offsets[1:]):
+            values = self.data[start:stop, c]
+            keep[start + 1:stop] = values[1:] > np.maximum.accumulate(values)[:-1]
+
+        data = self.data[keep]
+        index = RaggedIndex(data[:, self.columns.index("p")], data[:, c])
+        return index, np.ascontiguousarray(data[index.order])
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Arrays defining the grid, see `from_arrays`"""
+        arrays = {}
+        for column, (index, data) in self._indexes.items():
+            arrays.update(_prefixed(column, index.to_arrays()))
+            arrays[f"{column}.data"] = data
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, columns: list[str], arrays: dict[str, np.ndarray]) -> "IsobarGrid":
+        """Rebuild the grid from `to_arrays`, without copying the arrays (they can be memory-mapped)"""
+        grid = cls.__new__(cls)
+        grid.columns = list(columns)
+        grid._indexes = {}
+        for column in grid.columns:
+            if column != "p":
+                index = RaggedIndex.from_arrays(_unprefixed(column, arrays))
+                grid._indexes[column] = (index, arrays[f"{column}.data"])
+
+        grid.isobars, grid.data = grid._indexes["T"]
+        grid.pressures = grid.isobars.values
+        grid._dp = np.append(np.diff(grid.pressures), np.inf)
+        return grid
+
+    def get(self, T: float, p: float) -> np.ndarray:
+        return self.get_by(p, "T", T)
+
+    def get_many(self, T: np.ndarray, p: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized version of `get`, return the rows and a mask of the valid queries"""
+        return self.get_many_by(p, "T", T)
+
+    def get_by(self, p: float, key: str, value: float) -> np.ndarray:
+        """Interpolate all the columns at pressure p, where the column key is equal to value"""
+        index, data = self._indexes[key]
+
+        # Find the isobars surrounding the target pressure
+        i = int(index.bracket(p))
+        assert 0 <= i < len(self.pressures), "Pressure out of the table range"
+
+        below = interpolate(data, index.keys, index.locate(i, value), value)
+        if self.pressures[i] == p:
+            return below
+
+        assert i + 1 < len(self.pressures), "Pressure out of the table range"
+        above = interpolate(data, index.keys, index.locate(i + 1, value), value)
+        return below + (p - self.pressures[i]) / self._dp[i] * (above - below)
+
+    def contains(self, p: float, key: str, value: float) -> bool:
+        """Scalar version of the mask of `get_many_by`: True if get_by(p, key, value) is inside the table"""
+        index, _ = self._indexes[key]
+        i = int(index.bracket(p))
+        if not 0 <= i < len(self.pressures) or (self.pressures[i] != p and i + 1 == len(self.pressures)):
+            return False
+
+        # Within the keys of the isobar below, and of the one above unless p is on a tabulated isobar
+        for k in (i,) if self.pressures[i] == p else (i, i + 1):
+            start, stop = index.offsets[k], index.offsets[k + 1]
+            if not index.keys[start] <= value <= index.keys[stop - 1]:
+                return False
+        return True
+
+    def get_many_by(self, p: np.ndarray, key: str, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized version of `get_by`, return the rows and a mask of the valid queries"""
+        index, data = self._indexes[key]
+
+        # Interpolate along the isobars surrounding each pressure
+        i = index.bracket(p)
+        j, valid_below = index.locate_many(i, values)
+        below = interpolate_many(data, index.keys, j, values, valid_below)
+        j, valid_above = index.locate_many(i + 1, values)
+        above = interpolate_many(data, index.keys, j, values, valid_above)
+
+        # Then linearly in p, the queries on a tabulated isobar only need the one below
+        i = np.clip(i, 0, len(self.pressures) - 1)
+        on_isobar = self.pressures[i] == p
+        w = (p - self.pressures[i]) / self._dp[i]
+        rows = np.where(on_isobar[:, None], below, below + w[:, None] * (above - below))
+        return rows, valid_below & (on_isobar | valid_above)
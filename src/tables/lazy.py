@@ -0,0 +1,35 @@
+from typing import Any, Callable
+
+
+class LazyTable:
+    """
+    Proxy of a property table, built on first use.
+
+    Parsing a table (and importing pandas to do it) is only paid by the runs that
+    actually look something up. Attribute access is forwarded to the table, so
+    `TABLE.get(...)` works as on the table itself; `load()` returns the table.
+    """
+
+    def __init__(self, load: Callable[[], Any]):
+        self._load = load
+        self._table = None
+
+    def load(self) -> Any:
+        """Build the table if needed, and return it"""
+        if self._table is None:
+            self._table = self._load()
+        return self._table
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.load()[key]
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+    def __repr__(self):
+        if self._table is None:
+            return "LazyTable(<not loaded>)"
+        return repr(self._table)
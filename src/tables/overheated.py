@@ -1,40 +1,84 @@
 import os
+import numpy as np
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from .interpolation import IsobarGrid
+from .cache import compile_table
 
 
 @dataclass
 class RowOverheated:
-    p: float # Pressure [bar]
-    T: float # Temperature [°C]
+    p: float # Pressure [Pa]
+    T: float # Temperature [K]
     v: float # Specific volume [m^3/kg]
-    u: float # Specific internal energy [kJ/kg]
-    h: float # Specific enthalpy [kJ/kg]
-    s: float # Specific entropy [kJ/kgK]
+    u: float # Specific internal energy [J/kg]
+    h: float # Specific enthalpy [J/kg]
+    s: float # Specific entropy [J/kgK]
+
+
+@dataclass
+class RowsOverheated:
+    """Struct-of-arrays version of RowOverheated, returned by batch lookups"""
+    p: np.ndarray # Pressure [Pa]
+    T: np.ndarray # Temperature [K]
+    v: np.ndarray # Specific volume [m^3/kg]
+    u: np.ndarray # Specific internal energy [J/kg]
+    h: np.ndarray # Specific enthalpy [J/kg]
+    s: np.ndarray # Specific entropy [J/kgK]
+    valid: np.ndarray # False where the query is out of the table (the row is NaN)
 
 
 class TableOverheated(pd.DataFrame):
-    """"""
+    """
+    Superheated steam table, sampled along isobars.
+
+    The rows are compiled once (and cached on disk) into an IsobarGrid, so that a
+    lookup never touches the DataFrame. The columns are converted to SI when the
+    table is loaded, so the lookups take and return SI values.
+    """
+    _metadata = ["_grid"]
+
+    # Units of the columns of the CSV
+    UNITS = {"p": "bar", "T": "C", "v": "m^3/kg", "u": "kJ/kg", "h": "kJ/kg", "s": "kJ/kgK"}
+
     def __init__(self, csv: str):
-        df = pd.read_csv(os.path.join(os.path.dirname(__file__), csv))
+        columns = [field.name for field in fields(RowOverheated)]
+        df, grid = compile_table(os.path.join(os.path.dirname(__file__), csv), columns, IsobarGrid, self.UNITS)
         super().__init__(df)
+        self._grid = grid
 
     def get(self, T: float, p: float) -> RowOverheated:
-        # We can either interpolate using p or T
-        df = pd.DataFrame()
-        if len(df := self[self["p"] == p]) > 1:
-            key, value = "T", T
-        elif len(df := self[self["T"] == T]) > 1:
-            key, value = "p", p
+        return RowOverheated(*self._grid.get(T, p))
+
+    def get_ph(self, p: float, h: float) -> RowOverheated:
+        """Inverse lookup, the state at pressure p with enthalpy h"""
+        return RowOverheated(*self._grid.get_by(p, "h", h))
+
+    def get_ps(self, p: float, s: float) -> RowOverheated:
+        """Inverse lookup, the state at pressure p with entropy s"""
+        return RowOverheated(*self._grid.get_by(p, "s", s))
+
+    def find(self, p: float, key: str, value: float) -> RowOverheated | None:
+        """The state at pressure p where the column key (T, h or s) is equal to value, None out of the table"""
+        return RowOverheated(*self._grid.get_by(p, key, value)) if self._grid.contains(p, key, value) else None
 
-        assert not df.empty, "No data found"
+    def get_many(self, T: np.ndarray, p: np.ndarray) -> RowsOverheated:
+        """
+        Vectorized version of `get`, T and p are broadcast against each other.
+        The points out of the table are flagged in `valid` instead of raising.
+        """
+        return self._get_many(p, "T", T)
 
-        df = df.sort_values(by=key)
+    def get_many_ph(self, p: np.ndarray, h: np.ndarray) -> RowsOverheated:
+        """Vectorized version of `get_ph`, see `get_many`"""
+        return self._get_many(p, "h", h)
 
-        # Find the two rows surrounding the target value
-        below = df[df[key] <= value].iloc[-1]
-        above = df[df[key] > value].iloc[0]
+    def get_many_ps(self, p: np.ndarray, s: np.ndarray) -> RowsOverheated:
+        """Vectorized version of `get_ps`, see `get_many`"""
+        return self._get_many(p, "s", s)
 
-        # Perform linear interpolation for all columns
-        interpolated_row = below + (value - below[key]) / (above[key] - below[key]) * (above - below)
-        return RowOverheated(**interpolated_row)
+    def _get_many(self, p: np.ndarray, key: str, values: np.ndarray) -> RowsOverheated:
+        p, values = np.broadcast_arrays(np.asarray(p, dtype=np.float64), np.asarray(values, dtype=np.float64))
+        rows, valid = self._grid.get_many_by(p.ravel(), key, values.ravel())
+        columns = [column.reshape(p.shape) for column in rows.T]
+        return RowsOverheated(*columns, valid=valid.reshape(p.shape))
@@ -1,40 +1,86 @@
 import os
+import numpy as np
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from .interpolation import SortedGrid
+from .cache import compile_table
 
 
 @dataclass
 class RowSaturated:
-    p: float # Pressure [bar]
-    T: float # Temperature [°C]
-    v_f: float # Specific volume - saturated liquid [m^3/kg] 
+    p: float # Pressure [Pa]
+    T: float # Temperature [K]
+    v_f: float # Specific volume - saturated liquid [m^3/kg]
     v_g : float # Specific volume - saturated vapor [m^3/kg]
-    u_f: float # Specific internal energy - saturated liquid [kJ/kg]
-    u_g: float # Specific internal energy - saturated vapor [kJ/kg]
-    h_f: float # Specific enthalpy - saturated liquid [kJ/kg]
-    h_g: float # Specific enthalpy - saturated vapor [kJ/kg]
-    s_f: float # Specific entropy - saturated liquid [kJ/kgK]
-    s_g: float # Specific entropy - saturated vapor [kJ/kgK]
+    u_f: float # Specific internal energy - saturated liquid [J/kg]
+    u_g: float # Specific internal energy - saturated vapor [J/kg]
+    h_f: float # Specific enthalpy - saturated liquid [J/kg]
+    h_g: float # Specific enthalpy - saturated vapor [J/kg]
+    s_f: float # Specific entropy - saturated liquid [J/kgK]
+    s_g: float # Specific entropy - saturated vapor [J/kgK]
+
+
+@dataclass
+class RowsSaturated:
+    """Struct-of-arrays version of RowSaturated, returned by batch lookups"""
+    p: np.ndarray # Pressure [Pa]
+    T: np.ndarray # Temperature [K]
+    v_f: np.ndarray # Specific volume - saturated liquid [m^3/kg]
+    v_g: np.ndarray # Specific volume - saturated vapor [m^3/kg]
+    u_f: np.ndarray # Specific internal energy - saturated liquid [J/kg]
+    u_g: np.ndarray # Specific internal energy - saturated vapor [J/kg]
+    h_f: np.ndarray # Specific enthalpy - saturated liquid [J/kg]
+    h_g: np.ndarray # Specific enthalpy - saturated vapor [J/kg]
+    s_f: np.ndarray # Specific entropy - saturated liquid [J/kgK]
+    s_g: np.ndarray # Specific entropy - saturated vapor [J/kgK]
+    valid: np.ndarray # False where the query is out of the table (the row is NaN)
 
 
 class TableSaturated(pd.DataFrame):
+    """
+    Saturated water table, searchable by any of its columns.
+
+    The rows are compiled once (and cached on disk) into a SortedGrid, so that a
+    lookup never touches the DataFrame. The columns are converted to SI when the
+    table is loaded, so the lookups take and return SI values.
+    """
+    _metadata = ["_grid"]
+
+    # Units of the columns of the CSV
+    UNITS = {
+        "p": "bar", "T": "C", "v_f": "L/kg", "v_g": "m^3/kg",
+        "u_f": "kJ/kg", "u_g": "kJ/kg", "h_f": "kJ/kg", "h_g": "kJ/kg", "s_f": "kJ/kgK", "s_g": "kJ/kgK",
+    }
+
     def __init__(self, csv: str):
-        df = pd.read_csv(os.path.join(os.path.dirname(__file__), csv))
+        columns = [field.name for field in fields(RowSaturated)]
+        df, grid = compile_table(os.path.join(os.path.dirname(__file__), csv), columns, SortedGrid, self.UNITS)
         super().__init__(df)
+        self._grid = grid
+
+    @property
+    def p_range(self) -> tuple[float, float]:
+        """The range of the saturation pressures of the table [Pa]"""
+        return float(self["p"].min()), float(self["p"].max())
+
+    def rows(self) -> RowsSaturated:
+        """All the rows of the table, by increasing pressure"""
+        columns = [np.asarray(self[field.name], dtype=np.float64) for field in fields(RowSaturated)]
+        return RowsSaturated(*columns, valid=np.ones(len(self), dtype=bool))
 
     def get(self, **kwargs) -> RowSaturated:
         assert len(kwargs) == 1, "Only one argument is allowed"
         key, value = list(kwargs.items())[0]
-        df = self.sort_values(by=key)
-
-        # TODO: Check that the value is within the table
-
-        # Find the two rows surrounding the target value
-        below = df[df[key] <= value].iloc[-1]
-        above = df[df[key] > value].iloc[0]
-
-        # Perform linear interpolation for all columns
-        interpolated_row = below + (value - below[key]) / (above[key] - below[key]) * (above - below)
-        return RowSaturated(**interpolated_row)
-
+        return RowSaturated(*self._grid.get(key, value))
 
+    def get_many(self, **kwargs) -> RowsSaturated:
+        """
+        Vectorized version of `get`, for an array of values of a single key.
+        The points out of the table are flagged in `valid` instead of raising.
+        """
+        assert len(kwargs) == 1, "Only one argument is allowed"
+        key, values = list(kwargs.items())[0]
+        values = np.asarray(values, dtype=np.float64)
+        rows, valid = self._grid.get_many(key, values.ravel())
+        columns = [column.reshape(values.shape) for column in rows.T]
+        return RowsSaturated(*columns, valid=valid.reshape(values.shape))
@@ -0,0 +1,277 @@
+import numpy as np
+from dataclasses import dataclass
+from enum import IntEnum
+from .saturated import TableSaturated, RowSaturated, RowsSaturated
+from .overheated import TableOverheated
+
+
+@dataclass
+class RowSteam:
+    p: float # Pressure [Pa]
+    T: float # Temperature [K]
+    v: float # Specific volume [m^3/kg]
+    u: float # Specific internal energy [J/kg]
+    h: float # Specific enthalpy [J/kg]
+    s: float # Specific entropy [J/kgK]
+    x: float | None # Quality [0-1], None out of the two-phase region
+    u_f: float | None = None # Specific internal energy of saturated liquid [J/kg], None out of the saturated table
+    u_g: float | None = None # Specific internal energy of saturated vapor [J/kg]
+    h_f: float | None = None # Specific enthalpy of saturated liquid [J/kg]
+    h_g: float | None = None # Specific enthalpy of saturated vapor [J/kg]
+    s_f: float | None = None # Specific entropy of saturated liquid [J/kgK]
+    s_g: float | None = None # Specific entropy of saturated vapor [J/kgK]
+
+
+class Phase(IntEnum):
+    """Phase of water, classified against the saturation line"""
+    UNKNOWN = -1 # Out of the tables
+    COMPRESSED = 0 # Compressed (subcooled) liquid
+    WET = 1 # Saturated mixture of liquid and vapor
+    SUPERHEATED = 2 # Superheated vapor
+
+
+@dataclass
+class RowsSteam:
+    """
+    Struct-of-arrays version of RowSteam, returned by batch lookups, with the
+    properties of the saturated liquid and vapor at the same pressure (as in State)
+    """
+    p: np.ndarray # Pressure [Pa]
+    T: np.ndarray # Temperature [K]
+    v: np.ndarray # Specific volume [m^3/kg]
+    u: np.ndarray # Specific internal energy [J/kg]
+    h: np.ndarray # Specific enthalpy [J/kg]
+    s: np.ndarray # Specific entropy [J/kgK]
+    x: np.ndarray # Quality [0-1], NaN out of the two-phase region
+    u_f: np.ndarray # Specific internal energy of saturated liquid [J/kg], NaN out of the saturated table
+    u_g: np.ndarray # Specific internal energy of saturated vapor [J/kg]
+    h_f: np.ndarray # Specific enthalpy of saturated liquid [J/kg]
+    h_g: np.ndarray # Specific enthalpy of saturated vapor [J/kg]
+    s_f: np.ndarray # Specific entropy of saturated liquid [J/kgK]
+    s_g: np.ndarray # Specific entropy of saturated vapor [J/kgK]
+    phase: np.ndarray # Phase of the state, see Phase (also where it is not tabulated)
+    valid: np.ndarray # False where the state is not tabulated (the row is NaN)
+
+
+class TableSteam:
+    """
+    Water and steam, combining the saturated and the superheated tables.
+
+    A state given by the pressure and one of h or s is first compared with the
+    saturation line at p:
+    - between the saturated liquid and vapor, it is a wet mixture with quality x
+    - above the saturated vapor, it is found in the superheated table
+    - below the saturated liquid, it is a compressed liquid, found in the compressed
+      table if any (the IF97 region 1, see src.tables.if97, or the saturated liquid at
+      the same temperature, see src.tables.compressed), else not tabulated
+    Above the saturated table, the states up to the top of the compressed table (its
+    `bounds`) are compressed liquid, the others superheated vapor.
+
+    The tables only need the lookups of TableSaturated and TableOverheated, so the
+    same logic serves the CSV tables and the IF97 equations.
+    """
+
+    def __init__(self, saturated: TableSaturated, overheated: TableOverheated, compressed: TableOverheated | None = None):
+        self.saturated = saturated
+        self.overheated = overheated
+        self.compressed = compressed
+        self._p_min, self._p_max = saturated.p_range
+        self._T_min, self._T_max = (saturated.get(p=p).T for p in saturated.p_range)
+
+    def get(self, **kwargs) -> RowSteam:
+        """
+        Scalar version of `get_many`, e.g. get(p=..., T=...), with the saturated liquid
+        and vapor at the same pressure, as the batch lookups. Raise an AssertionError
+        if the state is not tabulated (e.g. a temperature on the saturation line, without the quality)
+        """
+        row = self.find(**kwargs)
+        if row is None:
+            # Raised explicitly, as the asserts of the tables, so that python -O never returns None
+            raise AssertionError(f"State {kwargs} not tabulated")
+        return row
+
+    def find(self, **kwargs) -> RowSteam | None:
+        """
+        Scalar version of `get_many` as `get`, but None where the state is not tabulated
+        (flagged in `valid`): the ranges are tested explicitly, nothing is extrapolated
+        """
+        assert len(kwargs) == 2, "A state is defined by two properties"
+        match sorted(kwargs):
+            case ["T", "p"] | ["h", "p"] | ["p", "s"]:
+                key = next(name for name in kwargs if name != "p")
+                return self._find(kwargs["p"], key, kwargs[key])
+            case ["p", "x"]:
+                sat = self.saturation(kwargs["p"])
+                return self._wet(kwargs["p"], sat, kwargs["x"]) if sat is not None and 0 <= kwargs["x"] <= 1 else None
+            case ["T", "x"]:
+                if not (self._T_min <= kwargs["T"] <= self._T_max and 0 <= kwargs["x"] <= 1):
+                    return None
+                sat = self.saturated.get(T=kwargs["T"])
+                return self._wet(sat.p, sat, kwargs["x"])
+        raise ValueError(f"Invalid pair {tuple(kwargs)}, expected (p, T), (p, h), (p, s), (p, x) or (T, x)")
+
+    def saturation(self, p: float) -> RowSaturated | None:
+        """The saturated liquid and vapor at pressure p, None out of the saturated table"""
+        return self.saturated.get(p=p) if self._p_min <= p <= self._p_max else None
+
+    def get_ph(self, p: float, h: float) -> RowSteam:
+        """Return the state at pressure p with enthalpy h (throttling, heat exchangers)"""
+        return self.get(p=p, h=h)
+
+    def get_ps(self, p: float, s: float) -> RowSteam:
+        """Return the state at pressure p with entropy s (isentropic expansion and compression)"""
+        return self.get(p=p, s=s)
+
+    def _find(self, p: float, key: str, value: float) -> RowSteam | None:
+        """The state at pressure p where the property key (T, h or s) is equal to value, None if not tabulated"""
+        sat = self.saturation(p)
+        table = self.overheated
+        if sat is None and self._liquid(np.asarray(p, dtype=np.float64), key, np.asarray(value, dtype=np.float64)):
+            table = self.compressed
+        elif sat is not None:
+            f, g = (sat.T, sat.T) if key == "T" else (getattr(sat, f"{key}_f"), getattr(sat, f"{key}_g"))
+            if value < f:
+                table = self.compressed
+            elif value <= g:
+                # A temperature on the saturation line does not give the quality
+                return None if key == "T" else self._wet(p, sat, (value - f) / (g - f))
+
+        row = table.find(p, key, value) if table is not None else None
+        if row is None:
+            return None
+        if sat is None:
+            return RowSteam(row.p, row.T, row.v, row.u, row.h, row.s, None)
+        return RowSteam(row.p, row.T, row.v, row.u, row.h, row.s, None, sat.u_f, sat.u_g, sat.h_f, sat.h_g, sat.s_f, sat.s_g)
+
+    def _wet(self, p: float, sat: RowSaturated, x: float) -> RowSteam:
+        """Wet mixture, the properties are weighted by the quality"""
+        assert 0 <= x <= 1, "The quality must be between 0 and 1"
+        return RowSteam(
+            p=p,
+            T=sat.T,
+            v=sat.v_f + x * (sat.v_g - sat.v_f),
+            u=sat.u_f + x * (sat.u_g - sat.u_f),
+            h=sat.h_f + x * (sat.h_g - sat.h_f),
+            s=sat.s_f + x * (sat.s_g - sat.s_f),
+            x=x,
+            u_f=sat.u_f,
+            u_g=sat.u_g,
+            h_f=sat.h_f,
+            h_g=sat.h_g,
+            s_f=sat.s_f,
+            s_g=sat.s_g,
+        )
+
+    def get_many(self, **kwargs) -> RowsSteam:
+        """
+        Vectorized lookup of the states given by a pair of properties, e.g.
+        get_many(p=..., h=...), one of (p, T), (p, h), (p, s), (p, x) or (T, x).
+
+        Each point is classified against the saturation line (see `classify`), from a
+        single lookup of the saturated table at its pressure: the wet states are
+        weighted by their quality, the superheated ones are found in the superheated
+        table, the compressed liquid in the compressed table if any. The values are broadcast
+        against each other, the points that are not tabulated are flagged in `valid`
+        """
+        assert len(kwargs) == 2, "A state is defined by two properties"
+        match sorted(kwargs):
+            case ["T", "p"] | ["h", "p"] | ["p", "s"]:
+                key = next(name for name in kwargs if name != "p")
+                return self._get_many(kwargs["p"], key, kwargs[key])
+            case ["p", "x"]:
+                return self.get_many_px(kwargs["p"], kwargs["x"])
+            case ["T", "x"]:
+                T, x = np.broadcast_arrays(np.asarray(kwargs["T"], dtype=np.float64), np.asarray(kwargs["x"], dtype=np.float64))
+                sat = self.saturated.get_many(T=T)
+                return self._mixture(sat.p, sat, x, sat.valid & (0 <= x) & (x <= 1))
+        raise ValueError(f"Invalid pair {tuple(kwargs)}, expected (p, T), (p, h), (p, s), (p, x) or (T, x)")
+
+    def get_many_ph(self, p: np.ndarray, h: np.ndarray) -> RowsSteam:
+        """Vectorized version of `get_ph`, see `get_many`"""
+        return self._get_many(p, "h", h)
+
+    def get_many_ps(self, p: np.ndarray, s: np.ndarray) -> RowsSteam:
+        """Vectorized version of `get_ps`, see `get_many`"""
+        return self._get_many(p, "s", s)
+
+    def get_many_px(self, p: np.ndarray, x: np.ndarray) -> RowsSteam:
+        """The wet states at pressure p with quality x, e.g. x = 0 for the saturated liquid"""
+        p, x = np.broadcast_arrays(np.asarray(p, dtype=np.float64), np.asarray(x, dtype=np.float64))
+        sat = self.saturated.get_many(p=p)
+        return self._mixture(p, sat, x, sat.valid & (0 <= x) & (x <= 1))
+
+    def classify(self, p: np.ndarray, key: str, values: np.ndarray) -> np.ndarray:
+        """
+        The phase (see Phase) of the states at pressure p with the given values of
+        T, h or s, e.g. classify(p, "s", s) for the end states of an isentropic expansion.
+        Above the saturated table, the states are compressed liquid up to the top of the
+        compressed table, superheated above
+        """
+        p, values = np.broadcast_arrays(np.asarray(p, dtype=np.float64), np.asarray(values, dtype=np.float64))
+        return self._classify(p, self.saturated.get_many(p=p), key, values)
+
+    def _classify(self, p: np.ndarray, sat: RowsSaturated, key: str, values: np.ndarray) -> np.ndarray:
+        f, g = (sat.T, sat.T) if key == "T" else (getattr(sat, f"{key}_f"), getattr(sat, f"{key}_g"))
+        phase = np.where(p > self._p_max, Phase.SUPERHEATED, Phase.UNKNOWN).astype(np.int8)
+        phase[self._liquid(p, key, values)] = Phase.COMPRESSED
+        phase[sat.valid & (values < f)] = Phase.COMPRESSED
+        phase[sat.valid & (f <= values) & (values <= g)] = Phase.WET
+        phase[sat.valid & (values > g)] = Phase.SUPERHEATED
+        return phase
+
+    def _liquid(self, p: np.ndarray, key: str, values: np.ndarray) -> np.ndarray:
+        """True above the saturated table for the states below the top of the compressed table (e.g. T_23 for IF97)"""
+        above = p > self._p_max
+        if self.compressed is None or not above.any():
+            return np.zeros(np.shape(above), dtype=bool)
+        p = np.where(above, p, np.nan)
+        _, T_top = self.compressed.bounds(p)
+        top = T_top if key == "T" else getattr(self.compressed.get_many(T=T_top, p=p), key)
+        return above & (values <= top)
+
+    def _get_many(self, p: np.ndarray, key: str, values: np.ndarray) -> RowsSteam:
+        p, values = np.broadcast_arrays(np.asarray(p, dtype=np.float64), np.asarray(values, dtype=np.float64))
+        sat = self.saturated.get_many(p=p)
+        phase = self._classify(p, sat, key, values)
+
+        # The wet states, weighted by the quality (a temperature on the saturation line does not give it)
+        if key == "T":
+            rows = self._mixture(p, sat, np.nan, np.zeros(p.shape, dtype=bool))
+        else:
+            f, g = getattr(sat, f"{key}_f"), getattr(sat, f"{key}_g")
+            rows = self._mixture(p, sat, (values - f) / (g - f), phase == Phase.WET)
+
+        # The superheated ones from the superheated table, the compressed ones from the compressed table if any
+        for table, found in ((self.overheated, phase == Phase.SUPERHEATED), (self.compressed, phase == Phase.COMPRESSED)):
+            if table is None or not found.any():
+                continue
+            lookup = table.get_many(T=values, p=p) if key == "T" else getattr(table, f"get_many_p{key}")(p, values)
+            found &= lookup.valid
+            for name in ("p", "T", "v", "u", "h", "s"):
+                setattr(rows, name, np.where(found, getattr(lookup, name), getattr(rows, name)))
+            rows.valid |= found
+
+        # The phase is known even where the state is not tabulated, e.g. the compressed liquid
+        rows.phase = phase
+        return rows
+
+    def _mixture(self, p: np.ndarray, sat: RowsSaturated, x: np.ndarray, valid: np.ndarray) -> RowsSteam:
+        """The wet states weighted by the quality x, NaN where not valid"""
+        x = np.where(valid, x, np.nan)
+        return RowsSteam(
+            p=np.where(valid, p, np.nan),
+            T=np.where(valid, sat.T, np.nan),
+            v=sat.v_f + x * (sat.v_g - sat.v_f),
+            u=sat.u_f + x * (sat.u_g - sat.u_f),
+            h=sat.h_f + x * (sat.h_g - sat.h_f),
+            s=sat.s_f + x * (sat.s_g - sat.s_f),
+            x=x,
+            u_f=sat.u_f,
+            u_g=sat.u_g,
+            h_f=sat.h_f,
+            h_g=sat.h_g,
+            s_f=sat.s_f,
+            s_g=sat.s_g,
+            phase=np.where(valid, Phase.WET, Phase.UNKNOWN).astype(np.int8),
+            valid=valid,
+        )
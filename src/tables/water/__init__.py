@@ -1,2 +1,4 @@
 from .__main__ import TABLE_SATURATED
-from .__main__ import TABLE_OVERHEATED
\ No newline at end of file
+from .__main__ import TABLE_OVERHEATED
+from .__main__ import TABLE_STEAM
+from .__main__ import STEAM_BACKENDS, use_steam_backend, steam_backend
@@ -1,22 +1,131 @@
-from ..saturated import TableSaturated
-from ..overheated import TableOverheated
+import os
+from ..lazy import LazyTable
+
+
+# The tables (and pandas) are only loaded on first use
+def _load_saturated():
+    from ..saturated import TableSaturated
+    return TableSaturated("./water/saturated.csv")
+
+
+def _load_overheated():
+    from ..overheated import TableOverheated
+    return TableOverheated("./water/overheated.csv")
+
+
+def _load_steam():
+    # The compressed liquid is approximated from the saturated liquid at the same temperature
+    from ..steam import TableSteam
+    from ..compressed import SaturatedLiquid
+    return TableSteam(TABLE_SATURATED.load(), TABLE_OVERHEATED.load(), compressed=SaturatedLiquid(TABLE_SATURATED.load()))
+
+
+def _load_if97():
+    from ..if97 import if97_steam
+    return if97_steam()
+
+
+def _load_if97_dense():
+    from ..if97 import dense_steam
+    return dense_steam()
+
+
+TABLE_SATURATED = LazyTable(_load_saturated)
+TABLE_OVERHEATED = LazyTable(_load_overheated)
+TABLE_STEAM = LazyTable(_load_steam)
+
+# The backends of the steam properties, by name, with the interface of TableSteam:
+# get(**pair), get_many(**pair), classify(p, key, values), saturation(p) and the saturated table
+STEAM_BACKENDS = {
+    "tables": TABLE_STEAM, # The bundled tables
+    "if97": LazyTable(_load_if97), # The IAPWS-IF97 equations, see src.tables.if97
+    "if97-dense": LazyTable(_load_if97_dense), # Dense tables of the IF97 equations, exact near the saturation line
+}
+_steam_backend = os.environ.get("THERMO_STEAM_BACKEND", "tables")
+
+
+def use_steam_backend(name: str):
+    """Select the backend of the steam properties, e.g. "if97" (default: the THERMO_STEAM_BACKEND environment variable, or "tables")"""
+    global _steam_backend
+    assert name in STEAM_BACKENDS, f"Unknown steam backend '{name}', expected one of {', '.join(STEAM_BACKENDS)}"
+    _steam_backend = name
+
+
+def steam_backend() -> str:
+    """The name of the selected backend of the steam properties, see STEAM_BACKENDS"""
+    return _steam_backend
 
-TABLE_SATURATED = TableSaturated("./water/saturated.csv")
-TABLE_OVERHEATED = TableOverheated("./water/overheated.csv")
 
 if __name__ == "__main__":
-    row = TABLE_SATURATED.get(s_g=6.6586)
+    import numpy as np
+
+    # The tables are in SI: Pa, K, m^3/kg, J/kg and J/kgK
+    row = TABLE_SATURATED.get(s_g=6658.6)
     
     # Tutorial 2 - b) 1
-    assert round(row.p, 2) == 8.1, "Test failed"
-    assert round(row.h_g, 2) == 2769.60, "Test failed"
+    assert round(row.p / 1e5, 2) == 8.1, "Test failed"
+    assert round(row.h_g / 1e3, 2) == 2769.60, "Test failed"
 
     # NOTE: The values in the table might be wrong
-    # The fist value is used as search key, and the second for interpolation
-    row = TABLE_OVERHEATED.get(T=440, p=8.10)
+    row = TABLE_OVERHEATED.get(T=713.15, p=8.10e5)
 
     # Tutorial 2 - b) 3
-    assert round(row.p, 2) == 8.1, "Test failed"
-    assert round(row.h, 2) == 3351.83, "Test failed"
-    assert round(row.s, 4) == 7.6952, "Test failed"
-    
\ No newline at end of file
+    assert round(row.p / 1e5, 2) == 8.1, "Test failed"
+    assert round(row.h / 1e3, 2) == 3351.83, "Test failed"
+    assert round(row.s / 1e3, 4) == 7.6952, "Test failed"
+
+    # Off-grid (p, T), bilinear interpolation between the 80 and 100 bar isobars
+    row = TABLE_OVERHEATED.get(T=773.15, p=95e5)
+    assert round(row.h / 1e3, 2) == 3379.45, "Test failed"
+
+    # Batch lookups, the points out of the table are flagged instead of raising
+    rows = TABLE_SATURATED.get_many(s_g=[6658.6, 100000])
+    assert round(rows.p[0] / 1e5, 2) == 8.1, "Test failed"
+    assert list(rows.valid) == [True, False], "Test failed"
+
+    # The last row is inside the table, the first one too
+    row = TABLE_SATURATED.get(p=110e5)
+    assert round(row.T - 273.15, 1) == 318.2 and round(TABLE_SATURATED.get(p=0.04e5).T - 273.15, 2) == 28.96, "Test failed"
+    rows = TABLE_SATURATED.get_many(p=[0.04e5, 110e5, 111e5])
+    assert list(rows.valid) == [True, True, False] and round(rows.h_g[1] / 1e3, 1) == 2705.6, "Test failed"
+
+    rows = TABLE_OVERHEATED.get_many(T=[713.15, 713.15, 1273.15], p=8.10e5)
+    assert round(rows.h[1] / 1e3, 2) == 3351.83, "Test failed"
+    assert list(rows.valid) == [True, True, False], "Test failed"
+
+    # Inverse lookups, superheated
+    row = TABLE_STEAM.get_ph(p=8.10e5, h=3351830)
+    assert round(row.T - 273.15, 1) == 440.0, "Test failed"
+    assert row.x is None, "Test failed"
+    assert row.h_g == TABLE_SATURATED.get(p=8.10e5).h_g, "Test failed" # The saturation at p comes with the state
+
+    # Inverse lookups, wet mixture (isentropic expansion to the condenser)
+    row = TABLE_STEAM.get_ps(p=0.1e5, s=6658.6)
+    assert round(row.x, 4) == 0.8011, "Test failed"
+    assert round(row.h / 1e3, 1) == 2108.9, "Test failed"
+
+    # Batch inverse lookups, wet, superheated and compressed liquid
+    rows = TABLE_STEAM.get_many_ps(p=[0.1e5, 8.10e5, 0.1e5], s=[6658.6, 7695.2, 100])
+    assert round(rows.x[0], 4) == 0.8011 and np.isnan(rows.x[1]), "Test failed"
+    assert rows.h[1] == TABLE_STEAM.get_ps(p=8.10e5, s=7695.2).h, "Test failed"
+    assert list(rows.valid) == [True, True, False], "Test failed"
+
+    rows = TABLE_STEAM.get_many_px(p=0.1e5, x=[0, 1])
+    assert np.allclose(rows.h, [TABLE_SATURATED.get(p=0.1e5).h_f, TABLE_SATURATED.get(p=0.1e5).h_g]), "Test failed"
+
+    # At the top of the saturated table, both saturated and superheated states
+    assert round(TABLE_STEAM.saturation(110e5).T - 273.15, 1) == 318.2, "Test failed"
+    rows = TABLE_STEAM.get_many(p=[110e5, 110e5], T=[773.15, 873.15])
+    assert list(rows.valid) == [True, True] and round(rows.h[0] / 1e3, 2) == 3360.45, "Test failed"
+
+    # Phases, against the saturation line at 10 bar (179.9 C)
+    from ..steam import Phase
+    phases = TABLE_STEAM.classify(p=10e5, key="T", values=np.array([373.15, 573.15]))
+    assert list(phases) == [Phase.COMPRESSED, Phase.SUPERHEATED], "Test failed"
+    rows = TABLE_STEAM.get_many(p=[10e5, 10e5, 0.1e5], T=[373.15, 573.15, 373.15])
+    assert list(rows.phase) == [Phase.COMPRESSED, Phase.SUPERHEATED, Phase.SUPERHEATED], "Test failed"
+    assert list(rows.valid) == [True, True, False], "Test failed" # Below 5 bar, out of the superheated table
+    assert rows.h[0] == TABLE_SATURATED.get(T=373.15).h_f + TABLE_SATURATED.get(T=373.15).v_f * (10e5 - TABLE_SATURATED.get(T=373.15).p), "Test failed"
+    rows = TABLE_STEAM.get_many(T=318.96, x=0.5)
+    assert round(rows.p / 1e5, 2) == 0.1 and rows.phase == Phase.WET, "Test failed"
+    assert rows.h == (rows.h_f + rows.h_g) / 2, "Test failed"
@@ -1,2 +1,3 @@
 from .state import State
-from .process import Process
\ No newline at end of file
+from .process import Process
+from .relations import Relation, RelationGraph, UnderdeterminedError, OverdeterminedError
\ No newline at end of file
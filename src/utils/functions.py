@@ -1,14 +0,0 @@
-from typing import Any, Callable
-
-
-def safe(fn: Callable[[], Any]) -> Any | None:
-    """
-    Computes the result of a provided function, given that all 
-    variables in the function's closure are not None.
-    """
-        
-    # If all required values are present, safely compute
-    try:
-        return fn()
-    except:
-        return None
\ No newline at end of file
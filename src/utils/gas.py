@@ -1,15 +1,19 @@
 from dataclasses import dataclass
+from .relations import Relation
 
 @dataclass
 class Gas:
+    name: str # Name of the gas, e.g. Process("AIR", ...)
     R: float # Gas constant [J/(kg K)]
     k: float # Specific heat ratio (gamma) 
     c_p: float # Specific heat at constant pressure [J/(kg K)]
     c_v: float # Specific heat at constant volume [J/(kg K)]
 
-    def __init__(self, R: float, k: float):
+    def __init__(self, name: str, R: float, k: float):
+        self.name = name
         self.R = R
         self.k = k
+        self._graphs = {} # Relations of the processes compiled for this gas, by process class (see Process)
 
     @property
     def c_p(self):
@@ -20,9 +24,37 @@ class Gas:
     def c_v(self):
         """"""
         return self.R / (self.k - 1)
-    
 
-AIR = Gas(287, 1.4)
+    def h(self, T: float) -> float:
+        """Specific enthalpy [J/kg]"""
+        return self.c_p * T
+
+    def u(self, T: float) -> float:
+        """Specific internal energy [J/kg]"""
+        return self.c_v * T
+
+    def relations(self, state: str) -> list[Relation]:
+        """Ideal gas relations between the properties of a state, e.g. relations("A") for A.p, A.T, ..."""
+        R, c_p, c_v = self.R, self.c_p, self.c_v
+        s = state
+
+        return [
+            # p * v = R * T
+            Relation(f"{s}.T", (f"{s}.p", f"{s}.v"), lambda p, v: p * v / R),
+            # h = c_p * T and u = c_v * T
+            Relation(f"{s}.T", (f"{s}.h",), lambda h: h / c_p),
+            Relation(f"{s}.T", (f"{s}.u",), lambda u: u / c_v),
+            Relation(f"{s}.v", (f"{s}.T", f"{s}.p"), lambda T, p: R * T / p),
+            Relation(f"{s}.p", (f"{s}.T", f"{s}.v"), lambda T, v: R * T / v),
+            Relation(f"{s}.h", (f"{s}.T",), lambda T: c_p * T),
+            Relation(f"{s}.u", (f"{s}.T",), lambda T: c_v * T),
+        ]
+
+
+AIR = Gas("AIR", 287, 1.4)
+
+# The gases of the processes, by name (see also src.utils.variable_gas)
+GASES: dict[str, Gas] = {AIR.name: AIR}
 
 if __name__ == "__main__":
     assert AIR.R == 287
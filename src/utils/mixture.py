@@ -0,0 +1,119 @@
+"""
+Ideal gas mixtures, e.g. the products of the combustion in Otto and Diesel cycles.
+
+The c_p of a mixture of ideal gases is the mole-weighted sum of the c_p of its
+species, so a mixture of cubic c_p(T) is again a cubic c_p(T): it is a VariableGas
+with the weighted coefficients, molar mass and standard entropy (plus the entropy
+of mixing). The mixtures are memoized by composition, the states of a sweep with
+the same composition share the same gas and the same property tables.
+"""
+from functools import lru_cache
+import numpy as np
+from .variable_gas import R_U, VariableGas
+
+# Cengel, Table A-2c for c_p (273 - 1800 K) and Table A-26 for the standard entropy at 298 K [kJ/(kmol K)]
+SPECIES: dict[str, VariableGas] = {
+    gas.name: gas for gas in (
+        VariableGas("N2", 28.013, (28.90, -0.1571e-2, 0.8081e-5, -2.873e-9), (273, 1800), s_ref=191.61e3 / 28.013),
+        VariableGas("O2", 31.999, (25.48, 1.520e-2, -0.7155e-5, 1.312e-9), (273, 1800), s_ref=205.04e3 / 31.999),
+        VariableGas("CO2", 44.01, (22.26, 5.981e-2, -3.501e-5, 7.469e-9), (273, 1800), s_ref=213.80e3 / 44.01),
+        VariableGas("H2O", 18.015, (32.24, 0.1923e-2, 1.055e-5, -3.595e-9), (273, 1800), s_ref=188.83e3 / 18.015),
+        # Monatomic, c_p = 5/2 R_u
+        VariableGas("Ar", 39.948, (20.786, 0, 0, 0), (273, 1800), s_ref=154.84e3 / 39.948),
+    )
+}
+
+
+def mixture(composition: dict[str, float]) -> VariableGas:
+    """
+    Return the ideal gas mixture of the species (see SPECIES) with the given mole
+    fractions, e.g. mixture({"N2": 0.79, "O2": 0.21}). The fractions are normalized.
+
+    The mixtures are memoized: the same composition (to 6 decimals) returns the same
+    gas, without recomputing the weighted sums nor the tables of its inverse functions
+    """
+    total = sum(composition.values())
+    assert total > 0, "The mixture is empty"
+    key = tuple(sorted((name, round(y / total, 6)) for name, y in composition.items() if y > 0))
+    return _mixture(key)
+
+
+@lru_cache(maxsize=256)
+def _mixture(key: tuple[tuple[str, float], ...]) -> VariableGas:
+    for name, _ in key:
+        assert name in SPECIES, f"Unknown species '{name}', expected one of {', '.join(SPECIES)}"
+
+    species = [SPECIES[name] for name, _ in key]
+    y = np.array([y for _, y in key])
+    y = y / y.sum()
+
+    # Mole-weighted c_p, molar mass and standard entropy (with the entropy of mixing) [kJ/(kmol K)]
+    M = y @ [gas.M for gas in species]
+    coefficients = tuple(y @ np.array([gas.coefficients for gas in species]))
+    s_ref = y @ [gas.s_ref * gas.M / 1e3 for gas in species] - R_U / 1e3 * (y @ np.log(y))
+    T_min = max(gas.T_min for gas in species)
+    T_max = min(gas.T_max for gas in species)
+
+    name = "MIXTURE(" + ", ".join(f"{name}: {y}" for name, y in key) + ")"
+    return VariableGas(name, M, coefficients, (T_min, T_max), s_ref=s_ref * 1e3 / M)
+
+
+def combustion_products(x: float, y: float, afr: float) -> dict[str, float]:
+    """
+    Mole fractions of the products of the complete combustion of a hydrocarbon
+    C_x H_y in air (O2 + 3.76 N2), with the air-fuel ratio afr (mass of air per
+    mass of fuel), e.g. combustion_products(12, 26, 25) for diesel (n-dodecane):
+
+        C_x H_y + a (O2 + 3.76 N2) -> x CO2 + y/2 H2O + (a - x - y/4) O2 + 3.76 a N2
+
+    Only lean mixtures burn completely (no CO), so afr must be at least stoichiometric
+    """
+    M_fuel = 12.011 * x + 1.008 * y
+    a = afr * M_fuel / (4.76 * 28.97)
+    assert a >= x + y / 4 - 1e-9, f"Rich mixture, the stoichiometric air-fuel ratio is {(x + y / 4) * 4.76 * 28.97 / M_fuel:.2f}"
+
+    moles = {"CO2": x, "H2O": y / 2, "O2": a - x - y / 4, "N2": 3.76 * a}
+    total = sum(moles.values())
+    return {name: n / total for name, n in moles.items()}
+
+
+if __name__ == "__main__":
+    # Air as a mixture: the same c_p as the single-gas fit (Table A-2c)
+    from .variable_gas import AIR_VARIABLE
+    air = mixture({"N2": 0.78, "O2": 0.21, "Ar": 0.01})
+    assert round(air.M, 1) == 29.0
+    assert abs(air.c_p(300) / AIR_VARIABLE.c_p(300) - 1) < 0.01
+    assert abs(air.c_p(1500) / AIR_VARIABLE.c_p(1500) - 1) < 0.01
+
+    # Memoized by composition, normalized
+    assert mixture({"O2": 21, "N2": 78, "Ar": 1}) is air
+
+    # Diesel (n-dodecane) burnt with twice the stoichiometric air
+    products = combustion_products(12, 26, 2 * 14.98)
+    assert round(sum(products.values()), 12) == 1
+    gas = mixture(products)
+    assert round(gas.M, 1) == 28.8
+    assert gas.c_p(1500) > air.c_p(1500) # CO2 and H2O
+    T = np.array([600.0, 1600.0])
+    assert np.allclose(gas.T_from_h(gas.h(T)), T, rtol=1e-12)
+
+    # Isentropic expansion of the products, from the end of the combustion
+    from src.utils import State
+    from src.processes import Isentropic
+    p3 = State("P3", T=1600, p="60 bar")
+    p4 = State("P4", p="2 bar")
+    expansion = Isentropic(gas, A=p3, B=p4)
+    expansion.compute()
+    assert round(p3.s, 6) == round(p4.s, 6)
+    assert 700 < p4.T < 800
+    assert expansion.work() > 0
+
+    # The relations compiled for the processes go with the gas, evicted with it
+    from src.utils.process import Process
+    assert Isentropic in gas._graphs and not any(key[1] == gas.name for key in Process._graphs)
+
+    try:
+        combustion_products(12, 26, 10)
+        assert False, "Rich mixture burnt"
+    except AssertionError as e:
+        assert "14.98" in str(e)
@@ -0,0 +1,164 @@
+"""
+The paths of the processes, sampled for the T-s and p-v diagrams.
+
+A process draws its path through `_trace(t)`, the states along it for a parameter t
+going from 0 (state A) to 1 (state B), e.g. for an isobar T = T_A (T_B / T_A)^t.
+The samples start evenly spaced in t, then the segments whose midpoint is too far
+from their chord (in one of the diagrams, relative to the size of the path) are
+split, until all of them are straight enough: a curved isobar on T-s gets more
+samples than a vertical isentrope.
+
+The states may be arrays (one cycle per entry): the path is then sampled once for
+all of them, on the same parameters, as arrays of shape (samples, *shape).
+
+Process only imports this module inside `_trace` and `path`, so a bare Process of
+src.utils solves without NumPy. The processes of src.processes import it at the top
+for their own `_trace`, along with NumPy and src.utils.variable_gas.
+"""
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+import numpy as np
+from .gas import Gas
+from .variable_gas import P_REF, T_REF, VariableGas
+
+if TYPE_CHECKING:
+    from .process import Process
+
+# Samples of the first pass, evenly spaced
+SAMPLES = 9
+
+
+@dataclass
+class Path:
+    p: np.ndarray # Pressure [Pa]
+    T: np.ndarray # Temperature [K]
+    v: np.ndarray # Specific volume [m^3/kg]
+    s: np.ndarray # Specific entropy [J/(kg K)]
+
+    def __len__(self) -> int:
+        return len(self.p)
+
+    def _take(self, order: np.ndarray) -> "Path":
+        return Path(self.p[order], self.T[order], self.v[order], self.s[order])
+
+    def _concatenate(self, other: "Path") -> "Path":
+        return Path(*(np.concatenate((getattr(self, name), getattr(other, name))) for name in ("p", "T", "v", "s")))
+
+
+def entropy(model: "Gas | VariableGas", T, p):
+    """
+    Entropy of an ideal gas [J/(kg K)]. For a constant c_p, taken as 0 at T_REF and P_REF:
+    s(T, p) = c_p ln(T / T_REF) - R ln(p / P_REF)
+    """
+    if isinstance(model, VariableGas):
+        return model.s(T, p)
+    return model.c_p * np.log(T / T_REF) - model.R * np.log(p / P_REF)
+
+
+def gas_path(model: "Gas | VariableGas", p, T) -> Path:
+    """The path through the states (p, T) of an ideal gas"""
+    p, T = np.broadcast_arrays(np.asarray(p, dtype=np.float64), np.asarray(T, dtype=np.float64))
+    return Path(p, T, model.R * T / p, entropy(model, T, p))
+
+
+def steam_path(**pair) -> Path:
+    """The path through the states of steam given by a pair, e.g. p and h along an isobar (see TableSteam.get_many)"""
+    from ..tables.water import STEAM_BACKENDS, steam_backend
+    names, values = zip(*pair.items())
+    rows = STEAM_BACKENDS[steam_backend()].get_many(**dict(zip(names, np.broadcast_arrays(*values))))
+    return Path(rows.p, rows.T, rows.v, rows.s)
+
+
+def chord(A, B, t) -> Path:
+    """The straight segment from the state A to the state B, in every property"""
+    values = {}
+    for name in ("p", "T", "v", "s"):
+        a, b = (np.nan if value is None else value for value in (getattr(A, name), getattr(B, name)))
+        values[name] = a + (b - a) * t
+    return Path(*np.broadcast_arrays(*values.values()))
+
+
+def _deviation(path: Path, mid: Path) -> np.ndarray:
+    """
+    Distance of the midpoints of the segments to their chord, in each diagram
+    scaled by the size of the path: the largest over the diagrams and all the cycles.
+    The p-v diagram is checked with a linear and a log volume axis (see Cycle.plot)
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        diagrams = (
+            ((path.s, path.T), (mid.s, mid.T)),
+            ((path.v, path.p), (mid.v, mid.p)),
+            ((np.log(path.v), path.p), (np.log(mid.v), mid.p)),
+        )
+
+    deviation = np.zeros(len(mid))
+    for (x, y), (x_mid, y_mid) in diagrams:
+        # Scaled by the extent of the path, a constant coordinate (up to rounding) is not scaled
+        span_x, span_y = (np.ptp(value, axis=0) for value in (x, y))
+        span_x, span_y = (np.where(span > 1e-9 * np.abs(value).max(axis=0), span, 1.0) for span, value in ((span_x, x), (span_y, y)))
+        dx, dy = (x[1:] - x[:-1]) / span_x, (y[1:] - y[:-1]) / span_y
+        mx, my = (x_mid - x[:-1]) / span_x, (y_mid - y[:-1]) / span_y
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distance = np.nan_to_num(np.abs(dx * my - dy * mx) / np.hypot(dx, dy), nan=0.0)
+        deviation = np.maximum(deviation, distance.reshape(len(mid), -1).max(axis=1))
+    return deviation
+
+
+def sample(process: "Process", tolerance: float = 1e-3, max_samples: int = 513) -> Path:
+    """
+    The path of the process, sampled until every segment is within `tolerance` of
+    the curve (relative to the size of the path), with at most max_samples samples
+    """
+    def trace(t: np.ndarray) -> Path:
+        # The parameters along the first axis, the cycles along the others
+        ndim = max(np.ndim(getattr(state, name)) for state in (process.A, process.B) for name in ("p", "T", "v", "s"))
+        return process._trace(t.reshape((-1,) + (1,) * ndim))
+
+    t = np.linspace(0, 1, SAMPLES)
+    path = trace(t)
+    while len(t) < max_samples:
+        mid_t = (t[:-1] + t[1:]) / 2
+        mid = trace(mid_t)
+        deviation = _deviation(path, mid)
+        split = np.flatnonzero(deviation > tolerance)
+        if len(split) == 0:
+            break
+
+        # The worst segments first, when there are too many to split
+        split = split[np.argsort(-deviation[split], kind="stable")][:max_samples - len(t)]
+        t = np.concatenate((t, mid_t[split]))
+        path = path._concatenate(mid._take(split))
+        order = np.argsort(t, kind="stable")
+        t, path = t[order], path._take(order)
+    return path
+
+
+if __name__ == "__main__":
+    from .gas import AIR
+
+    # Isobar on T-s: s = c_p ln(T) + constant, an exponential curve
+    T = np.geomspace(300, 1200, 5)
+    path = gas_path(AIR, 1e5, T)
+    assert np.allclose(np.diff(path.s), AIR.c_p * np.log(T[1:] / T[:-1]))
+    assert round(entropy(AIR, T_REF, P_REF), 9) == 0
+
+    # A curve needs more samples than a straight line
+    class Trace:
+        def __init__(self, fn, shape=()):
+            self.fn = fn
+            self.A = self.B = type("State", (), {"p": np.zeros(shape), "T": None, "v": None, "s": None})
+
+        def _trace(self, t):
+            return self.fn(t)
+
+    A, B = gas_path(AIR, 1e5, 300), gas_path(AIR, 1e5, 1200)
+    line = sample(Trace(lambda t: chord(A, B, t)))
+    curve = sample(Trace(lambda t: gas_path(AIR, 1e5, 300 * 4 ** t)))
+    assert len(line) == SAMPLES and len(curve) > SAMPLES
+    finer = sample(Trace(lambda t: gas_path(AIR, 1e5, 300 * 4 ** t)), tolerance=1e-5)
+    assert np.all(np.diff(curve.T) > 0) and len(finer) > len(curve)
+
+    # Many cycles on the same parameters
+    paths = sample(Trace(lambda t: gas_path(AIR, 1e5, 300 * np.array([2, 4]) ** t), shape=(2,)))
+    assert paths.T.shape == (len(paths), 2) and np.allclose(paths.T[-1], [600, 1200])
@@ -1,8 +1,24 @@
-from .state import State
-from .functions import safe
-from .gas import AIR
-from ..tables.water import TABLE_SATURATED, TABLE_OVERHEATED
-from ..tables.overheated import TableOverheated
+from typing import TYPE_CHECKING
+from .state import FIELDS, State
+from .state_cache import STATE_CACHE
+from .gas import GASES
+from .relations import Relation, RelationGraph
+from ..tables.water import STEAM_BACKENDS, steam_backend
+
+if TYPE_CHECKING:
+    from ..tables.steam import TableSteam
+    from .path import Path
+    from .gas import Gas
+    from .variable_gas import VariableGas
+
+
+# Pairs of properties defining a state of steam, by order of preference
+STEAM_PAIRS = (("p", "T"), ("p", "h"), ("p", "s"), ("p", "x"), ("T", "x"))
+
+
+def _is_identity(relation: Relation) -> bool:
+    """True for a property carried over from one state to the other, e.g. Relation("B.p", ("A.p",), ...)"""
+    return len(relation.inputs) == 1 and relation.inputs[0][2:] == relation.target[2:] and relation.inputs[0][:2] != relation.target[:2]
 
 
 class Process:
@@ -11,45 +27,140 @@ class Process:
 
     Represents a transition between two states (A and B) in a thermodynamic cycle.
     Attributes:
-        gas (str): The gas used in the process.
+        gas (str): The gas used in the process, e.g. "AIR" or "STEAM".
+        model (Gas): The ideal gas model of the gas, None for the tabulated fluids.
+        default_gas (bool): True if no gas was given, the step then takes the one of its cycle (see Cycle.add_step).
         A (Point): The starting point of the process.
         B (Point): The ending point of the process.
     """
-    def __init__(self, gas: str, *, A: State, B: State):
-        self.gas = gas.upper()
+    # (process class, fluid) -> (compiled relations, the properties of A and B they use: ("A.p", "A", "p"), ...)
+    # for the tabulated fluids. The ones of an ideal gas are kept on its model, and go with it (e.g. a mixture)
+    _graphs: dict[tuple[type, str], tuple[RelationGraph, list[tuple[str, str, str]]]] = {}
+
+    def __init__(self, gas: "str | Gas | VariableGas | None", *, A: State, B: State):
         self.A = A
         self.B = B
+        self.default_gas = gas is None
+        self.use_gas("AIR" if gas is None else gas)
+
+    def use_gas(self, gas: "str | Gas | VariableGas"):
+        """Set the gas of the process, given by name (see GASES), or directly by its model"""
+        if isinstance(gas, str):
+            self.gas = gas.upper()
+            self.model = GASES.get(self.gas)
+        else:
+            self.gas = gas.name
+            self.model = gas
+        self._path: tuple[tuple, "Path"] | None = None # (the values it was sampled from, the path), see path()
+
+        # The ideal gas relations of both states, with the ones of the process, compiled once per class and gas.
+        # A tabulated fluid only keeps the identities of the process (e.g. B.s = A.s), the tables give the rest
+        graphs, key = (Process._graphs, (type(self), self.gas)) if self.model is None else (self.model._graphs, type(self))
+        if key not in graphs:
+            if self.model is not None:
+                relations = self.model.relations("A") + self.model.relations("B") + self.relations()
+            else:
+                relations = [relation for relation in self.relations() if _is_identity(relation)]
+            graph = RelationGraph(relations)
+            fields = [(name, name[0], name[2:]) for name in graph.variables if name[:2] in ("A.", "B.")]
+            graphs[key] = (graph, fields)
+        self._graph, self._fields = graphs[key]
+
+    def relations(self) -> list[Relation]:
+        """
+        Relations between the properties of A and B specific to the process,
+        e.g. Relation("B.p", ("A.p",), lambda p: p) for a constant pressure.
+        They are compiled once per class and gas, so they must only depend on the gas (self.model)
+        """
+        return []
+
+    def _compute_gas_states(self) -> set[str]:
+        """
+        Compute the properties of both states using the ideal gas laws, the specific heat
+        relationships and the relations of the process (only its identities for the tables).
+        Return the variables that remain unknown
+        """
+        values = self._values()
+        unknown = self._graph.solve(values)
+
+        states = {"A": self.A, "B": self.B}
+        for name, state, attr in self._fields:
+            setattr(states[state], attr, values[name])
+        return unknown
+
+    def conflicts(self) -> list[Relation]:
+        """Return the relations contradicted by the properties of A and B"""
+        # The relations only describe an ideal gas, the tables are consistent by construction
+        if self.model is None:
+            return []
+
+        values = self._values()
+        self._graph.solve(values)
+        return self._graph.conflicts(values)
+
+    def _values(self) -> dict[str, float | None]:
+        """Values of the properties of A and B used by the relations, e.g. {"A.p": ..., "B.T": ...}"""
+        states = {"A": self.A, "B": self.B}
+        return {name: getattr(states[state], attr) for name, state, attr in self._fields}
+
+    def _compute_steam_state(self, s: State):
+        """
+        Complete a state of steam from the first known pair of STEAM_PAIRS, whatever its
+        phase (compressed, wet or superheated, see TableSteam.get_many), with the selected
+        backend (see STEAM_BACKENDS). The properties may be arrays, the states that are
+        not tabulated are then NaN
+        """
+        # Plain loops, this runs for every state of every step (e.g. on each hit of the cache)
+        for pair in STEAM_PAIRS:
+            if getattr(s, pair[0]) is not None and getattr(s, pair[1]) is not None:
+                break
+        else:
+            return
+        for name in FIELDS[:6]:
+            if getattr(s, name) is None:
+                break
+        else:
+            return
+
+        # The same states come back across the cycles of a sweep, see STATE_CACHE
+        backend = steam_backend()
+        STATE_CACHE.complete(f"{self.gas}:{backend}", s, pair, lambda s: self._lookup_steam_state(s, pair, STEAM_BACKENDS[backend]))
+
+    def _lookup_steam_state(self, s: State, pair: tuple[str, str], table: "TableSteam"):
+        values = {name: getattr(s, name) for name in pair}
+        if all(isinstance(value, (int, float)) for value in values.values()):
+            # A single state, without the overhead of the arrays, with the saturation at its pressure
+            rows = vars(table.get(**values))
+        else:
+            rows = vars(table.get_many(**values))
+
+        for name in FIELDS:
+            if getattr(s, name) is None:
+                setattr(s, name, rows.get(name))
+
+    def compute(self) -> set[str]:
+        """
+        Compute the missing properties of both states.
+        Return the variables that remain underdetermined, e.g. {"B.T", "B.v"}
+        """
+        # If the gas is an ideal gas (e.g. air), than we can use the ideal gas laws and the specific heat relationships
+        if self.model is not None:
+            return self._compute_gas_states()
 
-    def _compute_gas_state(self, s: State):
-        """Compute the properties of a state using the ideal gas laws and the specific heat relationships"""
-        # (p * v = R * T) and (h = c_p * T) and (u = c_v * T)
-        s.T = s.T or safe(lambda: s.p * s.v / AIR.R) or safe(lambda: s.h / AIR.c_p) or safe(lambda: s.u / AIR.c_v)
-        s.v = s.v or safe(lambda: AIR.R * s.T / s.p)
-        s.p = s.p or safe(lambda: AIR.R * s.T / s.v)
-        s.h = s.h or safe(lambda: AIR.c_p * s.T)
-        s.u = s.u or safe(lambda: AIR.c_v * s.T)
-
-    def _compute_overheated_state(self, s: State, table: TableOverheated):
-        obj = table.get(p=s.get_pressure("bar"), T=s.get_temperature("C"))
-        s.v = s.v or obj.v
-        s.u = s.u or obj.u * 1e3
-        s.h = s.h or obj.h * 1e3
-        s.s = s.s or obj.s * 1e3
-
-    def compute(self):
-        """Compute the properties of the end point"""
         match self.gas:
-            # If the gas is air, than we can use the ideal gas laws and the specific heat relationships
-            case "AIR":
-                self._compute_gas_state(self.A)
-                self._compute_gas_state(self.B)
-                return
-            
             # If the gas is steam, than we can use the steam tables
             case "STEAM":
-                if self.A.p and self.A.T:
-                    self._compute_overheated_state(self.A, TABLE_OVERHEATED)
-                    self._compute_overheated_state(self.B, TABLE_OVERHEATED)
+                # The lookups, then the identities of the process, until no state changes: e.g.
+                # the entropy found for A gives the pair (p, s) of B through an isentropic
+                while True:
+                    known = (self.A.known(), self.B.known()) if self._fields else None
+                    self._compute_steam_state(self.A)
+                    self._compute_steam_state(self.B)
+                    if not self._fields:
+                        break
+                    self._compute_gas_states()
+                    if (self.A.known(), self.B.known()) == known:
+                        break
         
         # TODO: If the gas is a refrigerant, than we can use the refrigerant tables
         if self.gas == "REFRIGERANT-12":
@@ -59,13 +170,16 @@ class Process:
         if self.gas == "AMMONIA":
             pass
 
-        pass
+        states = {"A": self.A, "B": self.B}
+        return {f"{state}.{name}" for state in states for name in FIELDS[:6] if getattr(states[state], name) is None}
 
     def work(self) -> float | None:
         """
         Return the work related to the process \\
-        If negative, the work is done by the system \\
-        If positive, the work is done on the system
+        If positive, the work is done by the system \\
+        If negative, the work is done on the system
+
+        First law for a closed system: q = Δu + w
         """
         raise NotImplementedError
 
@@ -77,11 +191,35 @@ class Process:
         """
         raise NotImplementedError
     
-    def plot(self, ax_pv, ax_ts):
+    def _trace(self, t) -> "Path":
+        """
+        The states along the process, for t from 0 (A) to 1 (B), see src.utils.path.
+        Without a model of the path, the straight segment between the states
+        """
+        from .path import chord
+        return chord(self.A, self.B, t)
+
+    def path(self, tolerance: float = 1e-3, max_samples: int = 513) -> "Path":
         """
-        Plot the process on a P-V diagram and a T-S diagram
+        The path of the process sampled for the diagrams, denser where it bends (see
+        src.utils.path). It is kept until the states change, so the redraws reuse it
         """
-        raise NotImplementedError 
+        from .path import sample
+        values = [getattr(self, "n", None)] + [getattr(state, name) for state in (self.A, self.B) for name in ("p", "T", "v", "s")]
+        key = (tolerance, max_samples) + tuple(value.tobytes() if hasattr(value, "tobytes") else value for value in values)
+        if self._path is None or self._path[0] != key:
+            self._path = (key, sample(self, tolerance, max_samples))
+        return self._path[1]
+
+    def plot(self, ax_pv, ax_ts, **kwargs):
+        """
+        Plot the process on a P-V diagram and a T-S diagram, along its path.
+        The keyword arguments are passed to Axes.plot, e.g. color="red"
+        """
+        path = self.path()
+        kwargs.setdefault("label", type(self).__name__)
+        ax_pv.plot(path.v, path.p, **kwargs)
+        ax_ts.plot(path.s, path.T, **kwargs)
     
     def __repr__(self):
         return (f"Process('{self.gas}', A ---> B)\n"
@@ -94,7 +232,7 @@ if __name__ == "__main__":
     s1 = State("1", p="1 bar", T=300)
     s2 = State("2", h=301350)
     p = Process("AIR", A=s1, B=s2)
-    p.compute()
+    assert p.compute() == {"B.p", "B.v"}
 
     assert round(s1.p, 2) == 100000 # To PA
     assert round(s1.v, 2) == 0.86   # To be checked
@@ -118,4 +256,38 @@ if __name__ == "__main__":
     assert round(s2.p, 2) == 810000, "Test failed"
     assert round(s2.h, 0) == 3351833, "Test failed"
     assert round(s2.s, 1) == 7695.2, "Test failed"
-    
\ No newline at end of file
+    
+
+    # Wet states, e.g. the exhaust of a turbine, from the same lookup of the saturated table
+    s3 = State("3", p="0.1 bar", s=6658.6)
+    s4 = State("4", T="45.81 C", x=0)
+    Process("STEAM", A=s3, B=s4).compute()
+    assert round(s3.x, 4) == 0.8011 and round(s3.h / 1e3, 1) == 2108.9
+    assert s4.h == s4.h_f and round(s4.h) == round(s3.h_f) and round(s4.p / 1e5, 2) == 0.1
+
+    # Through an isentropic, the entropy of A gives the state of B, then back: nothing left unknown
+    s11, s12 = State("11", p="80 bar", T="480 C"), State("12", p="0.1 bar")
+    from ..processes import Isentropic
+    assert Isentropic("STEAM", A=s11, B=s12).compute() == set() and round(s12.x, 4) == 0.8011
+    assert Process("STEAM", A=State("13", p="1 bar"), B=State("14")).compute() == {"A.T", "A.v", "A.u", "A.h", "A.s"} | {f"B.{name}" for name in FIELDS[:6]}
+
+    # Superheated at the top of the saturated table (110 bar), still inside the superheated one
+    s9 = State("9", p="110 bar", T="500 C")
+    Process("STEAM", A=s9, B=State("10")).compute()
+    assert round(s9.h / 1e3, 2) == 3360.45 and s9.x is None
+
+    # Vectorized over an array of states
+    import numpy as np
+    s5 = State("5", p=np.array([0.1e5, 8.10e5, 0.1e5]), s=np.array([6658.6, 7695.2, 100]))
+    s6 = State("6", p="10 bar", T="300 C")
+    Process("STEAM", A=s5, B=s6).compute()
+    assert round(s5.x[0], 4) == 0.8011 and np.isnan(s5.x[1]) and np.isnan(s5.h[2])
+    assert round(s5.T[1] - 273.15, 1) == 437.7
+
+    # The IF97 equations, for the compressed liquid out of the tables
+    from ..tables.water import use_steam_backend
+    use_steam_backend("if97")
+    s7 = State("7", p="100 bar", T="100 C")
+    Process("STEAM", A=s7, B=State("8")).compute()
+    assert 419e3 < s7.h < 429e3 and s7.x is None
+    use_steam_backend("tables")
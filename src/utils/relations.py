@@ -0,0 +1,139 @@
+import heapq
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+class UnderdeterminedError(ValueError):
+    """Raised when the known properties are not enough to compute the unknown ones"""
+
+
+class OverdeterminedError(ValueError):
+    """Raised when the known properties contradict one of the relations"""
+
+
+@dataclass(frozen=True)
+class Relation:
+    """
+    A formula giving one variable from others.
+
+    Variables are named by strings, the properties of a state are prefixed by
+    its name, e.g. the ideal gas law for the state A:
+
+        Relation("A.T", ("A.p", "A.v"), lambda p, v: p * v / R)
+    """
+    target: str
+    inputs: tuple[str, ...]
+    fn: Callable[..., Any]
+
+
+class RelationGraph:
+    """
+    Solve a set of relations by fixed-point propagation.
+
+    Each relation waits for its inputs: it is evaluated once all of them are
+    known, and only if its target is still unknown. Every newly known variable
+    wakes up the relations that use it, so the values propagate through the
+    graph without ever trying a formula that cannot be evaluated.
+
+    The propagation only depends on which variables are known, so it is planned
+    once for each pattern of known variables, and later solves with the same
+    pattern just evaluate the planned formulas in order.
+
+    When several relations give the same variable, the first one in the list
+    that can be evaluated wins. A value of 0 is a known value, only None is unknown.
+    """
+
+    def __init__(self, relations: list[Relation]):
+        self.relations = list(relations)
+        self.variables = sorted({r.target for r in self.relations} | {name for r in self.relations for name in r.inputs})
+
+        # The relations using each variable, and the ones giving it
+        self._users: dict[str, list[int]] = {name: [] for name in self.variables}
+        self._producers: dict[str, list[int]] = {name: [] for name in self.variables}
+        for k, relation in enumerate(self.relations):
+            for name in set(relation.inputs):
+                self._users[name].append(k)
+            self._producers[relation.target].append(k)
+
+        # Known variables -> (relations to evaluate in order, variables left unknown)
+        self._plans: dict[frozenset[str], tuple[list[Relation], frozenset[str]]] = {}
+
+    def plan(self, known: frozenset[str]) -> tuple[list[Relation], frozenset[str]]:
+        """Return the relations to evaluate, in order, and the variables left unknown"""
+        if known in self._plans:
+            return self._plans[known]
+
+        unknown = set(self.variables) - known
+
+        # Number of unknown inputs of each relation
+        missing = [0] * len(self.relations)
+        for name in unknown:
+            for k in self._users[name]:
+                missing[k] += 1
+
+        # The relations giving an unknown variable, ready to be evaluated
+        ready = [k for name in unknown for k in self._producers[name] if missing[k] == 0]
+        heapq.heapify(ready)
+
+        steps = []
+        while ready:
+            relation = self.relations[heapq.heappop(ready)]
+            if relation.target not in unknown:
+                continue
+
+            steps.append(relation)
+            unknown.discard(relation.target)
+            for k in self._users[relation.target]:
+                missing[k] -= 1
+                if missing[k] == 0:
+                    heapq.heappush(ready, k)
+
+        self._plans[known] = (steps, frozenset(unknown))
+        return self._plans[known]
+
+    def solve(self, values: dict[str, Any]) -> set[str]:
+        """
+        Complete values, in place, with every variable that can be derived.
+        Return the variables that remain unknown (underdetermined)
+        """
+        steps, unknown = self.plan(frozenset(name for name in self.variables if values.get(name) is not None))
+        for relation in steps:
+            values[relation.target] = relation.fn(*[values[name] for name in relation.inputs])
+        return set(unknown)
+
+    def conflicts(self, values: dict[str, Any], rtol: float = 1e-6) -> list[Relation]:
+        """Return the relations whose inputs and target are known, but do not agree"""
+        conflicts = []
+        for relation in self.relations:
+            if any(values.get(name) is None for name in (relation.target, *relation.inputs)):
+                continue
+
+            # Works element-wise when the values are arrays
+            expected = relation.fn(*[values[name] for name in relation.inputs])
+            disagree = abs(values[relation.target] - expected) > rtol * abs(expected)
+            if disagree.any() if hasattr(disagree, "any") else disagree:
+                conflicts.append(relation)
+        return conflicts
+
+
+if __name__ == "__main__":
+    R = 287
+    graph = RelationGraph([
+        Relation("T", ("p", "v"), lambda p, v: p * v / R),
+        Relation("v", ("T", "p"), lambda T, p: R * T / p),
+        Relation("h", ("T",), lambda T: 1004.5 * T),
+    ])
+
+    values = {"p": 1e5, "T": 300}
+    assert graph.solve(values) == set()
+    assert round(values["v"], 3) == 0.861
+    assert round(values["h"], 2) == 301350
+
+    # Inconsistent data
+    values = {"p": 1e5, "T": 300, "v": 1.0}
+    assert [r.target for r in graph.conflicts(values)] == ["T", "v"]
+
+    # 0 is a known value, and nothing can be derived from h alone
+    values = {"T": 0.0}
+    assert graph.solve(values) == {"p", "v"}
+    assert values["h"] == 0.0
@@ -1,55 +1,42 @@
+from .units import from_si, parse
+
+# Properties of a state, in the order of the arguments of State
+FIELDS = ("p", "T", "v", "u", "h", "s", "x", "u_f", "u_g", "h_f", "h_g", "s_f", "s_g")
 
 
 class State:
     """
         Represent a point in a thermodynamic system.
     """
+    __slots__ = ("name", *FIELDS)
 
-    name: str = None # Name of the point
+    name: str # Name of the point
 
-    p: float = None # Pressure [Pa]
-    T: float = None # Temperature [K]
-    v: float = None # Specific volume [m^3/kg]
-    u: float = None # Specific internal energy [J/kg]
-    h: float = None # Specific enthalpy [J/kg]
-    s: float = None # Specific entropy [J/kgK]
+    p: float | None # Pressure [Pa]
+    T: float | None # Temperature [K]
+    v: float | None # Specific volume [m^3/kg]
+    u: float | None # Specific internal energy [J/kg]
+    h: float | None # Specific enthalpy [J/kg]
+    s: float | None # Specific entropy [J/kgK]
 
     # Steam / Tables only only
-    x: float = None # Ratio of steam to water [0-1]
-    u_f: float = None # Specific internal energy of saturated liquid [J/kg]
-    u_g: float = None # Specific internal energy of saturated vapor [J/kg]
-    h_f: float = None # Specific enthalpy of saturated liquid [J/kg]
-    h_g: float = None # Specific enthalpy of saturated vapor [J/kg]
-    s_f: float = None # Specific entropy of saturated liquid [J/kgK]
-    s_g: float = None # Specific entropy of saturated vapor [J/kgK]
-
-    def __init__(self, name: str, *, p: float | str = None, T: float | str = None, v: float = None, u: float = None, h: float = None, s: float = None, x: float = None, u_f: float = None, u_g: float = None, h_f: float = None, h_g: float = None, s_f: float = None, s_g: float = None):
-        # Try to load the temperature and the pressure
-        if isinstance(p, str):
-            p = p.replace(" ", "")
-            if "bar" in p:
-                p = float(p.replace("bar", "")) * 1e5
-            elif "kPa" in p:
-                p = float(p.replace("kPa", "")) * 1e3
-            elif "MPa" in p:
-                p = float(p.replace("MPa", "")) * 1e6
-            elif "Pa" in p:
-                p = float(p.replace("Pa", ""))
+    x: float | None # Ratio of steam to water [0-1]
+    u_f: float | None # Specific internal energy of saturated liquid [J/kg]
+    u_g: float | None # Specific internal energy of saturated vapor [J/kg]
+    h_f: float | None # Specific enthalpy of saturated liquid [J/kg]
+    h_g: float | None # Specific enthalpy of saturated vapor [J/kg]
+    s_f: float | None # Specific entropy of saturated liquid [J/kgK]
+    s_g: float | None # Specific entropy of saturated vapor [J/kgK]
 
-        if isinstance(T, str):
-            T = T.replace(" ", "")
-            if "C" in T:
-                T = float(T.replace("C", "")) + 273.15
-            elif "K" in T:
-                T = float(T.replace("K", ""))
-        
+    def __init__(self, name: str, *, p: float | str = None, T: float | str = None, v: float | str = None, u: float | str = None, h: float | str = None, s: float | str = None, x: float = None, u_f: float = None, u_g: float = None, h_f: float = None, h_g: float = None, s_f: float = None, s_g: float = None):
+        # Load the properties given with their unit, e.g. "1 bar", "480 C" or "2769.6 kJ/kg"
         self.name = name
-        self.p = p
-        self.T = T
-        self.v = v
-        self.u = u
-        self.h = h
-        self.s = s
+        self.p = parse(p, "pressure") if isinstance(p, str) else p
+        self.T = parse(T, "temperature") if isinstance(T, str) else T
+        self.v = parse(v, "volume") if isinstance(v, str) else v
+        self.u = parse(u, "energy") if isinstance(u, str) else u
+        self.h = parse(h, "energy") if isinstance(h, str) else h
+        self.s = parse(s, "entropy") if isinstance(s, str) else s
         self.x = x
         self.u_f = u_f
         self.u_g = u_g
@@ -62,39 +49,35 @@ class State:
         fn = lambda value: f"{value:.2f}" if isinstance(value, (int, float)) else "None"
 
         return (f"Point('{self.name}', "
-                f"p={fn(self.p)}, " 
-                f"T={fn(self.T)}, " 
-                f"v={fn(self.v)}, " 
-                f"u={fn(self.u)}, " 
-                f"h={fn(self.h)}, " 
-                f"s={fn(self.s)}, " 
-                f"x={fn(self.x)}, " 
-                f"u_f={fn(self.u_f)}, " 
-                f"u_g={fn(self.u_g)}, " 
-                f"h_f={fn(self.h_f)}, " 
-                f"h_g={fn(self.h_g)}, " 
-                f"s_f={fn(self.s_f)}, " 
+                f"p={fn(self.p)}, "
+                f"T={fn(self.T)}, "
+                f"v={fn(self.v)}, "
+                f"u={fn(self.u)}, "
+                f"h={fn(self.h)}, "
+                f"s={fn(self.s)}, "
+                f"x={fn(self.x)}, "
+                f"u_f={fn(self.u_f)}, "
+                f"u_g={fn(self.u_g)}, "
+                f"h_f={fn(self.h_f)}, "
+                f"h_g={fn(self.h_g)}, "
+                f"s_f={fn(self.s_f)}, "
                 f"s_g={fn(self.s_g)})")
 
+    def known(self) -> frozenset[str]:
+        """Names of the properties with a value"""
+        return frozenset(name for name in FIELDS if getattr(self, name) is not None)
+
     def get_temperature(self, unit="K") -> float:
-        match unit:
-            case "K":
-                return self.T
-            case "C":
-                return self.T - 273.15
-        raise ValueError(f"Invalid unit '{unit}'")
-       
+        return from_si(self.T, unit, "temperature")
+
     def get_pressure(self, unit="Pa") -> float:
-        match unit:
-            case "Pa":
-                return self.p
-            case "kPa":
-                return self.p / 1000
-            case "bar":
-                return self.p / 1e5
-        raise ValueError(f"Invalid unit '{unit}'")
+        return from_si(self.p, unit, "pressure")
 
 
 if __name__ == "__main__":
-    s = State("Test")
-    print(s)
\ No newline at end of file
+    s = State("Test", p="80 bar", T="480 C")
+    assert s.p == 8e6 and round(s.T, 2) == 753.15
+    assert s.known() == {"p", "T"}
+    assert round(s.get_temperature("C"), 2) == 480 and s.get_pressure("bar") == 80
+    assert State("Test", h="2769.6 kJ/kg").h == 2769600
+    assert not hasattr(s, "__dict__")
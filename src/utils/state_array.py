@@ -0,0 +1,132 @@
+"""
+Columnar storage of many states, for the sweeps.
+
+No other module imports it, so State and the processes never load it (nor NumPy
+through it): it is imported by the code building a sweep over many states.
+"""
+import numpy as np
+from .state import FIELDS, State
+from .units import QUANTITIES, factor, parse
+
+
+class StateView(State):
+    """
+    A state of a StateArray: reading or writing its properties reads or writes
+    the arrays of the container, nothing is copied. NaN in the arrays is None here,
+    so a view can be used wherever a State is expected, e.g. by the processes.
+    """
+    __slots__ = ("_array", "_i")
+
+    def __init__(self, array: "StateArray", i: int):
+        self._array = array
+        self._i = i
+
+    @property
+    def name(self) -> str:
+        return f"{self._array.name}[{self._i}]"
+
+
+def _column(name: str) -> property:
+    """Property of a StateView reading and writing the column `name` of its array"""
+    def get(self: StateView) -> float | None:
+        value = self._array.columns[name][self._i]
+        return None if np.isnan(value) else float(value)
+
+    def set(self: StateView, value: float | None):
+        self._array.columns[name][self._i] = np.nan if value is None else value
+
+    return property(get, set)
+
+
+for _name in FIELDS:
+    setattr(StateView, _name, _column(_name))
+
+
+class StateArray:
+    """
+    Many states of the same kind, stored as one float64 array per property,
+    NaN meaning unknown. The columns can be used directly in the vectorized
+    computations (e.g. `states.T`), and `states[i]` is a view of one state.
+
+        states = StateArray.from_arrays("P1", p=["1 bar", "2 bar"], T=([25, 30], "C"))
+        states.p          # array([100000., 200000.])
+        states[1].T       # 303.15
+    """
+
+    def __init__(self, name: str, n: int, columns: dict[str, np.ndarray] | None = None):
+        self.name = name
+        self.columns = {field: np.full(n, np.nan) for field in FIELDS}
+        for field, values in (columns or {}).items():
+            self.columns[field] = values
+
+    @classmethod
+    def from_arrays(cls, name: str, **values) -> "StateArray":
+        """
+        Build the states from one array per known property (all of the same length).
+        The properties with a unit can also be given as arrays of strings with their
+        unit, e.g. ["1 bar", "80 bar"], or as a (numbers, unit) pair, e.g. ([1, 80], "bar")
+        """
+        columns = {}
+        for field, value in values.items():
+            assert field in FIELDS, f"Unknown property '{field}'"
+            if isinstance(value, tuple):
+                numbers, unit = value
+                scale, offset = factor(unit, QUANTITIES[field])
+                columns[field] = np.asarray(numbers, dtype=np.float64) * scale + offset
+            elif len(value) and isinstance(value[0], str):
+                quantity = QUANTITIES[field]
+                columns[field] = np.fromiter((parse(text, quantity) for text in value), dtype=np.float64, count=len(value))
+            else:
+                columns[field] = np.array(value, dtype=np.float64)
+
+        sizes = {len(column) for column in columns.values()}
+        assert len(sizes) <= 1, "All the properties must have the same length"
+        return cls(name, sizes.pop() if sizes else 0, columns)
+
+    def __len__(self) -> int:
+        return len(self.columns["p"])
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        # The columns, e.g. states.T
+        if name in FIELDS:
+            return self.columns[name]
+        raise AttributeError(name)
+
+    def __getitem__(self, i: int | slice) -> "StateView | StateArray":
+        """A view of the i-th state, or a StateArray sharing the arrays for a slice"""
+        if isinstance(i, slice):
+            return StateArray(self.name, 0, {field: column[i] for field, column in self.columns.items()})
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return StateView(self, i)
+
+    def __iter__(self):
+        return (StateView(self, i) for i in range(len(self)))
+
+    def known(self) -> dict[str, np.ndarray]:
+        """Mask of the states with a value, for each property"""
+        return {field: ~np.isnan(column) for field, column in self.columns.items()}
+
+    def __repr__(self):
+        return f"StateArray('{self.name}', {len(self)} states)"
+
+
+if __name__ == "__main__":
+    # Bulk construction, the views share the arrays
+    states = StateArray.from_arrays("P1", p=["1 bar", "80 bar", "500 kPa"], T=([25, 480, 300], "C"))
+    assert list(states.p) == [1e5, 8e6, 5e5]
+    view = states[1]
+    assert view.name == "P1[1]" and view.p == 8e6 and view.v is None
+    assert view.known() == {"p", "T"}
+    view.v = 0.0423
+    assert states.v[1] == 0.0423
+    states.T[1] = 800
+    assert view.T == 800
+
+    # A process computes the views in place
+    from src.utils.process import Process
+    B = StateArray("P2", 3)
+    Process("AIR", A=states[0], B=B[0]).compute()
+    assert round(states.v[0], 3) == round(287 * 298.15 / 1e5, 3)
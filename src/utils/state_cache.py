@@ -0,0 +1,140 @@
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+from .state import FIELDS, State
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0 # Lookups answered from the cache
+    misses: int = 0 # Lookups that had to solve the state
+    evictions: int = 0 # States dropped to make room for new ones
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class StateCache:
+    """
+    Cache of solved states, keyed on the fluid, the pair of properties defining the
+    state and their quantized values, e.g. ("STEAM", "p", "T", p, T).
+
+    The values are quantized to `digits` significant digits (in binary: their mantissa
+    is rounded to as many bits, see `quantize`): two states closer than that share the
+    same entry. A hit fills the unknown properties of the state from the cached one,
+    the known properties are left untouched.
+
+    When the cache is full, the least recently used state is evicted ("lru"), or
+    the oldest one ("fifo"). A maxsize of 0 disables the cache.
+
+        cache = StateCache(maxsize=1024, digits=6)
+        cache.complete("STEAM", state, ("p", "T"), solve)
+        cache.stats.hit_rate
+    """
+
+    def __init__(self, maxsize: int = 4096, *, digits: int = 9, policy: str = "lru"):
+        assert policy in ("lru", "fifo"), f"Invalid eviction policy '{policy}', expected 'lru' or 'fifo'"
+        self.maxsize = maxsize
+        self.digits = digits
+        self._scale = 2.0 ** math.ceil(digits * math.log2(10)) # The mantissa in [0.5, 1) to `digits` significant digits
+        self.policy = policy
+        self.stats = CacheStats()
+        self._states: OrderedDict[tuple, tuple[tuple[str, float], ...]] = OrderedDict() # key -> the other known properties
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def clear(self):
+        """Drop the cached states and reset the statistics"""
+        self._states.clear()
+        self.stats = CacheStats()
+
+    def quantize(self, value: float) -> tuple[int, int]:
+        """The value to `digits` significant digits, as its rounded mantissa and its exponent"""
+        mantissa, exponent = math.frexp(value)
+        return round(mantissa * self._scale), exponent
+
+    def key(self, fluid: str, state: State, pair: tuple[str, str]) -> tuple | None:
+        """Key of the state, None if the pair is not known (or not made of scalars)"""
+        key = [fluid, *pair]
+        for name in pair:
+            value = getattr(state, name)
+            if not isinstance(value, (int, float)):
+                return None
+            key.append(self.quantize(value))
+        return tuple(key)
+
+    def complete(self, fluid: str, state: State, pair: tuple[str, str], solve: Callable[[State], None]) -> State:
+        """
+        Fill the unknown properties of the state, defined by the pair of properties,
+        from the cache. On a miss, solve(state) is called on a new state with only
+        the pair known, and the whole result is cached. Return the state
+        """
+        key = self.key(fluid, state, pair) if self.maxsize > 0 else None
+        if key is None:
+            solve(state)
+            return state
+
+        values = self._states.get(key)
+        if values is not None:
+            self.stats.hits += 1
+            if self.policy == "lru":
+                self._states.move_to_end(key)
+        else:
+            # Solved from the pair alone, so that the other known properties of this state do not leak into the cache
+            self.stats.misses += 1
+            solved = State(state.name, **{name: getattr(state, name) for name in pair})
+            solve(solved)
+            values = tuple((name, getattr(solved, name)) for name in FIELDS if name not in pair and getattr(solved, name) is not None)
+
+            self._states[key] = values
+            if len(self._states) > self.maxsize:
+                self._states.popitem(last=False)
+                self.stats.evictions += 1
+
+        for name, value in values:
+            if getattr(state, name) is None:
+                setattr(state, name, value)
+        return state
+
+
+# The cache of the states solved by the processes, see Process
+STATE_CACHE = StateCache()
+
+
+if __name__ == "__main__":
+    calls = []
+
+    def solve(state: State):
+        calls.append(state.T)
+        state.h = 1004.5 * state.T
+        state.v = 287 * state.T / state.p
+
+    cache = StateCache(maxsize=2, digits=6)
+    cache.complete("AIR", State("1", p=1e5, T=300), ("p", "T"), solve)
+    state = cache.complete("AIR", State("1", p=1e5, T=300.0000001, v=0.8), ("p", "T"), solve)
+    assert state.h == 1004.5 * 300 and state.T == 300.0000001 and state.v == 0.8
+    assert len(calls) == 1 and cache.stats.hits == 1
+
+    # The least recently used state is evicted
+    cache.complete("AIR", State("2", p=1e5, T=400), ("p", "T"), solve)
+    cache.complete("AIR", State("3", p=1e5, T=500), ("p", "T"), solve)
+    cache.complete("AIR", State("1", p=1e5, T=300), ("p", "T"), solve)
+    assert calls == [300, 400, 500, 300] and cache.stats.evictions == 2
+    assert round(cache.stats.hit_rate, 2) == 0.2
+
+    # The same values for another pair are another state
+    state = cache.complete("AIR", State("5", p=1e5, h=300), ("p", "h"), lambda state: setattr(state, "T", state.h / 1004.5))
+    assert round(state.T, 4) == round(300 / 1004.5, 4) and state.v is None and len(calls) == 4
+
+    # Quantized to the digits, in both directions and at any scale
+    assert cache.key("AIR", State("1", p=1e5, T=300.0000001), ("p", "T")) == cache.key("AIR", State("1", p=1e5, T=299.9999999), ("p", "T"))
+    assert cache.key("AIR", State("1", p=1e5, T=300.01), ("p", "T")) != cache.key("AIR", State("1", p=1e5, T=300), ("p", "T"))
+    assert cache.key("AIR", State("1", p=1e-5, T=300), ("p", "T")) != cache.key("AIR", State("1", p=1e5, T=300), ("p", "T"))
+
+    # Not defined by the pair, never cached
+    cache.complete("AIR", State("4", p=1e5), ("p", "T"), lambda state: None)
+    assert cache.stats.misses == 5
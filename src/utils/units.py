@@ -0,0 +1,86 @@
+"""
+Units of the thermodynamic quantities, and their conversion to SI.
+
+Every unit is an affine map to the SI unit of its quantity, precomputed once:
+
+    value [SI] = value [unit] * scale + offset
+
+The conversions work the same on floats and on NumPy arrays, so a whole table
+column or a sweep is converted in a single operation.
+"""
+from functools import lru_cache
+
+# Units of each quantity: unit -> (scale, offset) to the SI unit (the first one)
+UNITS: dict[str, dict[str, tuple[float, float]]] = {
+    "pressure": {"Pa": (1.0, 0.0), "kPa": (1e3, 0.0), "MPa": (1e6, 0.0), "bar": (1e5, 0.0)},
+    "temperature": {"K": (1.0, 0.0), "C": (1.0, 273.15), "°C": (1.0, 273.15)},
+    "energy": {"J/kg": (1.0, 0.0), "kJ/kg": (1e3, 0.0)},
+    "volume": {"m^3/kg": (1.0, 0.0), "L/kg": (1e-3, 0.0)},
+    "entropy": {"J/kgK": (1.0, 0.0), "kJ/kgK": (1e3, 0.0)},
+}
+
+# Quantity of each property of a state (or column of a table)
+QUANTITIES = {
+    "p": "pressure",
+    "T": "temperature",
+    "v": "volume", "v_f": "volume", "v_g": "volume",
+    "u": "energy", "u_f": "energy", "u_g": "energy",
+    "h": "energy", "h_f": "energy", "h_g": "energy",
+    "s": "entropy", "s_f": "entropy", "s_g": "entropy",
+}
+
+# Units of each quantity, the longest first, so that "kJ/kg" is matched before "J/kg"
+_SUFFIXES = {quantity: sorted(units, key=len, reverse=True) for quantity, units in UNITS.items()}
+
+
+def factor(unit: str, quantity: str) -> tuple[float, float]:
+    """Return the (scale, offset) converting the unit to SI"""
+    try:
+        return UNITS[quantity][unit]
+    except KeyError:
+        raise ValueError(f"Invalid unit '{unit}' for {quantity}, expected one of {', '.join(UNITS.get(quantity, ()))}") from None
+
+
+def to_si(value, unit: str, quantity: str):
+    """Convert a value (or an array) from the unit to SI"""
+    scale, offset = factor(unit, quantity)
+    return value * scale + offset
+
+
+def from_si(value, unit: str, quantity: str):
+    """Convert a value (or an array) from SI to the unit"""
+    scale, offset = factor(unit, quantity)
+    return (value - offset) / scale
+
+
+@lru_cache(maxsize=4096)
+def parse(text: str, quantity: str) -> float:
+    """
+    Convert a value given with its unit to SI, e.g. parse("1 bar", "pressure") = 1e5.
+    The same strings come back for every state of a sweep, so the results are cached
+    """
+    text = text.replace(" ", "")
+    for unit in _SUFFIXES[quantity]:
+        if text.endswith(unit):
+            return to_si(float(text[:-len(unit)]), unit, quantity)
+    raise ValueError(f"Invalid unit in '{text}' for {quantity}, expected one of {', '.join(UNITS[quantity])}")
+
+
+if __name__ == "__main__":
+    import numpy as np
+
+    assert parse("80 bar", "pressure") == 8e6
+    assert round(parse("480 C", "temperature"), 2) == 753.15
+    assert parse("2769.6 kJ/kg", "energy") == 2769600
+    assert round(parse("6.6586 kJ/kgK", "entropy"), 6) == 6658.6
+    assert round(parse("1.004 L/kg", "volume"), 9) == 0.001004
+
+    # Round trip, in bulk
+    T = np.array([25.0, 480.0])
+    assert np.allclose(from_si(to_si(T, "C", "temperature"), "C", "temperature"), T)
+
+    try:
+        parse("80 psi", "pressure")
+        assert False, "Invalid unit parsed"
+    except ValueError:
+        pass
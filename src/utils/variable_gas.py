@@ -0,0 +1,172 @@
+"""
+Ideal gases with a specific heat varying with the temperature.
+
+src.utils.gas does not import it, a Process of src.utils on a constant c_p needs no
+NumPy. It is loaded by src.processes (through src.utils.path), by src.cycle and by
+the mixtures.
+Importing it registers its gases, e.g. Process("AIR-VARIABLE", ...) once
+`AIR_VARIABLE` is imported.
+"""
+import numpy as np
+from .gas import GASES
+from .relations import Relation
+
+R_U = 8314.47 # Universal gas constant [J/(kmol K)]
+T_REF = 298.15 # Reference temperature of the standard entropy [K]
+P_REF = 101325 # Reference pressure of the standard entropy [Pa]
+
+
+class VariableGas:
+    """
+    Ideal gas whose specific heat is a cubic polynomial of the temperature
+    (Cengel, Table A-2c), in kJ/(kmol K):
+
+        c_p(T) = a + b T + c T^2 + d T^3
+
+    h(T), u(T) and the standard entropy s°(T) = s°(T_REF) + ∫ c_p / T dT are the
+    exact integrals of the polynomial (h = 0 at 0 K). The entropy at (T, p) is
+
+        s(T, p) = s°(T) - R ln(p / P_REF)
+
+    The inverse functions (the temperature from h, u or s°) are tabulated once on a
+    fine grid of temperatures. A lookup is a binary search and a linear
+    interpolation, refined by one Newton step on the exact function, so the
+    isentropic end states need no numerical integration nor iterative solve.
+    Every function works the same on floats and on NumPy arrays; the inverse
+    functions give NaN out of the range of validity of the polynomial.
+    """
+
+    def __init__(self, name: str, M: float, coefficients: tuple[float, float, float, float], T_range: tuple[float, float], s_ref: float, step: float = 1.0):
+        self.name = name
+        self.M = M # Molar mass [kg/kmol]
+        self.coefficients = tuple(coefficients) # Coefficients of c_p(T) [kJ/(kmol K)]
+        self.R = R_U / M # Gas constant [J/(kg K)]
+        self.T_min, self.T_max = T_range # Range of validity of the polynomial [K]
+        self.s_ref = s_ref # Standard entropy at T_REF [J/(kg K)]
+        self._graphs = {} # Relations of the processes compiled for this gas, by process class (see Process)
+
+        # Coefficients of c_p in J/(kg K)
+        self._a, self._b, self._c, self._d = (coefficient * 1e3 / M for coefficient in coefficients)
+
+        # The functions to invert, on the grid of temperatures, with their derivative
+        self._T = np.arange(self.T_min, self.T_max + step / 2, step)
+        self._inverses = {
+            "h": (self.h, self.c_p),
+            "u": (self.u, self.c_v),
+            "s0": (self.s0, lambda T: self.c_p(T) / T),
+            "phi": (self._phi, lambda T: self.c_v(T) / T),
+        }
+        self._tables = {name: fn(self._T) for name, (fn, _) in self._inverses.items()}
+
+    @property
+    def k(self) -> float:
+        """Specific heat ratio (gamma) at T_REF"""
+        return self.c_p(T_REF) / self.c_v(T_REF)
+
+    def c_p(self, T):
+        """Specific heat at constant pressure [J/(kg K)]"""
+        return self._a + T * (self._b + T * (self._c + T * self._d))
+
+    def c_v(self, T):
+        """Specific heat at constant volume [J/(kg K)]"""
+        return self.c_p(T) - self.R
+
+    def h(self, T):
+        """Specific enthalpy [J/kg]"""
+        return T * (self._a + T * (self._b / 2 + T * (self._c / 3 + T * self._d / 4)))
+
+    def u(self, T):
+        """Specific internal energy [J/kg]"""
+        return self.h(T) - self.R * T
+
+    def s0(self, T):
+        """Standard entropy, at P_REF [J/(kg K)]"""
+        def integral(T):
+            return self._a * np.log(T) + T * (self._b + T * (self._c / 2 + T * self._d / 3))
+        return self.s_ref + integral(T) - integral(T_REF)
+
+    def s(self, T, p):
+        """Specific entropy [J/(kg K)]"""
+        return self.s0(T) - self.R * np.log(p / P_REF)
+
+    def _phi(self, T):
+        """
+        Entropy at the reference volume v_REF = R T_REF / P_REF, so that
+        s(T, v) = phi(T) + R ln(v / v_REF)
+        """
+        return self.s0(T) - self.R * np.log(T / T_REF)
+
+    def _inverse(self, name: str, values):
+        """The temperature where the tabulated function `name` is equal to values"""
+        fn, derivative = self._inverses[name]
+        table = self._tables[name]
+        values = np.asarray(values, dtype=np.float64)
+
+        # Linear interpolation on the grid, then one Newton step
+        j = np.clip(np.searchsorted(table, values, side="right") - 1, 0, len(table) - 2)
+        T = self._T[j] + (values - table[j]) / (table[j + 1] - table[j]) * (self._T[j + 1] - self._T[j])
+        T = T - (fn(T) - values) / derivative(T)
+
+        T = np.where((values < table[0]) | (values > table[-1]), np.nan, T)
+        return T if T.ndim else float(T)
+
+    def T_from_h(self, h):
+        return self._inverse("h", h)
+
+    def T_from_u(self, u):
+        return self._inverse("u", u)
+
+    def T_from_sp(self, s, p):
+        return self._inverse("s0", s + self.R * np.log(p / P_REF))
+
+    def T_from_sv(self, s, v):
+        return self._inverse("phi", s - self.R * np.log(v * P_REF / (self.R * T_REF)))
+
+    def p_from_Ts(self, T, s):
+        return P_REF * np.exp((self.s0(T) - s) / self.R)
+
+    def relations(self, state: str) -> list[Relation]:
+        """Ideal gas relations between the properties of a state, e.g. relations("A") for A.p, A.T, ..."""
+        R = self.R
+        s = state
+
+        return [
+            # p * v = R * T
+            Relation(f"{s}.T", (f"{s}.p", f"{s}.v"), lambda p, v: p * v / R),
+            # h(T), u(T) and s(T, p), inverted from the tables
+            Relation(f"{s}.T", (f"{s}.h",), self.T_from_h),
+            Relation(f"{s}.T", (f"{s}.u",), self.T_from_u),
+            Relation(f"{s}.T", (f"{s}.s", f"{s}.p"), self.T_from_sp),
+            Relation(f"{s}.T", (f"{s}.s", f"{s}.v"), self.T_from_sv),
+            Relation(f"{s}.v", (f"{s}.T", f"{s}.p"), lambda T, p: R * T / p),
+            Relation(f"{s}.p", (f"{s}.T", f"{s}.v"), lambda T, v: R * T / v),
+            Relation(f"{s}.p", (f"{s}.T", f"{s}.s"), self.p_from_Ts),
+            Relation(f"{s}.h", (f"{s}.T",), self.h),
+            Relation(f"{s}.u", (f"{s}.T",), self.u),
+            Relation(f"{s}.s", (f"{s}.T", f"{s}.p"), self.s),
+        ]
+
+
+# Cengel, Table A-2c (273 - 1800 K, max error 0.72 %), s° at 298 K from Table A-17
+AIR_VARIABLE = VariableGas("AIR-VARIABLE", 28.97, (28.11, 0.1967e-2, 0.4802e-5, -1.966e-9), (273, 1800), s_ref=1695.28)
+GASES[AIR_VARIABLE.name] = AIR_VARIABLE
+
+
+if __name__ == "__main__":
+    gas = AIR_VARIABLE
+    assert round(gas.R, 1) == 287.0
+    assert round(gas.c_p(300), 0) == 1004 # Table A-2b: 1.005 kJ/kgK
+    assert round(gas.c_p(1000), -1) == 1140 # Table A-2b: 1.142 kJ/kgK
+    assert round(gas.k, 2) == 1.40
+
+    # Exact inverses, on floats and arrays
+    T = np.array([300.0, 817.2, 1600.0])
+    assert np.allclose(gas.T_from_h(gas.h(T)), T, rtol=1e-12)
+    assert np.allclose(gas.T_from_u(gas.u(T)), T, rtol=1e-12)
+    assert np.allclose(gas.T_from_sp(gas.s(T, 5e6), 5e6), T, rtol=1e-12)
+    assert round(gas.T_from_sv(gas.s(1600.0, 1e5), gas.R * 1600 / 1e5), 6) == 1600
+    assert np.isnan(gas.T_from_h(gas.h(2000.0)))
+
+    # Isentropic compression 1 -> 50 bar, 911.25 K with a constant c_p
+    T_2 = gas.T_from_sp(gas.s(298.0, 1e5), 50e5)
+    assert round(T_2) == 873 # Table A-17, with the relative pressures: ~875 K